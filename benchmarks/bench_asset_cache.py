@@ -0,0 +1,95 @@
+"""网络资源缓存基准：在本地 HTTP 服务器上比较无缓存、冷缓存、304 验证、离线优先与服务器不可用时的取图耗时
+
+服务器支持 ETag/If-None-Match 与 Last-Modified/If-Modified-Since，并按请求模拟网络延迟。
+
+用法：python benchmarks/bench_asset_cache.py [资源个数] [每次请求的延迟毫秒]
+"""
+import email.utils
+import hashlib
+import http.server
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from easy_ui_interpreter import AssetCache, fetch_url
+
+ASSET_SIZE = 200 * 1024
+LAST_MODIFIED = email.utils.formatdate(time.time() - 3600, usegmt=True)
+
+
+class AssetHandler(http.server.BaseHTTPRequestHandler):
+    latency = 0.0
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        time.sleep(self.latency)
+        body = hashlib.sha256(self.path.encode()).digest() * (ASSET_SIZE // 32)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_round(label, urls, fetch, cache=None):
+    AssetHandler.requests = 0
+    start = time.perf_counter()
+    for url in urls:
+        fetch(url)
+    elapsed = (time.perf_counter() - start) * 1000
+    counters = "，".join(f"{k}={v}" for k, v in cache.stats().items()) if cache else "-"
+    print(f"{label:<16} {elapsed:9.1f} ms  请求数 {AssetHandler.requests:4d}  {counters}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    AssetHandler.latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), AssetHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/img{i}.png" for i in range(count)]
+    cache_dir = tempfile.mkdtemp(prefix="eui_asset_bench_")
+    try:
+        print(f"{count} 个资源，每个 {ASSET_SIZE // 1024} KB，模拟延迟 {AssetHandler.latency * 1000:.0f} ms")
+        run_round("无缓存", urls, fetch_url)
+
+        cache = AssetCache(cache_dir)
+        run_round("冷缓存", urls, cache.fetch, cache)
+        cache = AssetCache(cache_dir)
+        run_round("在线（304验证）", urls, cache.fetch, cache)
+        cache = AssetCache(cache_dir, offline=True)
+        run_round("离线优先", urls, cache.fetch, cache)
+
+        server.shutdown()
+        server.server_close()
+        cache = AssetCache(cache_dir)
+        run_round("服务器不可用", urls, cache.fetch, cache)
+
+        # 容量上限只够放一半资源时，最早使用的条目被淘汰
+        cache = AssetCache(cache_dir, max_bytes=ASSET_SIZE * count // 2)
+        cache.evict()
+        kept = sum(1 for url in urls if cache.cached_path(url))
+        print(f"容量上限减半后保留 {kept}/{count} 个条目")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
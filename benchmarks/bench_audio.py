@@ -0,0 +1,108 @@
+"""音频声明启动基准：每个 audio= 立即创建 QMediaPlayer 并 setMedia（旧做法）与按需创建（MediaPlayerPool）
+
+在独立子进程中构建含大量 audio= 声明的程序，记录构建耗时，以及之后依次播放其中若干个音频的耗时。
+声明的是小 WAV，子进程中把 EFFECT_AUTO_MAX_BYTES 设为 0，使两种做法都经 QMediaPlayer 播放（不走短音效）。
+需要可用的 QtMultimedia 后端；无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_audio.py [音频声明数] [播放个数]
+"""
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import os, sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QUrl
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+import easy_ui_interpreter
+from easy_ui_interpreter import EasyUIInterpreter
+
+easy_ui_interpreter.EFFECT_AUTO_MAX_BYTES = 0  # 只比较播放器的创建方式
+
+
+class LegacyInterpreter(EasyUIInterpreter):
+    # 旧实现的 create_audio_player 与播放（解析时立即创建播放器）
+    def create_audio_player(self, audio_type, audio_path, audio_id):
+        player = QMediaPlayer()
+        self.legacy_players[audio_id] = player
+        self.audio_sources[audio_id] = (audio_type, audio_path)
+        try:
+            if audio_type == "url":
+                media = QMediaContent(QUrl(audio_path))
+            else:
+                abs_path = os.path.abspath(audio_path)
+                if not os.path.exists(abs_path):
+                    return
+                media = QMediaContent(QUrl.fromLocalFile(abs_path))
+            player.setMedia(media)
+        except Exception:
+            pass
+
+    def _control_player(self, audio_id, action):
+        if action == "play":
+            self.legacy_players[audio_id].play()
+
+
+app = QApplication(sys.argv[:1])
+interpreter = (LegacyInterpreter if {legacy!r} else EasyUIInterpreter)()
+interpreter.legacy_players = {{}}
+interpreter._begin_run()
+with open({path!r}, encoding='utf-8') as f:
+    code = f.read()
+start = time.perf_counter()
+for node in interpreter.parse(code):
+    interpreter.build_node(node)
+interpreter._finish_build()
+built = time.perf_counter()
+for i in range({plays}):
+    interpreter.handle_button_click(f"play_audio=a{{i}}")
+played = time.perf_counter()
+print((built - start) * 1000, (played - built) * 1000)
+"""
+
+
+def write_wav(path, seconds=0.2, rate=22050):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(struct.pack('<h', 0) * int(rate * seconds))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    plays = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    directory = tempfile.mkdtemp(prefix="eui_audio_bench_")
+    try:
+        wav = os.path.join(directory, "click.wav")
+        write_wav(wav)
+        path = os.path.join(directory, "audio.eui")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('window=title="音频基准",width=400,height=300;\n')
+            for i in range(count):
+                f.write(f'audio=os="{wav}",id=a{i};\n')
+                f.write(f'button=text="播放{i}",id=b{i},click="play_audio=a{i}";\n')
+
+        print(f"{count} 个 audio= 声明，随后播放其中 {plays} 个")
+        env = dict(os.environ)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        for label, legacy in (("立即创建播放器", True), ("按需创建", False)):
+            code = CHILD.format(root=ROOT, path=path, legacy=legacy, plays=plays)
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                 check=True, env=env).stdout
+            built, played = map(float, out.split())
+            print(f"{label:<8} 构建 {built:9.1f} ms  播放 {played:8.1f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
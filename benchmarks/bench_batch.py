@@ -0,0 +1,108 @@
+"""批量构建基准：构建期间暂停刷新与布局激活（默认）与逐个组件直接加入布局（--no-batch）的耗时
+
+为每个规模生成一个合成的 .eui 文件（文字、输入框、按钮、进度条与分组框循环出现），在独立子进程中
+构建并显示窗口，记录构建耗时（批量构建含最后一次布局激活）、随后显示窗口并处理完首批事件的耗时
+以及两者合计。分两种情形：按 parse_and_run 的方式在窗口显示前构建；窗口已显示、构建期间事件循环
+照常运行。
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_batch.py [组件数 ...]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+VISIBLE_MAX_UNBATCHED = 10000  # 窗口已显示时逐个构建的耗时增长很快，超过此规模不再测量
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from easy_ui_interpreter import EasyUIInterpreter
+
+app = QApplication(sys.argv[:1])
+interpreter = EasyUIInterpreter()
+interpreter.batch_build = {batch!r}
+with open({path!r}, encoding='utf-8') as f:
+    code = f.read()
+interpreter._begin_run()
+nodes = interpreter.load_program(code)
+start = time.perf_counter()
+# 与 parse_and_run 相同的构建步骤
+interpreter._batching = interpreter.batch_build
+if {visible!r}:
+    # 窗口先显示，构建期间事件循环照常运行（如重新加载或向已打开的窗口追加组件）
+    interpreter.build_node(nodes[0])
+    interpreter.window.show()
+    app.processEvents()
+    for i, node in enumerate(nodes[1:]):
+        interpreter.build_node(node)
+        if i % 200 == 0:
+            app.processEvents()
+    interpreter._finish_build()
+else:
+    for node in nodes:
+        interpreter.build_node(node)
+    interpreter._finish_build()
+built = time.perf_counter()
+interpreter.window.show()
+app.processEvents()
+shown = time.perf_counter()
+print((built - start) * 1000, (shown - built) * 1000)
+"""
+
+
+def write_program(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('window=title="批量构建基准",width=600,height=800;\n')
+        for i in range(count):
+            kind = i % 10
+            if kind == 0:
+                f.write(f'groupbox=title="分组{i}",id=g{i};\n')
+            elif kind == 9:
+                f.write('end=;\n')
+                f.write(f'label=text="文字{i}",id=w{i};\n')
+            elif kind % 3 == 0:
+                f.write(f'entry=hint="字段{i}",id=w{i};\n')
+            elif kind % 3 == 1:
+                f.write(f'button=text="按钮{i}",id=w{i},click="显示=w{i}";\n')
+            else:
+                f.write(f'progress=label="进度{i}",id=w{i},min=0,max=100,value=50;\n')
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    directory = tempfile.mkdtemp(prefix="eui_batch_bench_")
+    try:
+        for visible in (False, True):
+            print("窗口已显示时构建（每 200 个组件处理一次事件）" if visible else "窗口显示前构建（parse_and_run）")
+            print(f"{'':<10}{'--------- 逐个构建 ---------':>30}{'--------- 批量构建 ---------':>30}")
+            print(f"{'组件数':<8}" + f"{'构建ms':>10}{'显示ms':>10}{'合计ms':>10}" * 2)
+            for count in sizes:
+                path = os.path.join(directory, f"form{count}.eui")
+                if not os.path.exists(path):
+                    write_program(path, count)
+                row = f"{count:<10}"
+                for batch in (False, True):
+                    if visible and not batch and count > VISIBLE_MAX_UNBATCHED:
+                        row += f"{'-':>12}{'-':>10}{'-':>10}"
+                        continue
+                    code = CHILD.format(root=ROOT, path=path, batch=batch, visible=visible)
+                    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                         check=True, env=env).stdout
+                    built, shown = map(float, out.split())
+                    row += f"{built:>12.1f}{shown:>10.1f}{built + shown:>10.1f}"
+                print(row)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
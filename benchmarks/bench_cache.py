@@ -0,0 +1,69 @@
+"""编译缓存基准：冷启动（新进程导入解释器并得到可构建的程序）在有无缓存时的耗时
+
+用法：python benchmarks/bench_cache.py [行数]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_parse import make_source
+
+# 子进程：记录从进程启动到拿到节点列表的耗时
+CHILD = r"""
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from easy_ui_interpreter import EasyUIInterpreter, ProgramCache
+imported = time.perf_counter()
+interpreter = EasyUIInterpreter()
+if {cache_dir!r}:
+    interpreter.program_cache = ProgramCache({cache_dir!r})
+with open({path!r}, encoding='utf-8') as f:
+    nodes = interpreter.load_program(f.read())
+done = time.perf_counter()
+print(imported - start, done - imported, len(nodes))
+"""
+
+
+def run_child(path, cache_dir):
+    code = CHILD.format(root=ROOT, path=path, cache_dir=cache_dir)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    total = time.perf_counter() - start
+    imported, loaded, count = out.split()
+    return total, float(imported), float(loaded), int(count)
+
+
+def best(path, cache_dir, repeat=5):
+    return min((run_child(path, cache_dir) for _ in range(repeat)), key=lambda r: r[0])
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    work_dir = tempfile.mkdtemp(prefix="eui_bench_")
+    try:
+        path = os.path.join(work_dir, "bench.eui")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_source(line_count))
+        cache_dir = os.path.join(work_dir, "cache")
+        run_child(path, cache_dir)  # 预热：写入缓存
+
+        print(f"源码：{line_count + 1} 行")
+        for name, directory in (("无缓存", ""), ("缓存命中", cache_dir)):
+            total, imported, loaded, count = best(path, directory)
+            print(f"{name:<6} 进程总耗时 {total * 1000:7.1f} ms  导入 {imported * 1000:6.1f} ms  "
+                  f"解析/读缓存 {loaded * 1000:7.1f} ms  ({count} 个节点)")
+        size = sum(os.path.getsize(os.path.join(cache_dir, n)) for n in os.listdir(cache_dir))
+        print(f"缓存文件大小：{size / 1024:.0f} KB（源码 {os.path.getsize(path) / 1024:.0f} KB）")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""界面更新合并基准：高频定时器驱动进度条时，逐次写入（--max-fps 0）与按帧合并写入的 CPU 占用与重绘次数
+
+构建若干进度条与大量 INTERVAL_MS 间隔的 update_progress 定时器，显示窗口后运行若干秒，记录动作执行次数、
+实际写入界面的次数、进度条收到的绘制事件数与 CPU 占用。间隔取定时器合并窗口（TIMER_TICK_MS）的整数倍，
+各定时器按此间隔准确触发，同时到期的合并为一次唤醒。无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_coalesce.py [进度条数] [定时器数] [运行秒数]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERVAL_MS = 10  # 每个定时器 100 次/秒，100 个定时器即每秒 1 万次进度条更新
+
+CHILD = r"""
+import sys, time
+from functools import partial
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from easy_ui_interpreter import EasyUIInterpreter
+
+fired = [0]
+paints = [0]
+
+
+class PaintCounter(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            paints[0] += 1
+        return False
+
+
+app = QApplication(sys.argv[:1])
+interpreter = EasyUIInterpreter()
+interpreter.max_fps = {fps!r}
+interpreter._begin_run()
+lines = ['window=title="更新合并基准",width=400,height=600;']
+for i in range({bars}):
+    lines.append(f'progress=label="p{{i}}",id=p{{i}},min=0,max={maximum},value=0;')
+for i in range({count}):
+    lines.append(f'timer=id=t{{i}},interval={interval},action="update_progress=p{{i % {bars}}},step=1";')
+for node in interpreter.parse("\n".join(lines)):
+    interpreter.build_node(node)
+interpreter._finish_build()
+interpreter.window.show()
+
+counter = PaintCounter()
+for i in range({bars}):
+    interpreter.widgets[f'p{{i}}'].installEventFilter(counter)
+
+
+def counted(run):
+    fired[0] += 1
+    run()
+
+
+for info in interpreter.timers.values():
+    info['action'].run = partial(counted, info['action'].run)
+    info['timer'].start()
+
+def measure_start():
+    global cpu0, wall0, fired0, paints0, applied0
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    fired0, paints0, applied0 = fired[0], paints[0], interpreter.updates.applied
+
+def measure_end():
+    cpu = time.process_time() - cpu0
+    wall = time.perf_counter() - wall0
+    applied = interpreter.updates.applied - applied0
+    print((fired[0] - fired0) / wall, applied / wall, (paints[0] - paints0) / wall, cpu / wall * 100)
+    app.quit()
+
+QTimer.singleShot(500, measure_start)
+QTimer.singleShot(500 + int({seconds} * 1000), measure_end)
+app.exec_()
+"""
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    print(f"{bars} 个进度条，{count} 个 {INTERVAL_MS} ms 定时器，测量 {seconds:g} 秒")
+    print(f"{'':<14}{'动作/秒':>10}{'写入/秒':>10}{'重绘/秒':>10}{'CPU':>8}")
+    for label, fps in (("逐次写入", 0), ("合并（60fps）", 60)):
+        # 上限取运行期间累计步数的两倍：进度条在测量期间持续变化而不会提前到顶停止
+        maximum = int(count / bars * 1000 / INTERVAL_MS * (seconds + 1) * 2)
+        code = CHILD.format(root=ROOT, fps=fps, bars=bars, count=count, seconds=seconds, maximum=maximum,
+                            interval=INTERVAL_MS)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             check=True, env=env).stdout
+        runs, applied, paints, cpu = map(float, out.split())
+        print(f"{label:<14}{runs:>10.0f}{applied:>10.0f}{paints:>10.0f}{cpu:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""图片解码基准：先全尺寸解码再缩放（旧做法）与解码时直接缩小（decode_image）的耗时与峰值内存
+
+生成一组 24MP 的 JPEG（其中一半带 EXIF 内嵌缩略图）与 PNG，每种做法在独立子进程中把全部图片
+缩放到目标宽度，记录总耗时与进程峰值 RSS（ru_maxrss，仅 Unix 可用）。
+
+用法：python benchmarks/bench_decode.py [目标宽度] [图片数]
+"""
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FULL_SIZE = (6000, 4000)
+THUMB_SIZE = (320, 213)
+
+CHILD = r"""
+import os, resource, sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtGui import QImage
+from easy_ui_interpreter import decode_image, scale_image
+paths = {paths!r}
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+for path in paths:
+    if {mode!r} == "legacy":
+        image = scale_image(QImage(path), {width!r})
+    else:
+        image = decode_image(path, width={width!r})
+    assert image.width() == {width!r}, image.size()
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, base, peak)
+"""
+
+
+def make_photo(width, height):
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage, QLinearGradient, QPainter, QColor
+    image = QImage(width, height, QImage.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(30, 80, 160))
+    gradient.setColorAt(1, QColor(220, 160, 40))
+    painter.fillRect(image.rect(), gradient)
+    painter.setPen(Qt.white)
+    for x in range(0, width, 97):
+        painter.drawLine(x, 0, width - x, height)
+    painter.end()
+    return image
+
+
+def jpeg_bytes(image, quality=85):
+    from PyQt5.QtCore import QBuffer, QIODevice
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "JPG", quality)
+    return bytes(buffer.data())
+
+
+def with_exif_thumbnail(jpeg, thumbnail):
+    """在 SOI 之后插入只含缩略图（IFD1）的最小 EXIF 段"""
+    ifd0 = struct.pack('<H', 0) + struct.pack('<I', 8 + 6)
+    ifd1 = struct.pack('<H', 2)
+    thumb_offset = 8 + len(ifd0) + 2 + 2 * 12 + 4
+    ifd1 += struct.pack('<HHII', 0x0201, 4, 1, thumb_offset)
+    ifd1 += struct.pack('<HHII', 0x0202, 4, 1, len(thumbnail))
+    ifd1 += struct.pack('<I', 0)
+    tiff = b'II*\x00' + struct.pack('<I', 8) + ifd0 + ifd1 + thumbnail
+    segment = b'Exif\x00\x00' + tiff
+    return jpeg[:2] + b'\xff\xe1' + struct.pack('>H', len(segment) + 2) + segment + jpeg[2:]
+
+
+def make_dataset(directory, count):
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(["bench"])
+    photo = make_photo(*FULL_SIZE)
+    plain = jpeg_bytes(photo)
+    thumbnail = jpeg_bytes(photo.scaled(*THUMB_SIZE, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+    exif = with_exif_thumbnail(plain, thumbnail)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"photo{i}.jpg")
+        with open(path, 'wb') as f:
+            f.write(exif if i % 2 else plain)
+        paths.append(path)
+    png_path = os.path.join(directory, "photo.png")
+    photo.save(png_path)
+    paths.append(png_path)
+    return paths
+
+
+def run_child(mode, paths, width):
+    code = CHILD.format(root=ROOT, paths=paths, mode=mode, width=width)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+    elapsed, base, peak = out.split()
+    return float(elapsed), int(base) / 1024, int(peak) / 1024
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    directory = tempfile.mkdtemp(prefix="eui_decode_bench_")
+    try:
+        # 在子进程中生成图片：Linux 上 ru_maxrss 会跨 exec 继承，父进程不能自己分配大图
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        out = subprocess.run([sys.executable, __file__, "--make-dataset", directory, str(count)],
+                             capture_output=True, text=True, check=True, env=env).stdout
+        paths = out.split("\n")[:-1]
+        print(f"{count} 张 {FULL_SIZE[0]}x{FULL_SIZE[1]} JPEG（一半带 {THUMB_SIZE[0]}x{THUMB_SIZE[1]} EXIF 缩略图）"
+              f"+ 1 张 PNG，目标宽度 {width}")
+        for label, mode in (("全尺寸解码后缩放", "legacy"), ("解码时缩小", "decode")):
+            elapsed, base, peak = run_child(mode, paths, width)
+            print(f"{label:<10} {elapsed * 1000:9.1f} ms  峰值RSS {peak:7.1f} MB（导入后 {base:.1f} MB）")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--make-dataset"]:
+        print("\n".join(make_dataset(sys.argv[2], int(sys.argv[3]))))
+    else:
+        main()
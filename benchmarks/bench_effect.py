@@ -0,0 +1,118 @@
+"""短音效基准：从点击按钮到声音开始播放的延迟，QMediaPlayer（audio=os=）与 QSoundEffect（audio=effect=）对比
+
+对每种方式连续点击若干次（每次间隔一段时间，含一次快速连击以检验重叠播放），记录从 QPushButton.click()
+到播放真正开始的耗时：音效以 playingChanged 变为播放中为准，媒体播放器以播放位置首次前进为准。
+需要可用的音频输出设备与 QtMultimedia 后端。
+
+用法：python benchmarks/bench_effect.py [点击次数]
+"""
+import os
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+import easy_ui_interpreter as eui
+
+if not {effect!r}:
+    eui.EFFECT_AUTO_MAX_BYTES = 0  # 让 audio=os= 的 WAV 也走媒体播放器
+app = QApplication(sys.argv[:1])
+interpreter = eui.EasyUIInterpreter()
+interpreter._begin_run()
+source = 'audio={kind}="{wav}",id=snd;\nbutton=text="播放",id=btn,click="play_audio=snd";\n'
+for node in interpreter.parse(source):
+    interpreter.build_node(node)
+interpreter._finish_build()
+interpreter.window.show()
+button = interpreter.widgets['btn']
+latencies = []
+clicked_at = [None]
+
+def started():
+    if clicked_at[0] is not None:
+        latencies.append((time.perf_counter() - clicked_at[0]) * 1000)
+        clicked_at[0] = None
+
+def watch_effect(effect):
+    for voice in effect.voices:
+        if not getattr(voice, '_bench_watched', False):
+            voice._bench_watched = True
+            voice.playingChanged.connect(lambda v=voice: v.isPlaying() and started())
+
+def click():
+    if {effect!r}:
+        watch_effect(interpreter.sound_effects['snd'])
+    clicked_at[0] = time.perf_counter()
+    button.click()
+    if {effect!r}:
+        watch_effect(interpreter.sound_effects['snd'])  # 连击时可能新建了声部
+    else:
+        player = interpreter.media_players.get('snd')
+        if player is not None and not getattr(player, '_bench_watched', False):
+            player._bench_watched = True
+            player.setNotifyInterval(1)
+            player.positionChanged.connect(lambda pos: pos > 0 and started())
+
+pending = [{clicks}]
+
+def next_click():
+    if pending[0] == 0:
+        app.quit()
+        return
+    pending[0] -= 1
+    if not {effect!r}:
+        player = interpreter.media_players.get('snd')
+        if player is not None:
+            player.stop()
+    click()
+    QTimer.singleShot(400, next_click)
+
+QTimer.singleShot(1000, next_click)  # 等音效与音频设备准备好
+app.exec_()
+print(" ".join(f"{{x:.3f}}" for x in latencies))
+"""
+
+
+def write_wav(path, seconds=0.3, rate=44100):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        frames = bytearray()
+        for i in range(int(rate * seconds)):
+            frames += struct.pack('<h', 8000 if (i // 50) % 2 else -8000)
+        f.writeframes(bytes(frames))
+
+
+def main():
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    directory = tempfile.mkdtemp(prefix="eui_effect_bench_")
+    try:
+        wav = os.path.join(directory, "click.wav")
+        write_wav(wav)
+        print(f"点击 {clicks} 次，从点击到开始播放的延迟（毫秒）")
+        for label, kind, effect in (("QMediaPlayer", "os", False), ("QSoundEffect", "effect", True)):
+            code = CHILD.format(root=ROOT, wav=wav, kind=kind, effect=effect, clicks=clicks)
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+            samples = [float(x) for x in out.split()]
+            if not samples:
+                print(f"{label:<13} 未检测到播放开始（没有音频输出设备？）")
+                continue
+            print(f"{label:<13} 中位数 {statistics.median(samples):7.2f}  最大 {max(samples):7.2f}"
+                  f"  （{len(samples)}/{clicks} 次检测到）")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
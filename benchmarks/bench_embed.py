@@ -0,0 +1,149 @@
+"""嵌入式构建基准：同一进程中以 EasyUIInterpreter.build() 构建 100 个界面，与每个界面一个解释器进程的内存对比
+
+生成一个合成的 .eui 文件（文字、输入框、进度条、分组框、按钮与定时器），分别测量：
+“多进程”为逐个启动独立子进程，各自创建 QApplication、构建并显示一个界面后记录自身内存；
+“同一进程”为在一个子进程中创建 QApplication 后连续 build() 出全部界面并显示、启动定时器，
+再对每个界面调用 teardown() 并处理完延迟删除，最后重新构建同样数量的界面（检验拆除后内存能被复用）。
+内存取自 /proc/self/smaps_rollup：RSS 含与其他进程共享的库页面，多进程时直接相加会重复计算；
+USS（私有页面）是每个进程实际独占的内存。没有 /proc 的系统只记录峰值 RSS。
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_embed.py [--count 界面数] [行数]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEMORY = r"""
+import gc, os, sys
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QCoreApplication, QEvent
+from easy_ui_interpreter import EasyUIInterpreter
+
+
+def memory():
+    # (RSS, USS)，单位 KB
+    if os.path.exists('/proc/self/smaps_rollup'):
+        fields = {{}}
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if value.strip().endswith('kB'):
+                    fields[name] = int(value.split()[0])
+        return fields['Rss'], fields['Private_Clean'] + fields['Private_Dirty']
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak // 1024 if sys.platform == 'darwin' else peak
+    return peak, peak
+
+
+def settle():
+    # 处理完布局与绘制，并销毁 teardown() 交给 deleteLater 的窗口
+    for _ in range(3):
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def open_form():
+    interpreter = EasyUIInterpreter()
+    interpreter.build(code).show()
+    for info in interpreter.timers.values():
+        info['timer'].start()
+    return interpreter
+
+
+app = QApplication(sys.argv[:1])
+with open({path!r}, encoding='utf-8') as f:
+    code = f.read()
+"""
+
+SINGLE = MEMORY + r"""
+form = open_form()
+settle()
+print(*memory())
+"""
+
+EMBED = MEMORY + r"""
+settle()
+base = memory()
+forms = [open_form() for _ in range({count})]
+settle()
+built = memory()
+for form in forms:
+    form.teardown()
+settle()
+torn = memory()
+forms = [open_form() for _ in range({count})]
+settle()
+print(*base, *built, *torn, *memory())
+"""
+
+
+def write_program(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('window=title="嵌入基准",width=400,height=600;\n')
+        f.write('progress=label="计时",id=ticks,min=0,max=100,value=0;\n')
+        f.write('timer=id=t,interval=100,action="update_progress=ticks,step=1";\n')
+        f.write('button=text="开始",id=start,click="start_timer=t";\n')
+        for i in range(count - 4):
+            kind = i % 10
+            if kind == 0:
+                f.write(f'groupbox=title="分组{i}",id=g{i};\n')
+            elif kind == 9:
+                f.write('end=;\n')
+            elif kind % 3 == 0:
+                f.write(f'entry=hint="字段{i}",id=w{i};\n')
+            elif kind % 3 == 1:
+                f.write(f'label=text="文字{i}",id=w{i};\n')
+            else:
+                f.write(f'progress=label="进度{i}",id=w{i},min=0,max=100,value=50;\n')
+
+
+def label(name, width=24):
+    """按显示宽度左对齐（中文字符占两列）"""
+    return name + " " * (width - sum(2 if ord(c) > 127 else 1 for c in name))
+
+
+def run_child(code, env):
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+    return [int(value) / 1024 for value in out.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("lines", type=int, nargs="?", default=50)
+    args = parser.parse_args()
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    directory = tempfile.mkdtemp(prefix="eui_embed_bench_")
+    try:
+        path = os.path.join(directory, "form.eui")
+        write_program(path, args.lines)
+        processes = [run_child(SINGLE.format(root=ROOT, path=path), env) for _ in range(args.count)]
+        rss = sum(p[0] for p in processes)
+        uss = sum(p[1] for p in processes)
+        (base_rss, base_uss, built_rss, built_uss, torn_rss, torn_uss, again_rss, again_uss) = run_child(
+            EMBED.format(root=ROOT, path=path, count=args.count), env)
+
+        n = args.count
+        print(f"{n} 个界面（{args.lines} 行程序）的内存 MB")
+        print(f"{label('')}{'RSS':>10}{'USS':>10}{'每个界面USS':>10}")
+        print(f"{label('多进程（合计）')}{rss:>10.1f}{uss:>10.1f}{uss / n:>14.2f}")
+        print(f"{label('同一进程：未构建')}{base_rss:>10.1f}{base_uss:>10.1f}")
+        print(f"{label('同一进程：build()后')}{built_rss:>10.1f}{built_uss:>10.1f}{(built_uss - base_uss) / n:>14.2f}")
+        print(f"{label('同一进程：teardown()后')}{torn_rss:>10.1f}{torn_uss:>10.1f}")
+        print(f"{label('同一进程：再次build()')}{again_rss:>10.1f}{again_uss:>10.1f}{(again_uss - torn_uss) / n:>14.2f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
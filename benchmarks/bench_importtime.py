@@ -0,0 +1,78 @@
+"""冷启动导入耗时基准：用 python -X importtime 测量导入 easy_ui_interpreter 的耗时，防止启动变慢
+
+多次在全新子进程中导入解释器模块，取模块累计耗时的中位数，列出自身耗时最多的模块，并检查只应
+按需导入的可选模块（QtMultimedia、urllib.request 等）有没有在模块加载时被导入。另外单独测量这些
+可选模块首次用到时的导入耗时，即延迟导入省下的时间。检查未通过或超出 --budget-ms 时以状态码 1 退出，
+可用于持续集成。
+
+用法：python benchmarks/bench_importtime.py [--runs 次数] [--budget-ms 毫秒]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = "easy_ui_interpreter"
+# 只应在用到音频、网络资源、卡顿记录或内存统计时才导入的模块
+LAZY_MODULES = ("PyQt5.QtMultimedia", "urllib.request", "http.client", "ssl", "email.parser",
+                "traceback", "tracemalloc")
+
+
+def importtime(code):
+    """在全新子进程中运行 code，返回 {模块名: (自身微秒, 累计微秒)}"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode:
+        # 导入失败时记录下的耗时并不完整，不能用作比较
+        raise SystemExit(f"导入失败：\n{result.stderr.splitlines()[-1]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if own.strip().isdigit():
+            modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="模块累计导入耗时中位数的上限")
+    args = parser.parse_args()
+
+    runs = [importtime(f"import {MODULE}") for _ in range(args.runs)]
+    totals = sorted(run[MODULE][1] / 1000 for run in runs)
+    median = statistics.median(totals)
+    print(f"导入 {MODULE}：中位数 {median:.1f} ms（{args.runs} 次，最快 {totals[0]:.1f} ms，最慢 {totals[-1]:.1f} ms）")
+
+    sample = runs[len(runs) // 2]
+    print("自身耗时最多的模块：")
+    for name, (own, cumulative) in sorted(sample.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"  {own / 1000:8.1f} ms  累计 {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if any(name in run for run in runs)]
+    if eager:
+        failed = True
+        print("以下模块本应按需导入，却在模块加载时被导入：" + "、".join(eager))
+    else:
+        print("可选模块均未在模块加载时导入")
+
+    # 首次用到时才付出的导入耗时
+    deferred = importtime(f"import {MODULE}\nimport urllib.request\ntry:\n"
+                          "    from PyQt5 import QtMultimedia\nexcept ImportError:\n    pass")
+    for name in ("urllib.request", "PyQt5.QtMultimedia"):
+        cost = f"{deferred[name][1] / 1000:.1f} ms" if name in deferred else "不可用"
+        print(f"延迟导入 {name}：{cost}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        failed = True
+        print(f"超出预算：{median:.1f} ms > {args.budget_ms:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""常驻启动器基准：双击打开 .eui 文件时，直接启动解释器与经 eui_launch.py 交给常驻启动器的耗时对比
+
+生成一个合成的 .eui 文件，分别测量从启动命令到窗口绘制完成（以 --profile 在首帧绘制时写出的摘要文件为准）
+的耗时：“直接启动”为 python easy_ui_interpreter.py 文件；“启动器”为 python eui_launch.py 文件，
+此时另记录客户端进程本身从启动到退出的耗时。每次之间稍作等待，让启动器补上的备用进程完成准备
+（与逐个双击打开文件的节奏相当）。每项取多次的中位数。无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_launcher.py [--runs 次数] [行数]
+"""
+import argparse
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERPRETER = os.path.join(ROOT, "easy_ui_interpreter.py")
+CLIENT = os.path.join(ROOT, "eui_launch.py")
+SPARE_WARMUP_S = 2.5  # 两次打开之间的间隔，启动器在此期间补上备用进程并完成导入与 QApplication 的创建
+TIMEOUT_S = 30
+
+
+def write_program(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('window=title="启动器基准",width=600,height=800;\n')
+        for i in range(count - 1):
+            kind = i % 10
+            if kind == 0:
+                f.write(f'groupbox=title="分组{i}",id=g{i};\n')
+            elif kind == 9:
+                f.write('end=;\n')
+            elif kind % 3 == 0:
+                f.write(f'entry=hint="字段{i}",id=w{i};\n')
+            elif kind % 3 == 1:
+                f.write(f'label=text="文字{i}",id=w{i};\n')
+            else:
+                f.write(f'progress=label="进度{i}",id=w{i},min=0,max=100,value=50;\n')
+
+
+def painted(profile):
+    """--profile 是否已写出首帧绘制的摘要"""
+    if not os.path.exists(profile):
+        return False
+    with open(profile, encoding='utf-8') as f:
+        return f.read().endswith("\n")
+
+
+def open_file(command, path, profile, env):
+    """返回 (到首帧绘制的耗时, 客户端进程从启动到退出的耗时, 启动的进程)；直接启动时第二项为 None"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, command, path, "--profile", profile], env=env,
+                               stdout=subprocess.DEVNULL, start_new_session=True)
+    paint_ms = client_ms = None
+    while paint_ms is None or (command == CLIENT and client_ms is None):
+        elapsed = (time.perf_counter() - start) * 1000
+        if elapsed > TIMEOUT_S * 1000:
+            raise SystemExit("窗口未能显示")
+        if paint_ms is None and painted(profile):
+            paint_ms = elapsed
+        if client_ms is None and process.poll() is not None:
+            client_ms = elapsed
+        time.sleep(0.001)
+    return paint_ms, client_ms if command == CLIENT else None, process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("count", type=int, nargs="?", default=200)
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix="eui_launcher_bench_")
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["EASY_UI_LAUNCHER"] = os.path.join(directory, "launcher.sock") if sys.platform != "win32" \
+        else rf"\\.\pipe\eui-launcher-bench-{os.getpid()}"
+    launcher = subprocess.Popen([sys.executable, INTERPRETER, "--launcher"], env=env,
+                                stderr=subprocess.PIPE, text=True, encoding='utf-8', start_new_session=True)
+    started = []
+    try:
+        # 备用进程与启动器共用 stderr，就绪提示之前可能夹着它们的输出
+        if not any(line.startswith("[EUI] 启动器已就绪") for line in launcher.stderr):
+            raise SystemExit("启动器未能启动")
+        path = os.path.join(directory, "form.eui")
+        write_program(path, args.count)
+        results = {"直接启动": [], "启动器": [], "客户端": []}
+        for i in range(args.runs):
+            for name, command in (("直接启动", INTERPRETER), ("启动器", CLIENT)):
+                time.sleep(SPARE_WARMUP_S)
+                paint_ms, client_ms, process = open_file(command, path, os.path.join(directory, f"{i}{name}.json"), env)
+                started.append(process)
+                results[name].append(paint_ms)
+                if client_ms is not None:
+                    results["客户端"].append(client_ms)
+        print(f"{args.count} 行程序，从启动到窗口绘制完成 ms（{args.runs} 次的中位数）")
+        print(f"直接启动解释器    {statistics.median(results['直接启动']):8.1f}")
+        print(f"经常驻启动器      {statistics.median(results['启动器']):8.1f}"
+              f"（eui_launch.py 进程从启动到退出 {statistics.median(results['客户端']):.1f}）")
+    finally:
+        for process in started:
+            if process.poll() is None:
+                process.kill()
+        # 启动器打开的窗口与备用进程都在它的进程组里
+        if hasattr(os, "killpg"):
+            os.killpg(launcher.pid, signal.SIGKILL)
+        else:
+            launcher.kill()
+        launcher.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""表单布局基准：每个组件一层容器（--layout nested）与同一容器内共用网格（--layout form）
+
+在独立子进程中构建含大量输入框、下拉框、滑块、进度条与带文字分隔线的表单，记录窗口下的 QWidget
+与 QObject 数量、构建耗时、首次显示（含布局计算）耗时，以及反复改变窗口宽度时每次重新布局的平均耗时。
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_layout.py [字段数] [改变尺寸次数]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import QObject
+from easy_ui_interpreter import EasyUIInterpreter
+
+app = QApplication(sys.argv[:1])
+interpreter = EasyUIInterpreter()
+interpreter.layout_mode = {mode!r}
+interpreter._begin_run()
+lines = ['window=title="布局基准",width=600,height=800;']
+for i in range({fields}):
+    kind = i % 5
+    if kind == 0:
+        lines.append(f'entry=hint="字段{{i}}",id=f{{i}};')
+    elif kind == 1:
+        lines.append(f'combo=label="选项{{i}}",id=f{{i}},options=["甲","乙","丙"];')
+    elif kind == 2:
+        lines.append(f'slider=label="滑块{{i}}",id=f{{i}},min=0,max=100,value=50;')
+    elif kind == 3:
+        lines.append(f'progress=label="进度{{i}}",id=f{{i}},min=0,max=100,value=50;')
+    else:
+        lines.append(f'separator=text="分组{{i}}",id=f{{i}};')
+nodes = interpreter.parse("\n".join(lines))
+start = time.perf_counter()
+for node in nodes:
+    interpreter.build_node(node)
+interpreter._finish_build()
+built = time.perf_counter()
+interpreter.window.show()
+app.processEvents()
+shown = time.perf_counter()
+widgets = len(interpreter.window.findChildren(QWidget))
+objects = len(interpreter.window.findChildren(QObject))
+begin = time.perf_counter()
+for i in range({resizes}):
+    interpreter.window.resize(600 + (i + 1) % 2 * 200, 800)
+    app.processEvents()  # 处理尺寸变化：重新布局并重绘可见部分
+relayout = time.perf_counter() - begin
+print(widgets, objects, (built - start) * 1000, (shown - built) * 1000, relayout / {resizes} * 1000)
+"""
+
+
+def main():
+    fields = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    resizes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    print(f"{fields} 个字段，改变窗口宽度 {resizes} 次")
+    print(f"{'':<8}{'QWidget':>9}{'QObject':>9}{'构建ms':>10}{'显示ms':>10}{'重新布局ms':>12}")
+    for mode in ("nested", "form"):
+        code = CHILD.format(root=ROOT, mode=mode, fields=fields, resizes=resizes)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             check=True, env=env).stdout
+        widgets, objects, built, shown, relayout = out.split()
+        print(f"{mode:<8}{widgets:>9}{objects:>9}{float(built):>10.1f}{float(shown):>10.1f}"
+              f"{float(relayout):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""容器栈基准：按分组框个数递增构建表单，比较逐组件查找当前布局的旧做法与容器栈的构建耗时
+
+旧做法每创建一个组件都要 list(self.groups.values())[-1]，开销随分组框个数线性增长；这里用子类
+模拟这部分查找开销（放置位置仍取容器栈顶，两者构建出的界面相同）。表单有两种形状：
+“并列”为依次用 end= 结束的分组框，“嵌套”为逐层嵌套、从不结束的分组框。每个分组框内放若干输入框。
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_nesting.py [每个分组框内的字段数]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GROUP_COUNTS = (250, 500, 1000, 2000)
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from easy_ui_interpreter import EasyUIInterpreter
+
+
+class LegacyLookupInterpreter(EasyUIInterpreter):
+    def _get_current_layout(self):
+        list(self.groups.values())[-1] if self.groups else self.main_layout
+        return self._containers[-1][0]
+
+
+app = QApplication(sys.argv[:1])
+interpreter = (LegacyLookupInterpreter if {legacy!r} else EasyUIInterpreter)()
+interpreter._begin_run()
+lines = ['window=title="容器基准",width=600,height=800;']
+for g in range({groups}):
+    lines.append(f'groupbox=title="分组{{g}}",id=g{{g}};')
+    for i in range({fields}):
+        lines.append(f'entry=hint="字段{{i}}",id=g{{g}}_f{{i}};')
+    if not {nested!r}:
+        lines.append('end=;')
+nodes = interpreter.parse("\n".join(lines))
+start = time.perf_counter()
+for node in nodes:
+    interpreter.build_node(node)
+interpreter._finish_build()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def main():
+    fields = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    print(f"每个分组框 {fields} 个字段，构建耗时 ms（括号内为每个组件的微秒数）")
+    print(f"{'分组框数':<8}{'并列/旧查找':>16}{'并列/容器栈':>16}{'嵌套/旧查找':>16}{'嵌套/容器栈':>16}")
+    for groups in GROUP_COUNTS:
+        cells = []
+        for nested in (False, True):
+            for legacy in (True, False):
+                code = CHILD.format(root=ROOT, legacy=legacy, nested=nested, groups=groups, fields=fields)
+                out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                     check=True, env=env).stdout
+                elapsed = float(out)
+                per_widget = elapsed * 1000 / (groups * (fields + 1))
+                cells.append(f"{elapsed:9.1f}({per_widget:4.0f})")
+        print(f"{groups:<10}" + "".join(f"{cell:>18}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""解析吞吐基准：新的单遍词法/语法分析器 vs 旧版逐条正则匹配
+
+用法：python benchmarks/bench_parse.py [行数]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from easy_ui_interpreter import parse_program
+
+# 覆盖全部标签的样例语句，timer 放在最后（旧实现中需失败匹配最多次）
+SAMPLE_LINES = [
+    'label=text="用户名：",id=label_{i};',
+    'entry=hint="请输入手机号",id=entry_{i},readonly=false,type=number;',
+    'combo=label="所属部门",id=combo_{i},options=["技术部","财务部","市场部"];',
+    'checkbox=label="兴趣爱好",id=check_{i},options=["读书","编程","运动"];',
+    'button=text="提交",id=btn_{i},click="显示=entry_{i}";',
+    'audio=os="music/bg.mp3",id=audio_{i};',
+    'image=path="img/banner.png",id=img_{i},width=300,height=100,tooltip="横幅";',
+    'slider=label="音量",id=slider_{i},min=0,max=100,value=70;',
+    'textarea=label="备注",id=area_{i},rows=5,readonly=false;',
+    'separator=text="分隔",id=sep_{i};',
+    'progress=label="下载进度",id=prog_{i},min=0,max=100,value=30;',
+    'calendar=label="日期",id=cal_{i};',
+    'radiogroup=label="性别",id=radio_{i},options=["男","女"];',
+    'groupbox=title="分组",id=group_{i};',
+    'timer=id=timer_{i},interval=1000,action="update_progress=prog_{i},step=1";',
+]
+
+
+def make_source(line_count):
+    lines = ['window=title="基准",width=800,height=600;']
+    for i in range(line_count):
+        lines.append(SAMPLE_LINES[i % len(SAMPLE_LINES)].format(i=i))
+    return '\n'.join(lines)
+
+
+def legacy_parse_line(line):
+    """旧版 parse_line 的正则级联（只做匹配与取值，不创建组件）"""
+    line = line.strip().rstrip(';')
+    if not line:
+        return None
+    m = re.match(r'window\s*=\s*title="([^"]+)"\s*,\s*width=(\d+)\s*,\s*height=(\d+)(?:\s*,\s*icon="([^"]+)")?', line)
+    if m:
+        return ('window', m.group(1), int(m.group(2)), int(m.group(3)), m.group(4))
+    m = re.match(r'label\s*=\s*text="([^"]+)"\s*,\s*id=(\w+)', line)
+    if m:
+        return ('label', m.group(1), m.group(2))
+    m = re.match(r'entry\s*=\s*hint="([^"]+)"\s*,\s*id=(\w+)(?:\s*,\s*readonly=(true|false))?(?:\s*,\s*type=(number|text))?', line)
+    if m:
+        return ('entry', m.group(1), m.group(2), m.group(3), m.group(4))
+    m = re.match(r'combo\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*options=\[(.*?)\]', line)
+    if m:
+        return ('combo', m.group(1), m.group(2), [o.strip().strip('"') for o in m.group(3).split(',') if o.strip()])
+    m = re.match(r'checkbox\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*options=\[(.*?)\]', line)
+    if m:
+        return ('checkbox', m.group(1), m.group(2), [o.strip().strip('"') for o in m.group(3).split(',') if o.strip()])
+    m = re.match(r'button\s*=\s*text="([^"]+)"\s*,\s*id=(\w+)\s*,\s*click="([^"]+)"', line)
+    if m:
+        return ('button', m.group(1), m.group(2), m.group(3))
+    m = re.match(r'audio\s*=\s*(url|os)="([^"]+)"\s*,\s*id=(\w+)', line)
+    if m:
+        return ('audio', m.group(1), m.group(2), m.group(3))
+    m = re.match(r'image\s*=\s*(path|url|os)="([^"]+)"\s*,\s*id=(\w+)(?:\s*,\s*width=(\d+))?(?:\s*,\s*height=(\d+))?(?:\s*,\s*tooltip="([^"]+)")?', line)
+    if m:
+        return ('image',) + m.groups()
+    m = re.match(r'slider\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*min=(\d+)\s*,\s*max=(\d+)\s*,\s*value=(\d+)', line)
+    if m:
+        return ('slider', m.group(1), m.group(2), int(m.group(3)), int(m.group(4)), int(m.group(5)))
+    m = re.match(r'textarea\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*rows=(\d+)(?:\s*,\s*readonly=(true|false))?', line)
+    if m:
+        return ('textarea', m.group(1), m.group(2), int(m.group(3)), m.group(4))
+    m = re.match(r'separator\s*=\s*text="([^"]*)"\s*,\s*id=(\w+)', line)
+    if m:
+        return ('separator', m.group(1), m.group(2))
+    m = re.match(r'progress\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*min=(\d+)\s*,\s*max=(\d+)\s*,\s*value=(\d+)', line)
+    if m:
+        return ('progress', m.group(1), m.group(2), int(m.group(3)), int(m.group(4)), int(m.group(5)))
+    m = re.match(r'calendar\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)', line)
+    if m:
+        return ('calendar', m.group(1), m.group(2))
+    m = re.match(r'radiogroup\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*options=\[(.*?)\]', line)
+    if m:
+        return ('radiogroup', m.group(1), m.group(2), [o.strip().strip('"') for o in m.group(3).split(',') if o.strip()])
+    m = re.match(r'groupbox\s*=\s*title="([^"]+)"\s*,\s*id=(\w+)', line)
+    if m:
+        return ('groupbox', m.group(1), m.group(2))
+    m = re.match(r'timer\s*=\s*id=(\w+)\s*,\s*interval=(\d+)\s*,\s*action="([^"]+)"', line)
+    if m:
+        return ('timer', m.group(1), int(m.group(2)), m.group(3))
+    return None
+
+
+def legacy_parse(code):
+    lines = [line.strip() for line in code.split('\n') if line.strip()]
+    return [r for r in (legacy_parse_line(line) for line in lines) if r]
+
+
+def new_parse(code):
+    return list(parse_program(code))
+
+
+def best_of(func, code, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(code)
+        best = min(best, time.perf_counter() - start)
+    return best, len(result)
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    code = make_source(line_count)
+    print(f"源码：{line_count + 1} 行，{len(code) / 1024:.0f} KB")
+    for name, func in (("旧版正则级联", legacy_parse), ("单遍词法/语法分析", new_parse)):
+        elapsed, statements = best_of(func, code)
+        print(f"{name:<12} {elapsed * 1000:8.1f} ms  {statements / elapsed:10.0f} 语句/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""热重载基准：在大文件中改动一行后，就地重新加载（--watch）与重新启动解释器的耗时
+
+生成一个合成的 .eui 文件（文字、输入框、按钮、进度条与分组框循环出现），在独立子进程中以 hot_reload
+构建并显示窗口，然后分别修改中间一行的文字、插入一行、删除一行，记录 reload() 及随后处理完事件的
+耗时与复用/新建的组件数；再写入文件，记录从保存到经 QFileSystemWatcher 完成重新加载的耗时（含
+WATCH_DEBOUNCE_MS 的合并窗口）。作为对比，记录启动一个新解释器进程直到窗口显示的耗时，即改动后
+关掉窗口重新运行的代价。无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_reload.py [行数]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer, QCoreApplication, QEvent
+from easy_ui_interpreter import EasyUIInterpreter, WATCH_DEBOUNCE_MS
+
+app = QApplication(sys.argv[:1])
+
+
+def settle():
+    # 处理完重新布局与绘制，并销毁换下的组件（重建时是整个旧的中央组件）
+    for _ in range(3):
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+interpreter = EasyUIInterpreter()
+interpreter.hot_reload = True
+interpreter.watch_path = {path!r}
+with open({path!r}, encoding='utf-8') as f:
+    code = f.read()
+interpreter._begin_run()
+for node in interpreter.load_program(code):
+    interpreter.build_node(node)
+interpreter._finish_build()
+interpreter.window.show()
+settle()
+interpreter.widgets['w{middle}'].setText('已输入的内容')
+
+lines = code.splitlines(keepends=True)
+edits = [
+    ('修改一行', lines[:{middle_line}] + [lines[{middle_line}].replace('文字', '改动后的文字')] + lines[{middle_line} + 1:]),
+    ('插入一行', lines[:{middle_line}] + ['label=text="新增",id=added;\n'] + lines[{middle_line}:]),
+    ('删除一行', lines[:{middle_line}] + lines[{middle_line} + 1:]),
+]
+for name, edited in edits:
+    start = time.perf_counter()
+    stats = interpreter.reload(''.join(edited))
+    settle()
+    elapsed = (time.perf_counter() - start) * 1000
+    assert interpreter.widgets['w{middle}'].text() == '已输入的内容'
+    print(name, stats['ms'], elapsed, stats['reused'], stats['created'], stats['removed'])
+
+# 保存文件，经文件监视触发重新加载
+done = []
+reload = interpreter.reload
+interpreter.reload = lambda code: done.append(reload(code)) or app.quit()
+with open({path!r}, 'w', encoding='utf-8') as f:
+    f.write(''.join(edits[-1][1]).replace('"文字{saved}"', '"保存后的文字"'))
+saved = time.perf_counter()
+QTimer.singleShot(10000, app.quit)
+app.exec_()
+settle()
+stats = done[0] if done else {{'ms': -1, 'reused': 0, 'created': 0, 'removed': 0}}
+print('保存后自动重新加载', WATCH_DEBOUNCE_MS, stats['ms'], (time.perf_counter() - saved) * 1000, stats['reused'], stats['created'],
+      stats['removed'])
+"""
+
+RESTART = r"""
+import sys
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from easy_ui_interpreter import EasyUIInterpreter
+
+app = QApplication(sys.argv[:1])
+interpreter = EasyUIInterpreter()
+with open({path!r}, encoding='utf-8') as f:
+    code = f.read()
+interpreter._begin_run()
+interpreter._batching = True
+for node in interpreter.load_program(code):
+    interpreter.build_node(node)
+interpreter._finish_build()
+interpreter.window.show()
+app.processEvents()
+"""
+
+
+def write_program(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('window=title="热重载基准",width=600,height=800;\n')
+        for i in range(count - 1):
+            kind = i % 10
+            if kind == 0:
+                f.write(f'groupbox=title="分组{i}",id=g{i};\n')
+            elif kind == 9:
+                f.write('end=;\n')
+            elif kind % 3 == 0:
+                f.write(f'entry=hint="字段{i}",id=w{i};\n')
+            elif kind % 3 == 1:
+                f.write(f'label=text="文字{i}",id=w{i};\n')
+            else:
+                f.write(f'progress=label="进度{i}",id=w{i},min=0,max=100,value=50;\n')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    directory = tempfile.mkdtemp(prefix="eui_reload_bench_")
+    try:
+        path = os.path.join(directory, "form.eui")
+        write_program(path, count)
+        # 中间的一个输入框（w{i} 中 i % 10 == 3）；改动、插入与删除都发生在它后面一行（文字 w{i+1}），
+        # 保存文件时改动再后面的文字 w{i+4}
+        middle = count // 2 // 10 * 10 + 3
+        code = CHILD.format(root=ROOT, path=path, middle=middle, middle_line=middle + 2, saved=middle + 4)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             check=True, env=env).stdout
+        print(f"{count} 行程序，改动一行后（合计含随后的布局、绘制与销毁换下的组件）")
+        print(f"{'':<20}{'reload() ms':>12}{'合计ms':>10}{'复用':>8}{'新建':>6}{'移除':>6}")
+        for line in out.splitlines():
+            if line.startswith('保存'):
+                name, debounce, *rest = line.split()
+                name += f"（含{debounce}ms合并）"
+            else:
+                name, *rest = line.split()
+            reload_ms, elapsed, reused, created, removed = rest
+            print(f"{name:<{20 - len(name)}}{float(reload_ms):>12.1f}{float(elapsed):>10.1f}"
+                  f"{reused:>8}{created:>6}{removed:>6}")
+        write_program(path, count)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", RESTART.format(root=ROOT, path=path)], check=True, env=env)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{'重新启动解释器':<13}{'':>12}{elapsed:>10.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""批量截图基准：--render 逐个文件启动解释器，与对整个目录批量截图（每个工作进程一个 QApplication）的吞吐量对比
+
+生成一个目录的合成 .eui 文件（文字、输入框、进度条与分组框循环出现，每个文件略有不同），分别测量：
+“逐个进程”为对每个文件各运行一次 python easy_ui_interpreter.py 文件 --render 图片；
+“批量 --jobs N”为 python easy_ui_interpreter.py 目录 --render 输出目录 --jobs N，
+N 取 1 与 CPU 核数（核数为 1 时只测 1）。均为从启动命令到进程退出的总耗时，换算为每秒处理的文件数。
+
+用法：python benchmarks/bench_render.py [--files 文件数] [行数]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERPRETER = os.path.join(ROOT, "easy_ui_interpreter.py")
+
+
+def write_program(path, count, seed):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'window=title="截图基准{seed}",width=600,height=800;\n')
+        for i in range(count - 1):
+            kind = (i + seed) % 10
+            if kind == 0:
+                f.write(f'groupbox=title="分组{i}",id=g{i};\n')
+            elif kind == 9:
+                f.write('end=;\n')
+            elif kind % 3 == 0:
+                f.write(f'entry=hint="字段{i}",id=w{i};\n')
+            elif kind % 3 == 1:
+                f.write(f'label=text="文字{i}",id=w{i};\n')
+            else:
+                f.write(f'progress=label="进度{i}",id=w{i},min=0,max=100,value={(i + seed) % 100};\n')
+
+
+def timed(command):
+    start = time.perf_counter()
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("lines", type=int, nargs="?", default=50)
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix="eui_render_bench_")
+    try:
+        forms = os.path.join(directory, "forms")
+        os.makedirs(forms)
+        paths = []
+        for i in range(args.files):
+            paths.append(os.path.join(forms, f"form{i:04}.eui"))
+            write_program(paths[-1], args.lines, i)
+
+        results = []
+        output = os.path.join(directory, "single")
+        os.makedirs(output)
+        elapsed = sum(timed([sys.executable, INTERPRETER, path, "--render",
+                             os.path.join(output, os.path.basename(path) + ".png")]) for path in paths)
+        results.append(("逐个进程", elapsed))
+        for jobs in sorted({1, os.cpu_count() or 1}):
+            output = os.path.join(directory, f"batch{jobs}")
+            elapsed = timed([sys.executable, INTERPRETER, forms, "--render", output, "--jobs", str(jobs)])
+            rendered = sum(len(files) for _, _, files in os.walk(output))
+            if rendered != args.files:
+                raise SystemExit(f"--jobs {jobs} 只截图了 {rendered} 个文件")
+            results.append((f"批量 --jobs {jobs}", elapsed))
+
+        print(f"{args.files} 个文件（每个 {args.lines} 行）截图为 PNG")
+        print(f"{'':<16}{'总耗时 s':>10}{'文件/秒':>10}")
+        for name, elapsed in results:
+            print(f"{name:<16}{elapsed:>10.2f}{args.files / elapsed:>10.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""常驻运行基准：编辑器每次运行都启动新解释器进程，与经本地套接字交给常驻进程（--serve）就地重建的耗时对比
+
+为每个规模生成一个合成的 .eui 文件，分别测量从按下运行到窗口绘制完成的耗时：
+“新进程”按 InterpreterThread 的方式启动 easy_ui_interpreter.py（加 --profile，以其首帧绘制时输出的摘要为准）；
+“常驻/首次”为启动 --serve 进程并运行第一次（包含进程启动，与新进程相当）；
+“常驻/改动后”为窗口开着时改动中间一行文字再运行，即就地重新加载；
+“常驻/关窗后”为关闭窗口后再运行，在已启动的进程中重新构建整个窗口。
+每项取多次的中位数。无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_run_server.py [--runs 次数] [行数 ...]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtNetwork import QLocalServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERPRETER = os.path.join(ROOT, "easy_ui_interpreter.py")
+DEFAULT_SIZES = (50, 1000)
+TIMEOUT_MS = 30000
+
+
+def write_program(path, count, marker=""):
+    """marker 只加在中间的一个文字组件上，模拟每次运行前改动一行"""
+    edited = count // 2 // 10 * 10 + 1
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('window=title="常驻运行基准",width=600,height=800;\n')
+        for i in range(count - 1):
+            kind = i % 10
+            if kind == 0:
+                f.write(f'groupbox=title="分组{i}",id=g{i};\n')
+            elif kind == 9:
+                f.write('end=;\n')
+            elif kind % 3 == 0:
+                f.write(f'entry=hint="字段{i}",id=w{i};\n')
+            elif kind % 3 == 1:
+                f.write(f'label=text="文字{i}{marker if i == edited else ""}",id=w{i};\n')
+            else:
+                f.write(f'progress=label="进度{i}",id=w{i},min=0,max=100,value=50;\n')
+
+
+def new_process(path, env):
+    """启动新解释器进程，返回到首帧绘制的耗时"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, INTERPRETER, path, "--profile"], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, encoding='utf-8')
+    try:
+        for line in process.stderr:
+            if line.startswith('{') and json.loads(line).get('event') == 'first_paint':
+                return (time.perf_counter() - start) * 1000
+        raise SystemExit("解释器未能显示窗口")
+    finally:
+        process.kill()
+        process.wait()
+
+
+class ServeClient:
+    """以编辑器的方式启动 --serve 进程并收发命令（阻塞式，不需要事件循环）"""
+    def __init__(self, env):
+        self.name = f"eui-bench-{os.getpid()}"
+        QLocalServer.removeServer(self.name)
+        self.server = QLocalServer()
+        self.server.listen(self.name)
+        self.env = env
+        self.process = None
+        self.socket = None
+
+    def start(self):
+        self.process = subprocess.Popen([sys.executable, INTERPRETER, "--serve", self.name], env=self.env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        connected, _ = self.server.waitForNewConnection(TIMEOUT_MS)
+        if not connected:
+            raise SystemExit("--serve 进程未能连接")
+        self.socket = self.server.nextPendingConnection()
+
+    def request(self, command):
+        self.socket.write((json.dumps(command, ensure_ascii=False) + "\n").encode('utf-8'))
+        self.socket.flush()
+        while True:
+            while not self.socket.canReadLine():
+                if not self.socket.waitForReadyRead(TIMEOUT_MS):
+                    raise SystemExit("--serve 进程没有回复")
+            reply = json.loads(bytes(self.socket.readLine()).decode('utf-8'))
+            if 'event' not in reply:
+                if not reply['ok']:
+                    raise SystemExit(reply['error'])
+                return reply
+
+    def run(self, path):
+        with open(path, encoding='utf-8') as f:
+            code = f.read()
+        start = time.perf_counter()
+        reply = self.request({'cmd': 'run', 'code': code})
+        return (time.perf_counter() - start) * 1000, reply
+
+    def close(self):
+        self.socket.disconnectFromServer()
+        self.process.wait(10)
+        # 下一个客户端沿用同一名称，旧的监听要先关掉，否则它被回收时会删掉新的套接字文件
+        self.server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("sizes", type=int, nargs="*")
+    args = parser.parse_args()
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QCoreApplication(sys.argv[:1])
+    directory = tempfile.mkdtemp(prefix="eui_serve_bench_")
+    try:
+        print(f"从运行到窗口绘制完成的耗时 ms（{args.runs} 次的中位数）")
+        print(f"{'行数':<8}{'新进程':>10}{'常驻/首次':>12}{'常驻/改动后':>12}{'常驻/关窗后':>12}")
+        for count in args.sizes or DEFAULT_SIZES:
+            path = os.path.join(directory, f"form{count}.eui")
+            write_program(path, count)
+            fresh = [new_process(path, env) for _ in range(args.runs)]
+
+            first, edited, reopened = [], [], []
+            for _ in range(args.runs):
+                client = ServeClient(env)
+                start = time.perf_counter()
+                client.start()
+                client.run(path)
+                first.append((time.perf_counter() - start) * 1000)
+                for i in range(args.runs):
+                    write_program(path, count, marker=str(i))
+                    elapsed, reply = client.run(path)
+                    assert reply['reloaded']
+                    edited.append(elapsed)
+                client.request({'cmd': 'stop'})
+                elapsed, reply = client.run(path)
+                assert not reply['reloaded']
+                reopened.append(elapsed)
+                client.close()
+                write_program(path, count)
+            print(f"{count:<10}" + "".join(f"{statistics.median(values):>12.1f}"
+                                           for values in (fresh, first, edited, reopened)))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        del app
+
+
+if __name__ == "__main__":
+    main()
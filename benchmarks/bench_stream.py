@@ -0,0 +1,85 @@
+"""流式构建基准：一次性构建与流式构建的首帧耗时、全部构建完成耗时
+
+用法：python benchmarks/bench_stream.py [组件数]
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_parse import SAMPLE_LINES
+
+# 子进程：运行解释器，在首帧绘制与构建完成后输出耗时（毫秒）并退出
+CHILD = r"""
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+from easy_ui_interpreter import EasyUIInterpreter, _FirstPaintWatcher
+app = QApplication(sys.argv[:1])
+interpreter = EasyUIInterpreter()
+start = time.perf_counter()
+result = {{}}
+
+def on_paint(window):
+    result.setdefault('first_paint_ms', (time.perf_counter() - start) * 1000)
+
+if {stream!r}:
+    def poll():
+        if 'build_done_ms' in interpreter.metrics:
+            result.update(interpreter.metrics)
+            app.quit()
+else:
+    watcher = _FirstPaintWatcher(on_paint)
+    create_window = interpreter.create_window
+    def create_and_watch(*args):
+        create_window(*args)
+        interpreter.window.installEventFilter(watcher)
+    interpreter.create_window = create_and_watch
+    def poll():
+        if 'first_paint_ms' in result:
+            result['build_done_ms'] = result['first_paint_ms']
+            app.quit()
+timer = QTimer()
+timer.timeout.connect(poll)
+timer.start(10)
+try:
+    with open({path!r}, encoding='utf-8') as f:
+        if {stream!r}:
+            interpreter.stream_and_run(f)
+        else:
+            interpreter.parse_and_run(f.read())
+except SystemExit:
+    pass
+print(result['first_paint_ms'], result['build_done_ms'])
+"""
+
+
+def run(path, stream):
+    code = CHILD.format(root=ROOT, path=path, stream=stream)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    first_paint, done = out.strip().splitlines()[-1].split()
+    return float(first_paint), float(done)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    lines = ['window=title="流式构建基准",width=800,height=600;']
+    widgets = [line for line in SAMPLE_LINES if not line.startswith(('audio', 'image', 'groupbox', 'timer'))]
+    lines += [widgets[i % len(widgets)].format(i=i) for i in range(count)]
+    with tempfile.NamedTemporaryFile("w", suffix=".eui", encoding="utf-8", delete=False) as f:
+        f.write("\n".join(lines))
+    try:
+        print(f"组件数：{count}")
+        for name, stream in (("一次性构建", False), ("流式构建", True)):
+            first_paint, done = run(f.name, stream)
+            print(f"{name:<6} 首帧 {first_paint:8.1f} ms  全部构建完成 {done:8.1f} ms")
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
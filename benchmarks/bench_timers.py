@@ -0,0 +1,99 @@
+"""定时器基准：每个 timer= 一个 QTimer（旧做法）与 TimerScheduler 时间轮的唤醒次数与 CPU 占用
+
+构建 N 个定时器（间隔取自少数几种），在 1 秒内错开启动后运行若干秒，记录动作执行次数、唤醒次数
+（时间轮为 QTimer 唤醒次数；旧做法每个定时器各自触发，按触发次数计）、主动上下文切换次数
+（ru_nvcsw，两种做法同口径，仅 Unix）与 CPU 占用。无显示器的环境可设置 QT_QPA_PLATFORM=offscreen。
+
+用法：python benchmarks/bench_timers.py [定时器数] [运行秒数]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERVALS = (100, 250, 500, 1000)
+
+CHILD = r"""
+import random, resource, sys, time
+from functools import partial
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+from easy_ui_interpreter import EasyUIInterpreter
+
+fired = [0]
+
+
+class LegacyInterpreter(EasyUIInterpreter):
+    # 旧实现：每个 timer= 一个 QTimer
+    def create_timer(self, timer_id, interval, action):
+        timer = QTimer()
+        timer.setInterval(interval)
+        bound = self._new_action(action, timer_id)
+        timer.timeout.connect(bound)
+        self.timers[timer_id] = {{'timer': timer, 'action': bound}}
+
+
+app = QApplication(sys.argv[:1])
+interpreter = (LegacyInterpreter if {legacy!r} else EasyUIInterpreter)()
+interpreter._begin_run()
+lines = ['window=title="定时器基准",width=400,height=300;']
+for i in range(50):
+    lines.append(f'progress=label="p{{i}}",id=p{{i}},min=0,max=100000000,value=0;')
+random.seed(1)
+for i in range({count}):
+    lines.append(f'timer=id=t{{i}},interval={{random.choice({intervals!r})}},action="update_progress=p{{i % 50}},step=1";')
+for node in interpreter.parse("\n".join(lines)):
+    interpreter.build_node(node)
+interpreter._finish_build()
+
+
+def counted(run):
+    fired[0] += 1
+    run()
+
+
+# _finish_build 已完成动作绑定；包一层计数后，在 1 秒内错开启动各定时器
+for info in interpreter.timers.values():
+    info['action'].run = partial(counted, info['action'].run)
+    QTimer.singleShot(random.randint(0, 1000), info['timer'].start)
+
+def measure_start():
+    global cpu0, wall0, csw0, fired0, wake0
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    csw0 = resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw
+    fired0 = fired[0]
+    wake0 = interpreter.timer_scheduler.wakeups
+
+def measure_end():
+    cpu = time.process_time() - cpu0
+    wall = time.perf_counter() - wall0
+    csw = resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw - csw0
+    runs = fired[0] - fired0
+    wakeups = runs if {legacy!r} else interpreter.timer_scheduler.wakeups - wake0
+    print(runs / wall, wakeups / wall, csw / wall, cpu / wall * 100)
+    app.quit()
+
+QTimer.singleShot(1500, measure_start)  # 等全部定时器启动完毕
+QTimer.singleShot(1500 + int({seconds} * 1000), measure_end)
+app.exec_()
+"""
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    print(f"{count} 个定时器（间隔 {'/'.join(map(str, INTERVALS))} ms），测量 {seconds:g} 秒")
+    print(f"{'':<14}{'动作/秒':>10}{'唤醒/秒':>10}{'上下文切换/秒':>14}{'CPU':>8}")
+    for label, legacy in (("每定时器QTimer", True), ("时间轮调度", False)):
+        code = CHILD.format(root=ROOT, legacy=legacy, count=count, seconds=seconds, intervals=INTERVALS)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             check=True, env=env).stdout
+        runs, wakeups, switches, cpu = map(float, out.split())
+        print(f"{label:<14}{runs:>10.0f}{wakeups:>10.0f}{switches:>14.0f}{cpu:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import sys
 import os
 import re
 import glob
+import json
 import tempfile
 import shutil
 import winreg
@@ -14,7 +15,8 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QTextEdit, QPushButton,
                             QInputDialog, QMenu as QContextMenu, QComboBox)
 from PyQt5.QtGui import (QFont, QSyntaxHighlighter, QTextCharFormat, QColor,
                          QTextDocument, QTextCursor, QIcon, QPixmap)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QProcess, QDateTime, QTimer, QStringListModel
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal, QProcess, QDateTime, QTimer, QStringListModel
+from PyQt5.QtNetwork import QLocalServer
 
 # 文件关联相关功能
 class FileAssociation:
@@ -292,6 +294,30 @@ class InterpreterSelector(QDialog):
         return file_path if file_path else None
 
 
+def decode_output(data):
+    """解码解释器输出的一行（UTF-8，失败时按 GBK）"""
+    try:
+        return data.decode('utf-8').rstrip('\r\n')
+    except UnicodeDecodeError:
+        return data.decode('gbk', errors='replace').rstrip('\r\n')
+
+
+class OutputLines:
+    """把 QProcess 分几次读到的输出拼成完整的行：一行可能跨两次读取到达，末尾不完整的部分留到下次"""
+    def __init__(self):
+        self.partial = b''
+
+    def feed(self, data):
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        return [decode_output(line) for line in lines]
+
+    def flush(self):
+        """进程结束时取出最后一行（没有换行结尾）"""
+        line, self.partial = self.partial, b''
+        return [decode_output(line)] if line else []
+
+
 class InterpreterThread(QThread):
     error_occurred = pyqtSignal(str)
     output_received = pyqtSignal(str)
@@ -306,6 +332,8 @@ class InterpreterThread(QThread):
         self.process = None
         self.timeout = timeout * 1000
         self.timeout_timer = None
+        self.output_lines = OutputLines()
+        self.error_lines = OutputLines()
     
     def run(self):
         try:
@@ -351,26 +379,26 @@ class InterpreterThread(QThread):
         if self.timeout_timer and self.timeout_timer.isActive():
             self.timeout_timer.start(self.timeout)
             
-        while self.process and self.process.canReadLine():
-            try:
-                output = self.process.readLine().data().decode('utf-8').rstrip('\n')
-            except UnicodeDecodeError:
-                output = self.process.readLine().data().decode('gbk', errors='replace').rstrip('\n')
-            
+        if self.process:
+            self.emit_output(self.output_lines.feed(self.process.readAllStandardOutput().data()))
+    
+    def handle_error(self):
+        if self.process:
+            self.emit_error(self.error_lines.feed(self.process.readAllStandardError().data()))
+    
+    def emit_output(self, lines):
+        for output in lines:
             if output:
                 self.output_received.emit(f"[输出] {output}")
     
-    def handle_error(self):
-        while self.process and self.process.canReadLine(QProcess.StandardError):
-            try:
-                error = self.process.readLine(QProcess.StandardError).data().decode('utf-8').rstrip('\n')
-            except UnicodeDecodeError:
-                error = self.process.readLine(QProcess.StandardError).data().decode('gbk', errors='replace').rstrip('\n')
-            
+    def emit_error(self, lines):
+        for error in lines:
             if error:
                 self.error_occurred.emit(f"[错误] {error}")
     
     def on_process_finished(self, exit_code, exit_status):
+        self.emit_output(self.output_lines.flush())
+        self.emit_error(self.error_lines.flush())
         self.cleanup()
         
         if exit_status == QProcess.CrashExit:
@@ -416,6 +444,175 @@ class InterpreterThread(QThread):
             self.timeout_timer = None
 
 
+class PersistentInterpreter(QObject):
+    """常驻的解释器进程（easy_ui_interpreter --serve）：第一次运行时启动，之后每次运行只经本地套接字发送源码，
+    由它在已打开的窗口中就地重建，省去每次启动 Python、导入 PyQt5 与创建 QApplication 的时间。
+
+    信号与 InterpreterThread 相同；finished 表示运行的窗口已关闭。进程崩溃或无响应时结束它，
+    改用新进程：正在等待的这次运行在新进程中重试一次，之后的运行也都交给新进程。
+    """
+    error_occurred = pyqtSignal(str)
+    output_received = pyqtSignal(str)
+    finished = pyqtSignal()
+    timeout_occurred = pyqtSignal()
+    unsupported = pyqtSignal(str)  # 解释器不支持 --serve（如旧版 exe）时发出，参数为本次要运行的源码
+    
+    def __init__(self, interpreter_path, timeout=30):
+        super().__init__()
+        self.interpreter_path = interpreter_path
+        self.timeout = timeout * 1000
+        self.name = f"easy-ui-run-{os.getpid()}-{id(self):x}"
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.on_connected)
+        QLocalServer.removeServer(self.name)
+        self.server.listen(self.name)
+        self.process = None
+        self.socket = None
+        self.queued = None  # 进程连上之前要运行的源码
+        self.pending = None  # 已发出、尚未收到回复的源码
+        self.request_id = 0  # 最近一条 run 命令的编号，回复带回同一编号（stop 的回复与过期的回复据此忽略）
+        self.output_lines = OutputLines()
+        self.error_lines = OutputLines()
+        self.running = False  # 运行的窗口是否开着
+        self.retried = False  # 正在等待的这次运行是否已在新进程中重试过
+        self.timed_out = False
+        self.closing = False
+        self.reply_timer = QTimer(self)
+        self.reply_timer.setSingleShot(True)
+        self.reply_timer.timeout.connect(self.on_timeout)
+    
+    def start(self):
+        """启动常驻进程；已在运行时什么也不做"""
+        if self.process is not None:
+            return
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.SeparateChannels)
+        self.output_lines = OutputLines()
+        self.error_lines = OutputLines()
+        self.process.readyReadStandardOutput.connect(self.handle_output)
+        self.process.readyReadStandardError.connect(self.handle_error)
+        self.process.finished.connect(self.on_process_finished)
+        if self.interpreter_path.endswith('.exe'):
+            self.process.start(self.interpreter_path, ["--serve", self.name])
+        else:
+            self.process.start(sys.executable, [self.interpreter_path, "--serve", self.name])
+    
+    def run(self, code):
+        if self.socket is None:
+            self.queued = code
+            self.start()
+        else:
+            self.send(code)
+    
+    def send(self, code):
+        self.pending = code
+        self.request_id += 1
+        self.write({'cmd': 'run', 'id': self.request_id, 'code': code})
+        self.reply_timer.start(self.timeout)
+    
+    def write(self, command):
+        self.socket.write((json.dumps(command, ensure_ascii=False) + "\n").encode('utf-8'))
+        self.socket.flush()
+    
+    def stop(self):
+        """关闭运行的窗口，进程保留"""
+        if self.socket is not None and self.running:
+            self.write({'cmd': 'stop'})
+    
+    def shutdown(self):
+        """编辑器退出时结束常驻进程：断开连接后它会自行退出"""
+        self.closing = True
+        if self.socket is not None:
+            self.socket.disconnectFromServer()
+        if self.process is not None and not self.process.waitForFinished(2000):
+            self.process.kill()
+            self.process.waitForFinished(1000)
+        self.server.close()
+    
+    def on_connected(self):
+        self.socket = self.server.nextPendingConnection()
+        self.socket.readyRead.connect(self.on_message)
+        if self.queued is not None:
+            code, self.queued = self.queued, None
+            self.send(code)
+    
+    def on_message(self):
+        while self.socket is not None and self.socket.canReadLine():
+            message = json.loads(bytes(self.socket.readLine()).decode('utf-8'))
+            if message.get('event') == 'closed':
+                if self.running:
+                    self.running = False
+                    self.finished.emit()
+                continue
+            if self.pending is None or message.get('cmd') != 'run' or message.get('id') != self.request_id:
+                continue  # stop 命令的回复，或已超时重试的那次运行迟到的回复
+            self.reply_timer.stop()
+            self.pending = None
+            self.retried = False
+            if message['ok']:
+                self.running = True
+                action = "窗口已就地更新" if message['reloaded'] else "窗口已打开"
+                self.output_received.emit(f"[提示] {action}，耗时 {message['ms']:.0f} 毫秒")
+            else:
+                self.error_occurred.emit(f"[错误] {message['error']}")
+                if not self.running:
+                    self.finished.emit()
+    
+    def handle_output(self):
+        # 进程一直在运行，输出按行写出（见 --serve），每次读出全部已到达的完整行
+        self.emit_output(self.output_lines.feed(self.process.readAllStandardOutput().data()))
+    
+    def handle_error(self):
+        self.emit_error(self.error_lines.feed(self.process.readAllStandardError().data()))
+    
+    emit_output = InterpreterThread.emit_output
+    emit_error = InterpreterThread.emit_error
+    
+    def on_process_finished(self, exit_code, exit_status):
+        connected = self.socket is not None
+        self.handle_output()
+        self.handle_error()
+        self.emit_output(self.output_lines.flush())
+        self.emit_error(self.error_lines.flush())
+        self.process = None
+        self.socket = None
+        self.reply_timer.stop()
+        if self.timed_out:
+            self.timed_out = False
+            return
+        if self.closing:
+            return
+        if not connected:
+            # 没能连上就退出了：多半是不认识 --serve 的旧版解释器，交给编辑器改用单次运行
+            code, self.queued = self.queued, None
+            self.unsupported.emit(code)
+            return
+        code, self.pending = self.pending, None
+        if code is not None and not self.retried:
+            self.retried = True
+            self.error_occurred.emit("[提示] 常驻解释器进程已退出，改用新进程重新运行")
+            self.run(code)
+            return
+        self.retried = False
+        if exit_status == QProcess.CrashExit:
+            self.error_occurred.emit("进程崩溃，可能是代码语法错误或解释器异常")
+        else:
+            self.error_occurred.emit(f"进程异常退出，退出代码: {exit_code}")
+        if self.running or code is not None:
+            self.running = False
+            self.finished.emit()
+    
+    def on_timeout(self):
+        self.error_occurred.emit(f"[超时] 窗口 {self.timeout/1000} 秒内未能构建完成，已终止常驻解释器进程")
+        self.pending = None
+        self.running = False
+        if self.process is not None:
+            self.timed_out = True
+            self.process.kill()
+        self.timeout_occurred.emit()
+        self.finished.emit()
+
+
 class InterpreterSearchThread(QThread):
     progress_updated = pyqtSignal(object)
     search_complete = pyqtSignal(list)
@@ -930,6 +1127,9 @@ class EasyUIEditor(QMainWindow):
         self.status_bar = None
         self.interpreter_path = None
         self.run_timeout = 30
+        self.persistent_run = True  # 运行时交给常驻的解释器进程，在已打开的窗口中就地重建
+        self.run_server = None
+        self.serve_unsupported = None  # 不支持 --serve 的解释器路径，改用单次运行
         self.search_thread = None
         self.search_in_progress = False
         self.copied_path = None
@@ -944,6 +1144,7 @@ class EasyUIEditor(QMainWindow):
         
         self.scan_interpreters(quick_scan=True)
         self.full_scan_interpreters_in_background()
+        QTimer.singleShot(0, self.warm_up_interpreter)
         
         if self.cmd_line_file:
             self.open_file_from_path(self.cmd_line_file)
@@ -964,6 +1165,9 @@ class EasyUIEditor(QMainWindow):
             ("calendar", "标签 - 日历控件"),
             ("radiogroup", "标签 - 单选按钮组"),
             ("groupbox", "标签 - 分组框"),
+            ("row", "标签 - 横向排列容器"),
+            ("column", "标签 - 纵向排列容器"),
+            ("end", "标签 - 结束容器"),
             ("timer", "标签 - 定时器"),
             ("title", "属性 - 窗口标题"),
             ("width", "属性 - 宽度"),
@@ -1348,6 +1552,11 @@ class EasyUIEditor(QMainWindow):
         stop_action.triggered.connect(self.stop_running)
         run_menu.addAction(stop_action)
         
+        persistent_action = QAction("常驻解释器（重新运行时就地更新窗口）", self, checkable=True)
+        persistent_action.setChecked(self.persistent_run)
+        persistent_action.toggled.connect(self.set_persistent_run)
+        run_menu.addAction(persistent_action)
+        
         timeout_menu = run_menu.addMenu("运行超时设置")
         self.timeout_actions = {}
         for timeout in [10, 30, 60, 120]:
@@ -1467,10 +1676,21 @@ class EasyUIEditor(QMainWindow):
             self.run_timeout = sender.data()
             for act in self.timeout_actions.values():
                 act.setChecked(act.data() == self.run_timeout)
+            if self.run_server is not None:
+                self.run_server.timeout = self.run_timeout * 1000
             self.status_bar.showMessage(f"已设置运行超时时间为 {self.run_timeout} 秒")
     
+    def set_persistent_run(self, enabled):
+        self.persistent_run = enabled
+        if not enabled and self.run_server is not None:
+            self.run_server.shutdown()
+            self.run_server = None
+        self.status_bar.showMessage("已启用常驻解释器" if enabled else "已关闭常驻解释器，每次运行启动新进程")
+    
     def stop_running(self):
-        if hasattr(self, 'interpreter_thread') and self.interpreter_thread.isRunning():
+        if self.run_server is not None and self.run_server.running:
+            self.run_server.stop()
+        elif hasattr(self, 'interpreter_thread') and self.interpreter_thread.isRunning():
             self.interpreter_thread.stop()
             self.run_finished()
         else:
@@ -1566,6 +1786,13 @@ class EasyUIEditor(QMainWindow):
                 <td>-</td>
                 <td><code style="color:#f2b242;">audio=os="music/background.mp3",id=local_audio;</code></td>
             </tr>
+            <tr>
+                <td>短音效</td>
+                <td>audio</td>
+                <td>effect="WAV路径", id=唯一ID</td>
+                <td>-</td>
+                <td><code style="color:#f2b242;">audio=effect="sounds/click.wav",id=click_sound;</code></td>
+            </tr>
             <tr>
                 <td>图片显示</td>
                 <td>image</td>
@@ -1623,6 +1850,20 @@ class EasyUIEditor(QMainWindow):
                 <td>-</td>
                 <td><code style="color:#f2b242;">groupbox=title="登录信息",id=login_group;</code></td>
             </tr>
+            <tr>
+                <td>横向/纵向容器</td>
+                <td>row / column</td>
+                <td>-</td>
+                <td>id=唯一ID, spacing=间距</td>
+                <td><code style="color:#f2b242;">row=id=name_row;</code></td>
+            </tr>
+            <tr>
+                <td>结束容器</td>
+                <td>end</td>
+                <td>-</td>
+                <td>id=要结束的容器ID（省略时结束最内层）</td>
+                <td><code style="color:#f2b242;">end=id=login_group;</code></td>
+            </tr>
             <!-- 定时器（新增） -->
             <tr>
                 <td>定时器</td>
@@ -1640,6 +1881,7 @@ class EasyUIEditor(QMainWindow):
                 <li><strong>显示组件内容</strong>：<code style="color:#f2b242;">显示=组件ID</code> → 弹窗显示输入框/选择框的当前值</li>
                 <li><strong>启动定时器</strong>：<code style="color:#f2b242;">start_timer=定时器ID</code> → 开始定时器循环</li>
                 <li><strong>停止定时器</strong>：<code style="color:#f2b242;">stop_timer=定时器ID</code> → 停止定时器循环</li>
+                <li><strong>内存统计</strong>：<code style="color:#f2b242;">memstats=dialog</code> 或 <code style="color:#f2b242;">memstats=stderr</code> → 弹窗或在控制台输出组件数、图片占用、播放器与定时器数</li>
             </ul>
             
             <h5 style="color:#ffcc00; margin:15px 0 10px 0;">2. 音频控制动作</h5>
@@ -1654,6 +1896,11 @@ class EasyUIEditor(QMainWindow):
                 <li><strong>设置固定值</strong>：<code style="color:#f2b242;">set_progress=进度条ID,value=数值</code> → 直接设置进度值（如：set_progress=down_progress,value=50）</li>
                 <li><strong>增量更新</strong>：<code style="color:#f2b242;">update_progress=进度条ID,value=±数值</code> → 增减进度值（如：update_progress=down_progress,value=+1）</li>
             </ul>
+
+            <h5 style="color:#ffcc00; margin:15px 0 10px 0;">4. 动作序列</h5>
+            <ul style="margin:5px 0; padding-left:20px;">
+                <li><strong>依次执行多个动作</strong>：用分号分隔 → 如：<code style="color:#f2b242;">click="set_progress=down_progress,value=0;start_timer=t1;play_audio=click_sound"</code></li>
+            </ul>
         </div>
 
         <h4 style="color:#4fc3f7; margin-top:20px;">💡 语法高亮说明（编辑区视觉提示）</h4>
@@ -1878,7 +2125,8 @@ class EasyUIEditor(QMainWindow):
             QMessageBox.warning(self, "警告", "代码不能为空！")
             return
         
-        if hasattr(self, 'interpreter_thread') and self.interpreter_thread.isRunning():
+        persistent = self.persistent_run and self.interpreter_path != self.serve_unsupported
+        if not persistent and hasattr(self, 'interpreter_thread') and self.interpreter_thread.isRunning():
             self.show_error("已有进程在运行，请先等待其结束")
             return
         
@@ -1886,6 +2134,40 @@ class EasyUIEditor(QMainWindow):
         self.status_bar.showMessage(f"正在运行代码...（超时时间: {self.run_timeout}秒，按Ctrl+F5可停止）")
         self.show_output("=== 代码运行开始 ===")
         
+        if persistent:
+            self.get_run_server().run(code)
+        else:
+            self.run_in_new_process(code)
+    
+    def get_run_server(self):
+        """当前解释器的常驻进程；换了解释器时结束旧进程"""
+        if self.run_server is not None and self.run_server.interpreter_path != self.interpreter_path:
+            self.run_server.shutdown()
+            self.run_server = None
+        if self.run_server is None:
+            self.run_server = PersistentInterpreter(self.interpreter_path, self.run_timeout)
+            self.run_server.error_occurred.connect(self.show_error)
+            self.run_server.output_received.connect(self.show_output)
+            self.run_server.finished.connect(self.run_finished)
+            self.run_server.timeout_occurred.connect(lambda: self.status_bar.showMessage("代码运行超时已终止"))
+            self.run_server.unsupported.connect(self.on_serve_unsupported)
+        return self.run_server
+    
+    def warm_up_interpreter(self):
+        """启动时预先启动常驻进程，第一次运行也不必等待 Python 与 PyQt5 加载"""
+        if (self.persistent_run and self.interpreter_path and os.path.exists(self.interpreter_path)
+                and os.path.basename(self.interpreter_path).lower() in ["easy_ui_interpreter.exe", "easy_ui_interpreter.py"]):
+            self.get_run_server().start()
+    
+    def on_serve_unsupported(self, code):
+        self.serve_unsupported = self.run_server.interpreter_path
+        self.run_server.shutdown()
+        self.run_server = None
+        if code is not None:
+            self.show_output("[提示] 当前解释器不支持常驻运行，改用单次运行")
+            self.run_in_new_process(code)
+    
+    def run_in_new_process(self, code):
         self.interpreter_thread = InterpreterThread(code, self.temp_file, self.interpreter_path, self.run_timeout)
         self.interpreter_thread.error_occurred.connect(self.show_error)
         self.interpreter_thread.output_received.connect(self.show_output)
@@ -2032,6 +2314,9 @@ button=text="停止音乐",id=stop_music,click="stop_audio=local_music";
         if hasattr(self, 'interpreter_thread') and self.interpreter_thread.isRunning():
             self.interpreter_thread.stop()
         
+        if self.run_server is not None:
+            self.run_server.shutdown()
+        
         if self.search_thread and self.search_thread.isRunning():
             self.search_thread.stop_search()
             self.search_thread.wait()
@@ -1,189 +1,2567 @@
+import time
+_IMPORT_STARTED = time.perf_counter()  # 模块开始导入的时刻，--profile 以此为起点
 import sys
 import os
 import re
+import argparse
+import signal
+import atexit
+import hashlib
+import heapq
+import marshal
+import json
+import threading
+from collections import OrderedDict, deque
+from functools import partial
+from itertools import islice, starmap
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QLineEdit, 
                             QComboBox, QCheckBox, QPushButton, QWidget, 
                             QVBoxLayout, QHBoxLayout, QMessageBox, QFrame,
                             QTextEdit, QSlider, QProgressBar, QCalendarWidget,
-                            QGroupBox, QRadioButton)
-from PyQt5.QtCore import Qt, QUrl, QTimer, pyqtSlot
-from PyQt5.QtGui import QIcon, QIntValidator, QPixmap, QImage
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from urllib.request import urlopen
-from io import BytesIO
+                            QGroupBox, QRadioButton, QLayout, QGridLayout)
+from PyQt5.QtCore import (Qt, QUrl, QTimer, QObject, QEvent, QRunnable, QThreadPool, QSize, QBuffer, QIODevice,
+                          QFileSystemWatcher, QCoreApplication, pyqtSignal, pyqtSlot)
+from PyQt5.QtGui import QIcon, QIntValidator, QPixmap, QImage, QImageReader
+
+# ---------------------- 词法/语法分析 ----------------------
+class EUISyntaxError(Exception):
+    """EUI源码语法错误，携带出错行号"""
+    def __init__(self, message, line_no=None):
+        self.message = message
+        self.line_no = line_no
+        super().__init__(f"第{line_no}行：{message}" if line_no else message)
+
+
+# 标签规格：属性名 -> (类型, 是否必选, 默认值)
+# 类型：str=带引号字符串，int=整数，bool=true/false，id=标识符，list=[...]，action=带引号的动作序列，元组=枚举取值
+# SOURCE_ATTR 表示“首个属性名本身即来源类型”，如 audio=url="..." / image=os="..."
+SOURCE_ATTR = '@source'
+TAG_SPECS = {
+    'window': {'title': ('str', True, None), 'width': ('int', True, None),
+               'height': ('int', True, None), 'icon': ('str', False, None)},
+    'label': {'text': ('str', True, None), 'id': ('id', True, None)},
+    'entry': {'hint': ('str', True, None), 'id': ('id', True, None),
+              'readonly': ('bool', False, False), 'type': (('number', 'text'), False, 'text')},
+    'combo': {'label': ('str', True, None), 'id': ('id', True, None), 'options': ('list', True, None)},
+    'checkbox': {'label': ('str', True, None), 'id': ('id', True, None), 'options': ('list', True, None)},
+    'button': {'text': ('str', True, None), 'id': ('id', True, None), 'click': ('action', True, None)},
+    'audio': {SOURCE_ATTR: (('url', 'os', 'effect'), True, None), 'id': ('id', True, None)},
+    'image': {SOURCE_ATTR: (('path', 'url', 'os'), True, None), 'id': ('id', True, None),
+              'width': ('int', False, None), 'height': ('int', False, None),
+              'tooltip': ('str', False, "")},
+    'slider': {'label': ('str', True, None), 'id': ('id', True, None), 'min': ('int', True, None),
+               'max': ('int', True, None), 'value': ('int', True, None)},
+    'textarea': {'label': ('str', True, None), 'id': ('id', True, None),
+                 'rows': ('int', True, None), 'readonly': ('bool', False, False)},
+    'separator': {'text': ('str', True, None), 'id': ('id', True, None)},
+    'progress': {'label': ('str', True, None), 'id': ('id', True, None), 'min': ('int', True, None),
+                 'max': ('int', True, None), 'value': ('int', True, None)},
+    'calendar': {'label': ('str', True, None), 'id': ('id', True, None)},
+    'radiogroup': {'label': ('str', True, None), 'id': ('id', True, None), 'options': ('list', True, None)},
+    'groupbox': {'title': ('str', True, None), 'id': ('id', True, None)},
+    'row': {'id': ('id', False, None), 'spacing': ('int', False, 10)},
+    'column': {'id': ('id', False, None), 'spacing': ('int', False, 10)},
+    'end': {'id': ('id', False, None)},
+    'timer': {'id': ('id', True, None), 'interval': ('int', True, None), 'action': ('action', True, None)},
+}
+
+
+class EUINode:
+    """语法树节点：一条语句解析后的标签名与已做类型转换的属性"""
+    __slots__ = ('tag', 'attrs', 'line_no')
+
+    def __init__(self, tag, attrs, line_no):
+        self.tag = tag
+        self.attrs = attrs
+        self.line_no = line_no
+
+    def __repr__(self):
+        return f"EUINode({self.tag!r}, {self.attrs!r}, line={self.line_no})"
+
+
+# 词法规则：语句头（标签名=）、属性值（字符串/列表/整数/标识符）与语句尾（分号、行尾注释）
+_HEAD_RE = re.compile(r'[ \t\ufeff]*(\w+)[ \t]*=[ \t]*')
+_VALUE = r'"[^"\n]*"|\[[^\]\n]*\]|[+-]?\d+(?!\w)|\w+'
+_ATTR = r'\w+[ \t]*=[ \t]*(?:' + _VALUE + r')'
+_TAIL = r'[ \t]*,?[ \t]*;?[ \t\r]*(?:(?:#|//)[^\n]*)?$'
+_ATTR_RE = re.compile(r'(\w+)[ \t]*=[ \t]*(' + _VALUE + r')')
+_ATTRS_RE = re.compile(r'(' + _ATTR + r'(?:[ \t]*,[ \t]*' + _ATTR + r')*)' + _TAIL)
+_LIST_ITEM_RE = re.compile(r'"([^"]*)"|([^,"]+)')
+# 注释剥离（保留字符串内容）：第1组为字符串，第2组为未闭合的块注释起点
+_COMMENT_RE = re.compile(r'("[^"\n]*")|/\*.*?\*/|(/\*).*$|//.*$|#.*$')
+
+# 规范属性顺序的快速路径中，各类型属性值的捕获写法（只捕获值本身）
+_FAST_VALUE = {
+    'str': r'"([^"\n]*)"',
+    'action': r'"([^"\n]*)"',
+    'int': r'([+-]?\d+)(?!\w)',
+    'id': r'(\w+)',
+    'bool': r'(true|false)(?!\w)',
+    'list': r'\[([^\]\n]*)\]',
+}
+
+
+def _split_list(text):
+    """列表各项：带引号的项原样保留；不带引号的项只以逗号分隔、去掉首尾空白（中间可以有空格）"""
+    items = []
+    for quoted, bare in _LIST_ITEM_RE.findall(text):
+        if bare:
+            bare = bare.strip()
+            if bare:
+                items.append(bare)
+        else:
+            items.append(quoted)
+    return items
+
+
+def _convert_value(key, kind, text, line_no):
+    """按属性规格把原始值文本转换为Python值"""
+    first = text[0]
+    if kind in ('str', 'action'):
+        if first != '"':
+            raise EUISyntaxError(f"属性 {key} 的值需用双引号包裹", line_no)
+        return text[1:-1] if kind == 'str' else compile_action(text[1:-1])
+    if kind == 'list':
+        if first != '[':
+            raise EUISyntaxError(f"属性 {key} 需要列表值，如 [\"选项1\",\"选项2\"]", line_no)
+        return _split_list(text[1:-1])
+    if first in '"[':
+        raise EUISyntaxError(f"属性 {key} 的值格式错误：{text}", line_no)
+    if kind == 'int':
+        try:
+            return int(text)
+        except ValueError:
+            raise EUISyntaxError(f"属性 {key} 需要整数值，实际为 {text}", line_no)
+    if kind == 'id':
+        return text
+    if kind == 'bool':
+        lowered = text.lower()
+        if lowered not in ('true', 'false'):
+            raise EUISyntaxError(f"属性 {key} 只能为 true 或 false", line_no)
+        return lowered == 'true'
+    # 枚举
+    if text not in kind:
+        raise EUISyntaxError(f"属性 {key} 只能为 {'/'.join(kind)}", line_no)
+    return text
+
+
+def _raw_value(text):
+    """未在规格中声明的属性：按字面形式做最直接的转换后原样保留"""
+    first = text[0]
+    if first == '"':
+        return text[1:-1]
+    if first == '[':
+        return _split_list(text[1:-1])
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+# 动作规格：动作名 -> 可带的整数参数名（None 表示不带参数）
+ACTION_SPECS = {
+    'play_audio': None, 'pause_audio': None, 'stop_audio': None,
+    'start_timer': None, 'stop_timer': None,
+    'set_progress': ('value',),
+    'update_progress': ('step', 'value'),
+    '显示': None,
+    'memstats': None,
+}
+_ACTION_STEP_RE = re.compile(r'\s*(\w+)\s*=\s*(\w+)\s*(?:,\s*(\w+)\s*=\s*([+-]?\d+)\s*)?$')
+
+
+def compile_action(text):
+    """把动作文本编译为步骤元组 ((动作名, 目标ID, 整数参数), ...)，多个动作以分号分隔
+
+    无法识别的步骤编为 ('', 原文, None)，由解释器在绑定动作时报告，不影响同一语句的其余部分。
+    """
+    steps = []
+    for part in text.split(';'):
+        if not part.strip():
+            continue
+        m = _ACTION_STEP_RE.match(part)
+        if m is not None:
+            name, target, param, number = m.groups()
+            params = ACTION_SPECS.get(name, False)
+            if (params is None and param is None) or (params and param in params):
+                steps.append((name, target, int(number) if number else None))
+                continue
+        steps.append(('', part.strip(), None))
+    return tuple(steps)
+
+
+_FAST_CONVERTERS = {'int': int, 'bool': lambda v: v == 'true', 'list': _split_list, 'action': compile_action}
+
+
+class _TagRule:
+    """单个标签的解析规则
+
+    属性按 TAG_SPECS 中的顺序书写时，用一条预编译正则直接取出全部属性值（快速路径）；
+    顺序不同或带有额外属性时，退回到通用的属性列表解析，逐个校验并转换类型。
+    """
+    __slots__ = ('tag', 'spec', 'fast_re', 'fast_keys', 'fixups')
+
+    def __init__(self, tag, spec):
+        self.tag = tag
+        self.spec = spec
+        parts = []
+        keys = []
+        fixups = []  # 快速路径取值后仍需转换或补默认值的属性：(属性名, 转换函数, 默认值)
+        for key, (kind, required, default) in spec.items():
+            if key == SOURCE_ATTR:
+                part = r'(%s)[ \t]*=[ \t]*"([^"\n]*)"' % '|'.join(kind)
+                keys += ['source', 'src']
+            else:
+                value = _FAST_VALUE.get(kind) or r'(%s)(?!\w)' % '|'.join(kind)
+                part = key + r'[ \t]*=[ \t]*' + value
+                keys.append(key)
+                convert = _FAST_CONVERTERS.get(kind)
+                if convert or not required:
+                    fixups.append((key, convert, default))
+            if parts:
+                part = r'[ \t]*,[ \t]*' + part
+            parts.append(part if required else '(?:' + part + ')?')
+        self.fast_re = re.compile(''.join(parts) + _TAIL)
+        self.fast_keys = tuple(keys)
+        self.fixups = tuple(fixups)
+
+    def parse(self, line, pos, line_no):
+        """解析 pos 之后的属性部分；整体不符合属性列表语法时返回 None"""
+        m = self.fast_re.match(line, pos)
+        if m is not None:
+            attrs = dict(zip(self.fast_keys, m.groups()))
+            for key, convert, default in self.fixups:
+                value = attrs[key]
+                if value is None:
+                    attrs[key] = default
+                elif convert is not None:
+                    attrs[key] = convert(value)
+            return EUINode(self.tag, attrs, line_no)
+
+        m = _ATTRS_RE.match(line, pos)
+        if m is None:
+            return None
+        raw = dict(_ATTR_RE.findall(m.group(1)))
+        attrs = {}
+        for key, (kind, required, default) in self.spec.items():
+            if key == SOURCE_ATTR:
+                source = next((k for k in kind if k in raw), None)
+                if source is None:
+                    raise EUISyntaxError(f"标签 {self.tag} 需要 {'/'.join(kind)} 来源属性", line_no)
+                attrs['source'] = source
+                attrs['src'] = _convert_value(source, 'str', raw.pop(source), line_no)
+            elif key in raw:
+                attrs[key] = _convert_value(key, kind, raw.pop(key), line_no)
+            elif required:
+                raise EUISyntaxError(f"标签 {self.tag} 缺少必选属性 {key}", line_no)
+            else:
+                attrs[key] = default
+        # 未声明的属性（如 tooltip）原样保留，由具体组件自行取用
+        for key, text in raw.items():
+            attrs.setdefault(key, _raw_value(text))
+        return EUINode(self.tag, attrs, line_no)
+
+
+_TAG_RULES = {tag: _TagRule(tag, spec) for tag, spec in TAG_SPECS.items()}
+
+
+def _strip_comments(line):
+    """去掉一行中的注释（字符串内的内容不受影响），返回 (剩余文本, 是否留有未闭合的块注释)"""
+    opened = []
+
+    def replace(m):
+        if m.group(1):
+            return m.group(1)
+        if m.group(2):
+            opened.append(True)
+        return ''
+
+    return _COMMENT_RE.sub(replace, line), bool(opened)
+
+
+def parse_statement(line, line_no=None):
+    """解析单条语句：读取一次标签名后查表分派给该标签的规则；无法解析时返回 None"""
+    head = _HEAD_RE.match(line)
+    if head is None:
+        return None
+    rule = _TAG_RULES.get(head.group(1))
+    if rule is None:
+        return None
+    return rule.parse(line, head.end(), line_no)
+
+
+def _diagnose(text, line_no):
+    """为无法解析的语句生成尽量具体的错误信息"""
+    head = _HEAD_RE.match(text)
+    if head is None:
+        return EUISyntaxError(f"语句必须以“标签名=”开头：{text}", line_no)
+    if head.group(1) not in _TAG_RULES:
+        return EUISyntaxError(f"未知标签：{head.group(1)}", line_no)
+    if text.count('"') % 2:
+        return EUISyntaxError("字符串缺少结束引号", line_no)
+    return EUISyntaxError(f"属性格式错误，应为 属性=值,属性=值：{text}", line_no)
+
+
+def parse_program(source, on_error=None):
+    """逐行解析源码，惰性产出 EUINode
+
+    source 可以是完整源码字符串，也可以是逐行产出文本的可迭代对象（如文件对象）。
+    空行与注释（#、//、/* */）会被跳过。on_error 为空时遇到语法错误直接抛出
+    EUISyntaxError；否则把错误交给 on_error 处理，跳过该语句继续解析。
+    """
+    if isinstance(source, str):
+        source = source.split('\n')
+    in_comment = False
+    for line_no, line in enumerate(source, 1):
+        try:
+            node = None if in_comment else parse_statement(line, line_no)
+            if node is None:
+                # 慢速路径：空行、注释、跨行块注释或语法错误
+                if in_comment:
+                    end = line.find('*/')
+                    if end < 0:
+                        continue
+                    line = line[end + 2:]
+                line, in_comment = _strip_comments(line)
+                line = line.strip(' \t\r\n\f\v\ufeff;')
+                if not line:
+                    continue
+                node = parse_statement(line, line_no)
+                if node is None:
+                    raise _diagnose(line, line_no)
+        except EUISyntaxError as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            continue
+        yield node
+
+
+# ---------------------- 编译缓存 ----------------------
+INTERPRETER_VERSION = "1.8"
+# 缓存文件格式版本：EUINode 结构或 TAG_SPECS 语义变化时递增，使旧缓存自动失效
+CACHE_FORMAT = 6
+CACHE_MAGIC = b'EUIC'
+
+
+def _cache_root():
+    """缓存根目录：Windows 下位于 %LOCALAPPDATA%，其余系统位于 ~/.cache"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'JGZ_YES', 'EasyUILang')
+
+
+def default_cache_dir():
+    return os.path.join(_cache_root(), 'program_cache')
+
+
+def _remove_file(path):
+    """删除缓存文件；文件不存在或被占用时忽略（各缓存共用）"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ProgramCache:
+    """已解析程序的磁盘缓存
+
+    以 源码内容哈希 + 解释器版本 为键，把解析得到的节点序列用 marshal 序列化成紧凑的二进制文件；
+    命中时完全跳过解析。缓存总大小与条目数超限时按最近使用时间淘汰最旧的条目。
+    """
+    def __init__(self, cache_dir=None, max_bytes=64 * 1024 * 1024, max_entries=512):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, code):
+        digest = hashlib.sha256()
+        digest.update(f"{INTERPRETER_VERSION}|{CACHE_FORMAT}|{sys.version_info[:2]}|".encode('ascii'))
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.euic')
+
+    def load(self, code):
+        """命中时返回 (节点列表, 语法错误列表)，未命中或缓存损坏时返回 None"""
+        path = self._path(self.key(code))
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if data[:4] != CACHE_MAGIC:
+                raise ValueError("缓存文件头不匹配")
+            nodes, errors = marshal.loads(data[4:])
+            os.utime(path)  # 刷新最近使用时间，供 LRU 淘汰
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # 损坏或不兼容的缓存直接丢弃，按未命中处理
+            self.misses += 1
+            _remove_file(path)
+            return None
+        self.hits += 1
+        return (list(starmap(EUINode, nodes)),
+                list(starmap(EUISyntaxError, errors)))
+
+    def store(self, code, nodes, errors=()):
+        payload = marshal.dumps((
+            tuple((node.tag, node.attrs, node.line_no) for node in nodes),
+            tuple((error.message, error.line_no) for error in errors),
+        ))
+        if len(payload) + 4 > self.max_bytes:
+            return
+        path = self._path(self.key(code))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(CACHE_MAGIC)
+                f.write(payload)
+            os.replace(tmp_path, path)  # 原子替换，避免并发启动读到半个文件
+        except OSError:
+            _remove_file(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """按最近使用时间从旧到新删除条目，直到总大小与条目数都不超限"""
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith('.euic')]
+        except OSError:
+            return
+        stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries), reverse=True)
+        total = sum(size for _, size, _ in stats)
+        while stats and (total > self.max_bytes or len(stats) > self.max_entries):
+            _, size, path = stats.pop()
+            _remove_file(path)
+            total -= size
+
+    def clear(self):
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(('.euic', '.tmp')):
+                    _remove_file(entry.path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+# ---------------------- 异步图片加载 ----------------------
+IMAGE_FETCH_TIMEOUT = 10  # 单张图片下载的总超时（秒）
+IMAGE_MAX_CONCURRENT = 4  # 同时进行的图片下载/解码任务上限
+IMAGE_READ_CHUNK = 64 * 1024
+
+
+def scale_image(image, width=None, height=None, mode=Qt.SmoothTransformation):
+    """按 image= 的 width/height 约定缩放（只给一边时保持比例）"""
+    if width and height:
+        return image.scaled(width, height, Qt.KeepAspectRatio, mode)
+    if width:
+        return image.scaledToWidth(width, mode)
+    if height:
+        return image.scaledToHeight(height, mode)
+    return image
+
+
+EXIF_HEAD_BYTES = 128 * 1024  # EXIF(APP1) 段最长 64KB，读取文件开头这么多字节即可找到内嵌缩略图
+
+
+def _target_size(source_size, width, height):
+    """image= 的 width/height 约定下的目标尺寸；只给一边时按原图比例推算另一边"""
+    if width and height:
+        return source_size.scaled(width, height, Qt.KeepAspectRatio)
+    if width:
+        return QSize(width, max(1, round(source_size.height() * width / source_size.width())))
+    return QSize(max(1, round(source_size.width() * height / source_size.height())), height)
+
+
+def _exif_thumbnail(head):
+    """从 JPEG 开头的 EXIF(APP1) 段中取出内嵌缩略图（JPEG 数据），没有时返回 None"""
+    try:
+        if head[:2] != b'\xff\xd8':
+            return None
+        pos = 2
+        while pos + 4 <= len(head) and head[pos] == 0xFF:
+            marker = head[pos + 1]
+            length = int.from_bytes(head[pos + 2:pos + 4], 'big')
+            if marker == 0xE1 and head[pos + 4:pos + 10] == b'Exif\0\0':
+                return _tiff_thumbnail(head[pos + 10:pos + 2 + length])
+            if marker == 0xDA:  # 图像数据开始，后面不会再有 APP 段
+                return None
+            pos += 2 + length
+    except (IndexError, ValueError):
+        pass
+    return None
+
+
+def _tiff_thumbnail(tiff):
+    order = {b'II': 'little', b'MM': 'big'}.get(tiff[:2])
+    if order is None:
+        return None
+
+    def u16(offset):
+        return int.from_bytes(tiff[offset:offset + 2], order)
+
+    def u32(offset):
+        return int.from_bytes(tiff[offset:offset + 4], order)
+
+    # IFD0 之后链接的 IFD1 描述缩略图：0x0201 为数据偏移，0x0202 为数据长度
+    ifd0 = u32(4)
+    ifd1 = u32(ifd0 + 2 + 12 * u16(ifd0))
+    if not ifd1 or ifd1 + 2 > len(tiff):
+        return None
+    offset = length = 0
+    for i in range(u16(ifd1)):
+        entry = ifd1 + 2 + 12 * i
+        tag = u16(entry)
+        if tag == 0x0201:
+            offset = u32(entry + 8)
+        elif tag == 0x0202:
+            length = u32(entry + 8)
+    if offset and length and offset + length <= len(tiff):
+        return tiff[offset:offset + length]
+    return None
+
+
+def decode_image(source, data=None, width=None, height=None, mode=Qt.SmoothTransformation):
+    """解码图片并缩放到 image= 要求的尺寸
+
+    source 为本地路径；data 不为 None 时从内存中的数据解码（网络图片）。目标尺寸小于原图时让解码器
+    直接输出目标尺寸（JPEG 按 DCT 系数缩放解码），内嵌的 EXIF 缩略图足够大时直接使用缩略图，
+    不会先解码出全尺寸图片再缩小。
+    """
+    if data is not None:
+        device = QBuffer()
+        device.setData(data)
+        device.open(QIODevice.ReadOnly)
+        reader = QImageReader(device)
+    else:
+        reader = QImageReader(source)
+    size = reader.size()
+    if (width or height) and size.isValid() and not size.isEmpty():
+        target = _target_size(size, width, height)
+        if target.width() < size.width() and target.height() < size.height():
+            if reader.format() == b'jpeg':
+                thumbnail = _thumbnail_for(source, data, size, target)
+                if thumbnail is not None:
+                    return thumbnail.scaled(target, Qt.IgnoreAspectRatio, mode)
+            reader.setScaledSize(target)
+            if mode == Qt.FastTransformation:
+                reader.setQuality(0)  # 快速模式下解码器可以只做最近邻缩放
+            image = reader.read()
+            if image.isNull():
+                raise ValueError(f"无法解码图片数据：{reader.errorString()}")
+            return image
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"无法解码图片数据：{reader.errorString()}")
+    return scale_image(image, width, height, mode)
+
+
+def _thumbnail_for(source, data, size, target):
+    """内嵌缩略图不小于目标尺寸且宽高比与原图一致（部分相机会给缩略图加黑边）时返回它"""
+    if data is None:
+        try:
+            with open(source, 'rb') as f:
+                head = f.read(EXIF_HEAD_BYTES)
+        except OSError:
+            return None
+    else:
+        head = data[:EXIF_HEAD_BYTES]
+    thumbnail_data = _exif_thumbnail(head)
+    if not thumbnail_data:
+        return None
+    thumbnail = QImage.fromData(thumbnail_data, 'JPG')
+    if thumbnail.isNull() or thumbnail.width() < target.width() or thumbnail.height() < target.height():
+        return None
+    if abs(thumbnail.width() * size.height() - thumbnail.height() * size.width()) > 0.01 * size.width() * thumbnail.height():
+        return None
+    return thumbnail
+
+
+PIXMAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class PixmapCache:
+    """进程内共享的图片缓存
+
+    键为 (来源, 宽, 高, 缩放模式, 种类)：种类为 'image' 的条目保存解码后的原图（QImage，宽高为 None，
+    可在工作线程读写），种类为 'pixmap' 的条目保存交给标签显示的 QPixmap（只在GUI线程读写）。
+    两者分开存放，工作线程不会读到 QPixmap。同一图片无论被多少个 image= 引用，
+    解码与每种尺寸的缩放都只做一次，各标签共享同一份像素数据。总字节数超过 max_bytes 时按最近使用淘汰。
+    """
+    def __init__(self, max_bytes=PIXMAP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # 键 -> (QImage 或 QPixmap, 字节数)，按使用先后排列
+        self._loading = {}  # 正在生成的键 -> 锁
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size_of(item):
+        if isinstance(item, QImage):
+            return item.sizeInBytes()
+        return item.width() * item.height() * item.depth() // 8
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_or_load(self, key, loader):
+        """取缓存条目，没有时调用 loader() 生成并放入；多个线程同时请求同一个键时 loader 只执行一次"""
+        item = self.get(key)
+        if item is not None:
+            return item
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None:
+                    return entry[0]
+                item = loader()
+                self.put(key, item)
+        finally:
+            # loader() 出错时也要移除，之后的请求不会沿用这把锁
+            with self._lock:
+                self._loading.pop(key, None)
+        return item
+
+    def put(self, key, item):
+        size = self._size_of(item)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (item, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def dump(self, file=None):
+        """逐条输出缓存内容与占用字节数，最近使用的在前"""
+        file = file or sys.stderr
+        with self._lock:
+            entries = list(self._entries.items())
+        print(f"[EUI] 图片缓存：{len(entries)} 项，共 {self.bytes / 1024:.1f} KB"
+              f"（上限 {self.max_bytes / 1024:.0f} KB）", file=file)
+        for (source, width, height, mode, kind), (item, size) in reversed(entries):
+            scale = "原图" if width is None and height is None else f"缩放 {width or '自动'}x{height or '自动'}"
+            print(f"  {size / 1024:10.1f} KB  {item.width()}x{item.height()}  {scale} {kind}  {source}", file=file)
+
+
+# 进程内唯一的图片缓存，所有解释器实例与窗口共用
+PIXMAP_CACHE = PixmapCache()
+
+
+def fetch_url(url, timeout=IMAGE_FETCH_TIMEOUT, headers=None):
+    """下载网络资源；timeout 限制的是整个请求的总耗时，而不只是单次套接字读写"""
+    return _download(url, timeout, headers)[0]
+
+
+def _download(url, timeout, headers=None):
+    """下载网络资源，返回 (内容, 响应头)；服务器返回 304 等状态时抛出 HTTPError"""
+    from urllib.request import urlopen, Request  # 约几十毫秒（http.client、email、ssl），用到网络时才导入
+    deadline = time.monotonic() + timeout
+    chunks = []
+    with urlopen(Request(url, headers=headers or {}), timeout=timeout) as response:
+        while True:
+            # read1 只要套接字上有数据就返回，慢速服务器无法让单次读取一直阻塞到超时之后
+            chunk = response.read1(IMAGE_READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"下载超时（{timeout}秒）")
+        return b''.join(chunks), response.headers
+
+
+class _ImageLoadSignals(QObject):
+    # (结果 或 None, 错误信息)；在工作线程中发射，经排队连接回到GUI线程
+    finished = pyqtSignal(object, object)
+
+
+class _ImageLoadTask(QRunnable):
+    """线程池任务：在工作线程中执行 func(*args)，把结果或错误信息通过信号送回"""
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = _ImageLoadSignals()
+
+    def run(self):
+        try:
+            self.signals.finished.emit(self.func(*self.args), None)
+        except Exception as e:
+            self.signals.finished.emit(None, str(e))
+
+
+def _load_image(source, remote, width, height, timeout, asset_cache=None, cache=None,
+                mode=Qt.SmoothTransformation):
+    """下载或读取图片、解码并缩放为 QImage（QPixmap 只能在GUI线程创建）
+
+    不缩放时原图放入缓存供其他尺寸复用；要缩放时，缓存里已有原图就直接从原图缩放，
+    否则在解码时直接缩小，不解码全尺寸图片。
+    """
+    original_key = (source, None, None, mode, 'image')
+
+    def read():
+        if remote:
+            return asset_cache.fetch(source, timeout) if asset_cache else fetch_url(source, timeout)
+        return None
+
+    if not (width or height):
+        return cache.get_or_load(original_key, lambda: decode_image(source, read())) if cache \
+            else decode_image(source, read())
+    original = cache.get(original_key) if cache else None
+    if original is not None:
+        return scale_image(original, width, height, mode)
+    return decode_image(source, read(), width, height, mode)
+
+
+class ImageLoader:
+    """图片异步加载器：下载、解码与缩放在有界线程池中进行，结果回调在GUI线程执行
+
+    结果经由 PixmapCache 共享：已缓存的尺寸立即回调；同一尺寸的图片正在加载时，后来的请求只登记回调，
+    不会重复提交任务。
+    """
+    def __init__(self, max_concurrent=IMAGE_MAX_CONCURRENT, timeout=IMAGE_FETCH_TIMEOUT, asset_cache=None,
+                 cache=None):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_concurrent)
+        self.timeout = timeout
+        self.asset_cache = asset_cache  # 可选的 AssetCache，网络图片经由它下载
+        self.cache = cache if cache is not None else PIXMAP_CACHE
+        self.tracer = None  # 可选的 Tracer，记录每个后台任务（下载、解码）的区间
+        self._pending = set()  # 持有任务的信号对象，直到结果送达
+        self._waiting = {}  # 加载中的缓存键 -> 等待结果的回调列表
+
+    def load(self, source, remote, width, height, callback, mode=Qt.SmoothTransformation):
+        """提交加载任务；callback(pixmap, error) 在GUI线程中调用（缓存命中时立即调用）"""
+        key = (source, width, height, mode, 'pixmap')  # 与工作线程读写的原图（'image'）分开缓存
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            return
+        pixmap = self.cache.get(key)
+        if pixmap is not None:
+            callback(pixmap, None)
+            return
+        self._waiting[key] = [callback]
+
+        def deliver(image, error):
+            # 先移除等待登记，转换出错时之后的请求也能重新加载
+            callbacks = self._waiting.pop(key, ())
+            pixmap = None
+            if error is None:
+                pixmap = QPixmap.fromImage(image)
+                self.cache.put(key, pixmap)
+            for waiting_callback in callbacks:
+                waiting_callback(pixmap, error)
+
+        self.submit(deliver, _load_image, source, remote, width, height, self.timeout,
+                    self.asset_cache, self.cache, mode)
+
+    def submit(self, callback, func, *args):
+        """在线程池中执行 func(*args)；callback(result, error) 在GUI线程中调用"""
+        if self.tracer is not None:
+            func = self.tracer.wrap(func, func.__name__.lstrip('_'), 'image', {'source': str(args[0])})
+        task = _ImageLoadTask(func, *args)
+        signals = task.signals
+        self._pending.add(signals)
+
+        def deliver(result, error):
+            self._pending.discard(signals)
+            callback(result, error)
+
+        signals.finished.connect(deliver)
+        self.pool.start(task)
+
+    def wait(self, msecs=-1):
+        """等待所有已提交的任务完成（主要用于测试与离屏渲染）"""
+        return self.pool.waitForDone(msecs)
+
+    def busy(self):
+        """是否还有任务的结果没有送达（任务完成后结果经事件循环回到GUI线程）"""
+        return bool(self._pending)
+
+
+# ---------------------- 网络资源缓存 ----------------------
+ASSET_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_asset_cache_dir():
+    return os.path.join(_cache_root(), 'asset_cache')
+
+
+class AssetCache:
+    """网络图片/音频的磁盘缓存
+
+    每个 URL 对应一个内容文件和一个 .json 元数据文件（记录 ETag 与 Last-Modified）。
+    在线模式下命中缓存时带上 If-None-Match / If-Modified-Since 向服务器验证，服务器返回 304
+    则直接使用本地内容；网络不可用时退回使用已缓存的旧内容。离线优先模式下只要有缓存就不再联网。
+    总大小超过 max_bytes 时按最近使用时间淘汰。可在多个线程中同时使用。
+    """
+    def __init__(self, cache_dir=None, max_bytes=ASSET_CACHE_MAX_BYTES, offline=False):
+        self.cache_dir = cache_dir or default_asset_cache_dir()
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0  # 直接使用缓存内容（含 304 验证通过与网络故障时的旧内容）
+        self.misses = 0  # 从服务器下载了完整内容
+        self.revalidated = 0  # 其中经服务器 304 验证通过的次数
+        self.stale = 0  # 其中因网络故障而使用旧内容的次数
+        self._lock = threading.Lock()
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def _read_meta(self, url):
+        try:
+            with open(self._meta_path(self._key(url)), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            path = os.path.join(self.cache_dir, meta['file'])
+            if meta.get('url') != url or not os.path.exists(path):
+                return None
+            return meta
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def cached_path(self, url):
+        """不联网，直接返回已缓存内容的本地路径；没有缓存时返回 None"""
+        meta = self._read_meta(url)
+        return os.path.join(self.cache_dir, meta['file']) if meta else None
+
+    def fetch(self, url, timeout=IMAGE_FETCH_TIMEOUT):
+        """取得资源内容（bytes）"""
+        path, data, _ = self._fetch(url, timeout)
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        return data
+
+    def fetch_path(self, url, timeout=IMAGE_FETCH_TIMEOUT):
+        """取得资源的本地文件路径，返回 (路径, 内容是否为本次新下载)"""
+        path, _, fresh = self._fetch(url, timeout)
+        if path is None:
+            raise OSError(f"无法写入缓存目录：{self.cache_dir}")
+        return path, fresh
+
+    def _fetch(self, url, timeout):
+        """返回 (本地路径, 新下载的内容, 是否新下载)；使用缓存时内容为 None，写缓存失败时路径为 None"""
+        from urllib.error import HTTPError
+        meta = self._read_meta(url)
+        headers = {}
+        if meta is not None:
+            path = os.path.join(self.cache_dir, meta['file'])
+            if self.offline:
+                self._touch(path)
+                self._count('hits')
+                return path, None, False
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            data, response_headers = _download(url, timeout, headers)
+        except HTTPError as e:
+            if meta is None or e.code != 304:
+                raise
+            self._touch(path)
+            self._count('hits')
+            self._count('revalidated')
+            return path, None, False
+        except (OSError, ValueError):
+            if meta is None:
+                raise
+            # 网络不可用（URLError、超时等）时使用旧内容，总比什么都不显示好
+            self._touch(path)
+            self._count('hits')
+            self._count('stale')
+            return path, None, False
+        self._count('misses')
+        return self._store(url, data, response_headers), data, True
+
+    def _store(self, url, data, response_headers):
+        key = self._key(url)
+        # 保留扩展名，部分平台的多媒体后端依靠扩展名识别音频格式
+        from urllib.parse import urlsplit
+        ext = os.path.splitext(urlsplit(url).path)[1].lower()
+        if not re.fullmatch(r'\.[a-z0-9]{1,5}', ext):
+            ext = '.bin'
+        name = key + ext
+        meta = {
+            'url': url,
+            'file': name,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'size': len(data),
+        }
+        path = os.path.join(self.cache_dir, name)
+        meta_path = self._meta_path(key)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + suffix, 'wb') as f:
+                f.write(data)
+            os.replace(path + suffix, path)
+            # 元数据最后写入：读到元数据时内容文件一定已经完整
+            with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError:
+            _remove_file(path + suffix)
+            _remove_file(meta_path + suffix)
+            return None
+        self.evict()
+        return path
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)  # 刷新最近使用时间，供 LRU 淘汰
+        except OSError:
+            pass
+
+    def evict(self):
+        """按最近使用时间从旧到新删除条目，直到总大小不超限"""
+        with self._lock:
+            try:
+                files = [e for e in os.scandir(self.cache_dir) if not e.name.endswith('.tmp')]
+            except OSError:
+                return
+            metas = {e.name[:-5]: e.path for e in files if e.name.endswith('.json')}
+            entries = []
+            for entry in files:
+                key = entry.name.split('.', 1)[0]
+                if key in metas and not entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path, metas[key]))
+            entries.sort(reverse=True)
+            total = sum(size for _, size, _, _ in entries)
+            while entries and total > self.max_bytes:
+                _, size, path, meta_path = entries.pop()
+                _remove_file(meta_path)
+                _remove_file(path)
+                total -= size
+
+    def clear(self):
+        try:
+            for entry in os.scandir(self.cache_dir):
+                _remove_file(entry.path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'revalidated': self.revalidated, 'stale': self.stale}
+
+
+# ---------------------- 音频播放器池 ----------------------
+def _multimedia():
+    """QtMultimedia 在第一次用到音频时才导入：加载它会初始化多媒体后端，是冷启动中不小的一部分"""
+    from PyQt5 import QtMultimedia
+    return QtMultimedia
+
+
+AUDIO_MAX_PLAYERS = 8  # 同时存在的 QMediaPlayer 上限
+AUDIO_IDLE_RELEASE_MS = 60 * 1000  # 停止播放超过这么久的播放器会被释放
+
+
+class MediaPlayerPool:
+    """按需创建的 QMediaPlayer 池
+
+    audio= 声明只记录来源，第一次 play 时才通过 media_factory(audio_id) 取得媒体内容并创建播放器。
+    同时存在的播放器不超过 max_players：超出时复用最久未用的播放器（优先选已停止的）；
+    停止后闲置超过 idle_ms 的播放器由定时器释放，下次播放时再重新创建。
+    """
+    def __init__(self, media_factory, max_players=AUDIO_MAX_PLAYERS, idle_ms=AUDIO_IDLE_RELEASE_MS):
+        self.media_factory = media_factory
+        self.max_players = max(1, max_players)
+        self.idle_ms = idle_ms
+        self.players = OrderedDict()  # audio_id -> QMediaPlayer，按最近使用排列
+        self._idle_since = {}  # audio_id -> 停止播放的时刻
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self._sweep_timer = None
+
+    def __contains__(self, audio_id):
+        return audio_id in self.players
+
+    def get(self, audio_id):
+        """已创建的播放器；尚未播放过（或已被释放）时返回 None，不会创建"""
+        return self.players.get(audio_id)
+
+    def acquire(self, audio_id):
+        """取得 audio_id 的播放器，必要时创建或复用一个；来源无效时返回 None"""
+        player = self.players.get(audio_id)
+        if player is not None:
+            self.players.move_to_end(audio_id)
+            self._idle_since.pop(audio_id, None)
+            return player
+        media = self.media_factory(audio_id)
+        if media is None:
+            return None
+        if len(self.players) >= self.max_players:
+            player = self._take_victim()
+            self.reused += 1
+        else:
+            player = _multimedia().QMediaPlayer()
+            player.stateChanged.connect(lambda state, p=player: self._on_state_changed(p, state))
+            self.created += 1
+        player.setMedia(media)
+        self.players[audio_id] = player
+        self._start_sweep()
+        return player
+
+    def _take_victim(self):
+        stopped_state = _multimedia().QMediaPlayer.StoppedState
+        stopped = [aid for aid, p in self.players.items() if p.state() == stopped_state]
+        victim = stopped[0] if stopped else next(iter(self.players))
+        player = self.players.pop(victim)
+        self._idle_since.pop(victim, None)
+        player.stop()
+        player.setMedia(_multimedia().QMediaContent())
+        return player
+
+    @staticmethod
+    def _discard(player):
+        player.setMedia(_multimedia().QMediaContent())
+        player.deleteLater()
+
+    def _on_state_changed(self, player, state):
+        for audio_id, p in self.players.items():
+            if p is player:
+                if state == _multimedia().QMediaPlayer.StoppedState:
+                    self._idle_since[audio_id] = time.monotonic()
+                else:
+                    self._idle_since.pop(audio_id, None)
+                break
+
+    def _start_sweep(self):
+        if self._sweep_timer is None and self.idle_ms > 0:
+            self._sweep_timer = QTimer()
+            self._sweep_timer.timeout.connect(self.release_idle)
+        if self._sweep_timer is not None and not self._sweep_timer.isActive():
+            self._sweep_timer.start(max(1000, self.idle_ms // 2))
+
+    def release_idle(self):
+        """释放停止后闲置超过 idle_ms 的播放器"""
+        limit = time.monotonic() - self.idle_ms / 1000
+        for audio_id, since in list(self._idle_since.items()):
+            if since <= limit:
+                self.release(audio_id)
+        if not self.players and self._sweep_timer is not None:
+            self._sweep_timer.stop()
+
+    def release(self, audio_id):
+        player = self.players.pop(audio_id, None)
+        self._idle_since.pop(audio_id, None)
+        if player is not None:
+            player.stop()
+            self._discard(player)
+            self.released += 1
+
+    def release_all(self):
+        for audio_id in list(self.players):
+            self.release(audio_id)
+        if self._sweep_timer is not None:
+            self._sweep_timer.stop()
+
+    def stats(self):
+        return {'live': len(self.players), 'max': self.max_players, 'created': self.created,
+                'reused': self.reused, 'released': self.released}
+
+
+# ---------------------- 短音效 ----------------------
+EFFECT_MAX_VOICES = 4  # 同一音效最多同时重叠播放几个
+EFFECT_PRELOAD_VOICES = 2  # effect= 声明时预先准备好的声部数
+EFFECT_AUTO_MAX_BYTES = 256 * 1024  # audio=os= 指向不超过此大小的 WAV 时自动按音效播放
+
+
+def is_sound_effect(path, explicit=False):
+    """QSoundEffect 只支持 WAV：effect= 只要求是 WAV，audio=os= 还要求文件足够小"""
+    if not path.lower().endswith('.wav'):
+        return False
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    return explicit or size <= EFFECT_AUTO_MAX_BYTES
+
+
+class SoundEffect:
+    """低延迟短音效
+
+    WAV 交给 QSoundEffect 解码进内存，播放时不再经过媒体解码管线。创建时先准备 preload 个声部
+    （为 0 时第一次播放才创建，也才导入 QtMultimedia）。每个声部同一时刻只能播放一次，上一次还没放完
+    又被触发时换一个空闲声部重叠播放；声部都在用时重新播放最早的那个。各声部共用同一份解码后的采样数据。
+    """
+    def __init__(self, path, max_voices=EFFECT_MAX_VOICES, preload=EFFECT_PRELOAD_VOICES):
+        self.url = QUrl.fromLocalFile(path)
+        self.max_voices = max(1, max_voices)
+        self.voices = [self._new_voice() for _ in range(min(preload, self.max_voices))]
+        self._oldest = 0
+
+    def _new_voice(self):
+        voice = _multimedia().QSoundEffect()
+        voice.setSource(self.url)
+        return voice
+
+    def play(self):
+        for voice in self.voices:
+            if not voice.isPlaying():
+                voice.play()
+                return voice
+        if len(self.voices) < self.max_voices:
+            try:
+                voice = self._new_voice()
+            except ImportError:
+                return None  # 多媒体后端不可用：与播放器一样不出声，按钮动作不报错
+            self.voices.append(voice)
+        else:
+            voice = self.voices[self._oldest]
+            self._oldest = (self._oldest + 1) % len(self.voices)
+            voice.stop()
+        voice.play()
+        return voice
+
+    def stop(self):
+        for voice in self.voices:
+            voice.stop()
+
+
+# ---------------------- 流式构建 ----------------------
+STREAM_FIRST_BATCH = 50  # 显示窗口前先构建的组件数（约一屏）
+STREAM_SLICE_MS = 8  # 之后每个事件循环时间片内最少连续构建的时长
+STREAM_PAINT_WAIT_MS = 200  # 等待首帧绘制的最长时间，超时后直接开始后台构建
+
+
+class _FirstPaintWatcher(QObject):
+    """事件过滤器：窗口第一次收到绘制事件时回调一次"""
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.callback(obj)
+        return False
+
+
+# ---------------------- 启动性能剖析 ----------------------
+class StartupProfiler:
+    """--profile：记录启动各阶段与各类组件创建的耗时，首帧绘制后（或退出时）输出一份 JSON 摘要
+
+    阶段首尾相接：每次 phase(name) 记录从上一阶段结束到此刻的一段。时间均为毫秒，起点为模块开始导入。
+    """
+    def __init__(self, output=None, origin=_IMPORT_STARTED):
+        self.output = output  # 摘要写入的文件，None 表示输出到 stderr
+        self.origin = origin
+        self._last = origin
+        self.phases = []  # (阶段名, 起点, 耗时)
+        self.widgets = {}  # 标签名 -> [个数, 总耗时, 最大耗时]
+        self.assets = [0, 0.0, 0.0]  # 图片加载：[个数, 总耗时, 最大耗时]
+        self.assets_pending = 0
+        self.reported = False
+
+    def phase(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (self._last - self.origin) * 1000, (now - self._last) * 1000))
+        self._last = now
+
+    def widget(self, tag, elapsed):
+        self._add(self.widgets.setdefault(tag, [0, 0.0, 0.0]), elapsed)
+
+    def timed_asset(self, callback):
+        """包装图片加载回调，记录从提交到送达（含下载、解码与排队）的耗时"""
+        start = time.perf_counter()
+        self.assets_pending += 1
+
+        def deliver(*args):
+            self.assets_pending -= 1
+            self._add(self.assets, (time.perf_counter() - start) * 1000)
+            callback(*args)
+        return deliver
+
+    @staticmethod
+    def _add(stat, elapsed):
+        stat[0] += 1
+        stat[1] += elapsed
+        stat[2] = max(stat[2], elapsed)
+
+    def summary(self, event, **extra):
+        def stat(values):
+            return {'count': values[0], 'total_ms': round(values[1], 3), 'max_ms': round(values[2], 3)}
+        return {
+            'event': event,
+            'elapsed_ms': round((time.perf_counter() - self.origin) * 1000, 3),
+            'phases': [{'name': name, 'start_ms': round(start, 3), 'ms': round(ms, 3)}
+                       for name, start, ms in self.phases],
+            'widgets': {tag: stat(values) for tag, values in sorted(self.widgets.items())},
+            'assets': dict(stat(self.assets), pending=self.assets_pending),
+            **extra,
+        }
+
+    def report(self, event, **extra):
+        """输出一次摘要（只输出一次）"""
+        if self.reported:
+            return
+        self.reported = True
+        text = json.dumps(self.summary(event, **extra), ensure_ascii=False)
+        if self.output:
+            with open(self.output, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        else:
+            print(text, file=sys.stderr)
+
+
+# ---------------------- 事件追踪 ----------------------
+TRACE_BUFFER_EVENTS = 200000  # 环形缓冲区容量（区间个数），写满后丢弃最早的区间
+TRACE_SIGNAL_POLL_MS = 200  # 事件循环空闲时也要定期回到 Python，信号处理函数才能及时运行
+
+
+class Tracer:
+    """--trace：把解析、组件创建、按钮/定时器动作与图片加载等区间记入内存环形缓冲区
+
+    记录时只向 deque 追加一个元组（线程安全，无锁、无格式化），退出或收到信号时才整理成
+    Trace Event Format JSON，可直接用 Perfetto 或 chrome://tracing 打开。
+    """
+    def __init__(self, path, capacity=TRACE_BUFFER_EVENTS, origin=_IMPORT_STARTED):
+        self.path = path
+        self.origin = origin
+        self.events = deque(maxlen=capacity)  # (名称, 类别, 起点, 耗时, 线程, 参数)
+        self._poll_timer = None
+
+    def span(self, name, cat, start, args=None):
+        """记录从 start（time.perf_counter()）到现在的区间"""
+        self.events.append((name, cat, start, time.perf_counter() - start, threading.get_ident(), args))
+
+    def wrap(self, func, name, cat, args=None):
+        """返回调用时记录区间的 func"""
+        events = self.events
+        clock = time.perf_counter
+
+        def traced(*a):
+            start = clock()
+            try:
+                return func(*a)
+            finally:
+                events.append((name, cat, start, clock() - start, threading.get_ident(), args))
+        return traced
+
+    def install(self):
+        """退出时写出追踪文件；SIGUSR1（Windows 为 SIGBREAK）写出后继续运行，SIGTERM 写出后退出"""
+        atexit.register(self.flush)
+        flush_signal = getattr(signal, 'SIGUSR1', None) or getattr(signal, 'SIGBREAK', None)
+        if flush_signal is not None:
+            signal.signal(flush_signal, lambda signum, frame: self.flush())
+        signal.signal(signal.SIGTERM, self._on_terminate)
+
+    @staticmethod
+    def _on_terminate(signum, frame):
+        # 让事件循环正常返回，退出流程中的 atexit 会写出追踪文件
+        app = QApplication.instance()
+        if app is not None:
+            app.quit()
+        else:
+            sys.exit(128 + signum)
+
+    def start_polling(self):
+        """Qt 事件循环运行期间定期回到 Python，使信号能被处理（需在 QApplication 创建之后调用）"""
+        if self._poll_timer is None:
+            self._poll_timer = QTimer()
+            self._poll_timer.timeout.connect(_noop)
+            self._poll_timer.start(TRACE_SIGNAL_POLL_MS)
+
+    def flush(self):
+        """把缓冲区中的区间写成 Trace Event Format JSON（整体替换目标文件）"""
+        events = list(self.events)
+        pid = os.getpid()
+        main = threading.main_thread().ident
+        threads = {main: 0}
+        trace = []
+        for name, cat, start, duration, ident, args in events:
+            tid = threads.setdefault(ident, len(threads))
+            event = {'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': round((start - self.origin) * 1e6, 3), 'dur': round(duration * 1e6, 3)}
+            if args:
+                event['args'] = args
+            trace.append(event)
+        for ident, tid in threads.items():
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                          'args': {'name': 'GUI' if ident == main else f'worker-{tid}'}})
+        data = {'traceEvents': trace, 'displayTimeUnit': 'ms',
+                # 缓冲区已满时最早的区间已被丢弃
+                'otherData': {'capacity': self.events.maxlen, 'wrapped': len(events) == self.events.maxlen}}
+        tmp_path = f"{self.path}.{pid}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[EUI解释器警告]：追踪文件写入失败：{e}", file=sys.stderr)
+            return
+        print(f"[EUI] 追踪已写入 {self.path}（{len(events)} 个区间）", file=sys.stderr)
+
+
+# ---------------------- 卡顿检测 ----------------------
+STALL_THRESHOLD_MS = 1000  # 事件循环超过这么久没有转动即视为卡顿，0 表示不检测
+_stall_watchdog = None  # 本进程唯一的 StallWatchdog，由 EasyUIInterpreter.start_watchdog 创建
+
+
+class StallWatchdog:
+    """事件循环卡顿检测
+
+    GUI 线程中的 QTimer 定期记录心跳；辅助线程发现心跳超过阈值未更新时，抓取 GUI 线程当前的
+    Python 调用栈，连同正在处理的动作或组件一起记录；事件循环恢复后再记录这次卡顿的总时长。
+    """
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, describe=None, log_path=None):
+        self.threshold = threshold_ms / 1000
+        self.describe = describe  # describe(frame) -> 正在处理的动作/组件说明，在辅助线程中调用
+        self.log_path = log_path  # 除 stderr 外追加写入的日志文件
+        self.stalls = 0
+        self._gui_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._timer = QTimer()
+        self._timer.setInterval(max(10, threshold_ms // 4))
+        self._timer.timeout.connect(self._on_beat)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="eui-stall-watchdog", daemon=True)
+
+    def start(self):
+        self._beat = time.monotonic()
+        self._timer.start()
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stopped.set()
+
+    def _on_beat(self):
+        self._beat = time.monotonic()
+
+    def _watch(self):
+        stalled_beat = None  # 卡顿开始前最后一次心跳
+        while not self._stopped.wait(self.threshold / 4):
+            beat = self._beat
+            if stalled_beat is None:
+                lag = time.monotonic() - beat
+                if lag > self.threshold:
+                    stalled_beat = beat
+                    self.stalls += 1
+                    self._report_stall(lag)
+            elif beat != stalled_beat:
+                self._log(f"事件循环已恢复，本次卡顿约 {(beat - stalled_beat) * 1000:.0f} ms")
+                stalled_beat = None
+
+    def _report_stall(self, lag):
+        frame = sys._current_frames().get(self._gui_thread)
+        context = None
+        if frame is not None and self.describe is not None:
+            try:
+                context = self.describe(frame)
+            except Exception:
+                pass
+        import traceback
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "（无法获取调用栈）\n"
+        self._log(f"界面卡顿：事件循环已 {lag * 1000:.0f} ms 未响应"
+                  + (f"，正在处理：{context}" if context else "") + "\nGUI 线程调用栈：\n" + stack.rstrip())
+
+    def _log(self, message):
+        print(f"[EUI解释器警告]：{message}", file=sys.stderr)
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+            except OSError:
+                pass
+
+
+# ---------------------- 界面更新合并 ----------------------
+UPDATE_MAX_FPS = 60  # 合并后每秒最多写入界面的次数，0 表示不合并、立即更新
+_MISSING = object()
+
+
+class UpdateCoalescer:
+    """界面更新合并
+
+    以 setter（如 progress.setValue）为键记录最新的待写入值，每帧统一调用一次。高频定时器或滑块拖动时，
+    同一组件在一帧内的多次更新只有最后一次真正写入并触发重绘。读取当前值时应通过 get 取得尚未写入的值。
+    """
+    def __init__(self, max_fps=UPDATE_MAX_FPS):
+        self.max_fps = max_fps
+        self._pending = {}  # setter -> 最新值
+        self._timer = None
+        self._last_flush = 0.0
+        self.requested = 0  # set 调用次数
+        self.applied = 0  # 实际写入界面的次数
+        self.frames = 0
+
+    def set(self, setter, value):
+        self.requested += 1
+        if not self.max_fps:
+            self.applied += 1
+            setter(value)
+            return
+        self._pending[setter] = value
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            # 距上一帧不足一帧间隔时等到间隔结束，保证每秒写入不超过 max_fps 次
+            wait = self._last_flush + 1 / self.max_fps - time.monotonic()
+            self._timer.start(max(0, int(wait * 1000)))
+
+    def get(self, setter, getter):
+        """待写入的值；没有时调用 getter() 读取组件的当前值"""
+        value = self._pending.get(setter, _MISSING)
+        return getter() if value is _MISSING else value
+
+    def flush(self):
+        """立即写入全部待更新的值"""
+        if self._timer is not None:
+            self._timer.stop()
+        pending, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
+        if not pending:
+            return
+        self.frames += 1
+        self.applied += len(pending)
+        for setter, value in pending.items():
+            try:
+                setter(value)
+            except RuntimeError:
+                pass  # 组件已被销毁
+
+    def stats(self):
+        return {'requested': self.requested, 'applied': self.applied, 'frames': self.frames,
+                'max_fps': self.max_fps}
+
+
+# ---------------------- 定时器调度 ----------------------
+TIMER_TICK_MS = 10  # 合并窗口上限：先后相差不超过此毫秒数（且不超过 TIMER_SLACK）到期的定时器合并为一次唤醒
+TIMER_SLACK = 0.05  # 到期时间允许的偏差（占间隔的比例）：合并时最多提前这么多执行，首次到期时间也在此范围内对齐
+_TIMER_ALIGN_MS = (1000, 500, 250, 100, 50, 20, 10)
+
+
+class ScheduledTimer:
+    """timer= 声明的定时器，提供与 QTimer 相同的 start/stop/isActive/setInterval，由 TimerScheduler 统一驱动"""
+    __slots__ = ('scheduler', 'timer_id', 'interval_ms', 'callback', 'cohort', '__weakref__')
+
+    def __init__(self, scheduler, timer_id, interval_ms, callback):
+        self.scheduler = scheduler
+        self.timer_id = timer_id
+        self.interval_ms = interval_ms
+        self.callback = callback
+        self.cohort = None  # 运行中时所属的 _TimerCohort
+
+    def start(self):
+        self.stop()
+        self.scheduler._schedule(self)
+
+    def stop(self):
+        if self.cohort is not None:
+            self.scheduler._leave(self)
+
+    def isActive(self):
+        return self.cohort is not None
+
+    def interval(self):
+        return self.interval_ms
+
+    def setInterval(self, msec):
+        self.interval_ms = msec
+        if self.cohort is not None:
+            self.start()
+
+
+class _TimerCohort:
+    """间隔相同、下次到期时刻也相同的一组定时器，在时间轮中作为一个整体移动"""
+    __slots__ = ('period', 'deadline', 'timers')
+
+    def __init__(self, period, deadline):
+        self.period = period
+        self.deadline = deadline
+        self.timers = []
+
+
+class TimerScheduler:
+    """定时器调度器：以到期时刻（毫秒）为键的时间轮，只用一个单次 QTimer 驱动
+
+    每个定时器按自己的间隔精确到期（下次到期时刻 = 上次到期时刻 + 间隔，不取整、不累积误差），执行频率
+    与各用一个 QTimer 时相同。间隔相同、到期时刻相同的定时器归为一组，每个到期时刻对应一个桶；QTimer 只在
+    最早的到期时刻唤醒一次，同时执行在 tick_ms 之内、且提前量不超过本组间隔 TIMER_SLACK 的其他各组，
+    提前执行不影响它们之后的到期时刻。首次到期时间在 TIMER_SLACK 允许的范围内对齐到整百毫秒等边界，
+    这样不同时刻启动、间隔相同的定时器会并入同一组。
+    """
+    def __init__(self, tick_ms=TIMER_TICK_MS):
+        self.tick_ms = max(1, tick_ms)
+        self._buckets = {}  # 到期时刻 -> [_TimerCohort, ...]
+        self._deadlines = []  # 非空桶的到期时刻（最小堆）
+        self._cohorts = {}  # (间隔, 到期时刻) -> _TimerCohort
+        self._epoch = time.monotonic()
+        self._qtimer = None
+        self._armed = None
+        self.wakeups = 0  # QTimer 唤醒次数
+        self.fired = 0  # 执行的定时器动作次数
+
+    def create(self, timer_id, interval_ms, callback):
+        return ScheduledTimer(self, timer_id, interval_ms, callback)
+
+    def _elapsed_ms(self):
+        return (time.monotonic() - self._epoch) * 1000
+
+    def _schedule(self, timer):
+        period = max(1, timer.interval_ms)
+        now = self._elapsed_ms()
+        align = next((a for a in _TIMER_ALIGN_MS if a <= 2 * TIMER_SLACK * period), 1)
+        deadline = max(int(now) + 1, round((now + period) / align) * align)
+        cohort = self._cohorts.get((period, deadline))
+        if cohort is None:
+            cohort = self._cohorts[(period, deadline)] = _TimerCohort(period, deadline)
+            self._add(cohort, deadline)
+            self._arm()
+        cohort.timers.append(timer)
+        timer.cohort = cohort
+
+    def _leave(self, timer):
+        cohort = timer.cohort
+        timer.cohort = None
+        cohort.timers.remove(timer)
+        if not cohort.timers:
+            # 空组留在桶里，到期时直接跳过
+            self._cohorts.pop((cohort.period, cohort.deadline), None)
+
+    def _add(self, cohort, deadline):
+        bucket = self._buckets.get(deadline)
+        if bucket is None:
+            bucket = self._buckets[deadline] = []
+            heapq.heappush(self._deadlines, deadline)
+        bucket.append(cohort)
+
+    def _arm(self):
+        if self._qtimer is None:
+            self._qtimer = QTimer()
+            self._qtimer.setSingleShot(True)
+            self._qtimer.setTimerType(Qt.PreciseTimer)
+            self._qtimer.timeout.connect(self._on_wakeup)
+        if not self._deadlines:
+            self._qtimer.stop()
+            self._armed = None
+            return
+        first = self._deadlines[0]
+        if first == self._armed and self._qtimer.isActive():
+            return
+        self._armed = first
+        self._qtimer.start(max(0, int(first - self._elapsed_ms() + 0.999)))
+
+    def _on_wakeup(self):
+        self.wakeups += 1
+        self._armed = None
+        elapsed = self._elapsed_ms()
+        now = int(elapsed)
+        cohorts = self._cohorts
+        due, later = [], []
+        while self._deadlines and self._deadlines[0] <= elapsed + self.tick_ms:
+            deadline = heapq.heappop(self._deadlines)
+            for cohort in self._buckets.pop(deadline):
+                if not cohort.timers:
+                    continue  # 已全部停止的空组
+                if deadline <= elapsed or deadline - elapsed <= TIMER_SLACK * cohort.period:
+                    due.append(cohort)
+                else:
+                    later.append(cohort)  # 提前太多，仍按原定时刻执行
+        for cohort in later:
+            self._add(cohort, cohort.deadline)
+        for cohort in due:
+            timers = cohort.timers
+            if not timers:
+                continue
+            # 先把整组移到下一个到期时刻再执行：动作里可以停止或重启定时器。错过的周期不补发，与 QTimer 一致
+            period = cohort.period
+            deadline = cohort.deadline + period
+            if deadline <= now:
+                deadline += (now - deadline) // period * period + period
+            del cohorts[(period, cohort.deadline)]
+            merged = cohorts.get((period, deadline))
+            if merged is None:
+                cohort.deadline = deadline
+                cohorts[(period, deadline)] = cohort
+                self._add(cohort, deadline)
+            else:
+                # 重新启动的定时器恰好与本组对齐时并入已有的组
+                for timer in timers:
+                    timer.cohort = merged
+                merged.timers.extend(timers)
+                cohort.timers = []
+            self.fired += len(timers)
+            for timer in tuple(timers):
+                if timer.cohort is None:
+                    continue  # 同一批中前面的动作停止了它
+                try:
+                    timer.callback()
+                except Exception as e:
+                    print(f"[EUI解释器错误]：定时器 {timer.timer_id} 执行失败：{e}", file=sys.stderr)
+        self._arm()
+
+    def stop_all(self):
+        for cohort in list(self._cohorts.values()):
+            for timer in list(cohort.timers):
+                timer.stop()
+        self._buckets.clear()
+        self._deadlines.clear()
+        self._cohorts.clear()
+        if self._qtimer is not None:
+            self._qtimer.stop()
+
+    def stats(self):
+        return {'active': sum(len(c.timers) for c in self._cohorts.values()), 'groups': len(self._cohorts),
+                'wakeups': self.wakeups, 'fired': self.fired}
+
+
+# ---------------------- 动作绑定 ----------------------
+class BoundAction:
+    """按钮/定时器上的动作
+
+    动作文本在解析阶段已编译为步骤元组（见 compile_action），构建完成时再由解释器绑定为直接操作目标组件的
+    可调用对象并校验目标ID；之后每次点击或定时触发只执行绑定好的调用。绑定之前就被触发时（如流式构建
+    尚未完成），先按已构建的组件临时绑定执行。
+    """
+    __slots__ = ('steps', 'line_no', 'timer_id', 'run', 'linked')
+
+    def __init__(self, steps, line_no=None, timer_id=None):
+        self.steps = steps
+        self.line_no = line_no
+        self.timer_id = timer_id  # 所属定时器，update_progress 到达最大值时停止它
+        self.run = None
+        self.linked = False
+
+    def __call__(self, *args):
+        self.run()
+
+
+def _run_all(funcs):
+    def run():
+        for func in funcs:
+            func()
+    return run
+
+
+def _noop():
+    pass
+
+
+# ---------------------- 表单布局 ----------------------
+class NestedLayoutBackend:
+    """每个带标签的组件各包一层容器 QWidget 与嵌套布局（旧做法；纵向位置与 form 后端相同，差别见 FormLayoutBackend）"""
+    name = 'nested'
+
+    def add_widget(self, layout, widget, alignment=Qt.Alignment()):
+        """不带标签的组件直接加入布局"""
+        layout.addWidget(widget, alignment=alignment)
+
+    def add_row(self, layout, label, field, min_height=0):
+        """标签在左、控件在右占满剩余宽度"""
+        container = QWidget()
+        container.setMinimumHeight(min_height)
+        row = QHBoxLayout(container)
+        row.setContentsMargins(0, 0, 0, 0)
+        row.setSpacing(10)
+        row.addWidget(label)
+        row.addWidget(field)
+        layout.addWidget(container)
+
+    def add_stacked(self, layout, label, field, spacing=5, min_height=0):
+        """标签在上、控件在下"""
+        container = QWidget()
+        container.setMinimumHeight(min_height)
+        column = QVBoxLayout(container)
+        column.setContentsMargins(0, 0, 0, 0)
+        column.setSpacing(spacing)
+        column.addWidget(label)
+        column.addWidget(field)
+        layout.addWidget(container)
+
+    def add_titled_line(self, layout, label):
+        """中间带文字的分隔线"""
+        container = QWidget()
+        row = QHBoxLayout(container)
+        row.setContentsMargins(0, 0, 0, 0)
+        row.setSpacing(10)
+        row.addWidget(_hline(), 1)
+        row.addWidget(label, 0, Qt.AlignCenter)
+        row.addWidget(_hline(), 1)
+        layout.addWidget(container)
+
+
+class FormLayoutBackend:
+    """连续的带标签组件共用一个 QGridLayout，标签与控件直接放进网格，不再为每个组件创建容器
+
+    每个组件占网格一行，行距取外层布局的间距：第 0 列放左侧标签，第 1 列放控件；上下排列的标签与
+    控件放进一个横跨两列的纵向子布局（只是布局，不是 QWidget），行内的空间分配与嵌套容器相同。
+    与 nested 后端的差别：左侧标签共用一列、按最宽的标签对齐，控件占满其余宽度；窗口高于内容时，
+    多出的高度先在外层布局的各项（网格整体、按钮等）之间分配，再在网格各行之间分配，可伸展的组件
+    （多行文本、日历）分得的高度可能与每个组件一个容器时不同。
+    """
+    name = 'form'
+    add_widget = NestedLayoutBackend.add_widget
+
+    def __init__(self):
+        self._grids = {}  # 外层布局 -> [网格, 加入网格后外层布局的条目数, 下一行]
+
+    def _grid(self, layout):
+        """外层布局最后一项仍是之前的网格时接着往里放，否则新建一个网格追加到末尾"""
+        state = self._grids.get(layout)
+        # 横向容器（row=）里的组件各占一列，不能接着放进同一个网格
+        if state is not None and state[1] == layout.count() and not isinstance(layout, QHBoxLayout):
+            return state[0], state
+        grid = QGridLayout()
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setHorizontalSpacing(10)
+        grid.setVerticalSpacing(layout.spacing())  # 与外层布局中相邻容器的间距相同
+        grid.setColumnStretch(1, 1)
+        layout.addLayout(grid)
+        state = self._grids[layout] = [grid, layout.count(), 0]
+        return grid, state
+
+    def add_row(self, layout, label, field, min_height=0):
+        grid, state = self._grid(layout)
+        row = state[2]
+        grid.addWidget(label, row, 0)
+        grid.addWidget(field, row, 1)
+        grid.setRowMinimumHeight(row, min_height)
+        state[2] = row + 1
+
+    def add_stacked(self, layout, label, field, spacing=5, min_height=0):
+        grid, state = self._grid(layout)
+        row = state[2]
+        column = _StackedColumn(min_height)
+        column.setSpacing(spacing)
+        column.addWidget(label)
+        column.addWidget(field)
+        grid.addLayout(column, row, 0, 1, 2)
+        state[2] = row + 1
+
+    def add_titled_line(self, layout, label):
+        grid, state = self._grid(layout)
+        row = state[2]
+        line = QHBoxLayout()
+        line.setSpacing(10)
+        line.addWidget(_hline(), 1)
+        line.addWidget(label, 0, Qt.AlignCenter)
+        line.addWidget(_hline(), 1)
+        grid.addLayout(line, row, 0, 1, 2)
+        state[2] = row + 1
+
+
+class _StackedColumn(QVBoxLayout):
+    """上下排列的标签与控件
+
+    设了最小高度的容器以该高度为最小高度，即使小于标签与控件所需的高度（空间不足时压缩控件），
+    建议高度也不低于它（多出的高度分给标签与控件）；这里同样如此，网格中这一行的高度才与嵌套容器相同。
+    """
+    def __init__(self, min_height=0):
+        super().__init__()
+        self.min_height = min_height
+
+    def minimumSize(self):
+        size = super().minimumSize()
+        if self.min_height > 0:
+            size.setHeight(self.min_height)
+        return size
+
+    def sizeHint(self):
+        size = super().sizeHint()
+        size.setHeight(max(size.height(), self.min_height))
+        return size
+
+
+def _hline():
+    line = QFrame()
+    line.setFrameShape(QFrame.HLine)
+    line.setFrameShadow(QFrame.Sunken)
+    return line
+
+
+LAYOUT_BACKENDS = {backend.name: backend for backend in (FormLayoutBackend, NestedLayoutBackend)}
+
+
+# ---------------------- 热重载 ----------------------
+WATCH_DEBOUNCE_MS = 100  # 合并文件改动通知的时间窗口：编辑器保存一次往往连续触发多次
+
+
+def _node_key(node):
+    """语句的比较键：标签与全部属性都相同的语句才复用旧组件，行号不参与比较"""
+    return node.tag, repr(node.attrs)
+
+
+def _carry_value(old, new, value_changed=False):
+    """把用户在旧组件中输入的值带到同一 ID 重新创建的新组件；组件类型不同时不处理
+
+    value_changed 表示源码中声明的初始值（value=）改动过，此时以新声明的值为准。
+    """
+    if isinstance(old, list) and isinstance(new, list):
+        if old and new and type(old[0]) is type(new[0]):
+            checked = {button.text() for button in old if button.isChecked()}
+            for button in new:
+                if button.text() in checked:
+                    button.setChecked(True)
+    elif type(old) is not type(new):
+        return
+    elif isinstance(new, QLineEdit):
+        new.setText(old.text())
+    elif isinstance(new, QTextEdit):
+        new.setPlainText(old.toPlainText())
+    elif isinstance(new, QComboBox):
+        index = new.findText(old.currentText())
+        if index >= 0:
+            new.setCurrentIndex(index)
+    elif isinstance(new, QSlider) and not value_changed:
+        new.setValue(old.value())
+    elif isinstance(new, QCalendarWidget):
+        new.setSelectedDate(old.selectedDate())
+
+
+# ---------------------- 截图渲染 ----------------------
+RENDER_SETTLE_MS = 5000  # 截图前等待图片加载完、布局稳定的最长时间
+RENDER_EXTENSIONS = ('.eui',)  # 批量截图时处理的文件
+
+
+def _layout_signature(window):
+    """窗口及其中各组件的位置与大小；连续两次处理事件后不变即视为布局已稳定"""
+    return (window.size(), [widget.geometry() for widget in window.findChildren(QWidget)])
+
 
 # ---------------------- 核心解释器类 ----------------------
 class EasyUIInterpreter:
     def __init__(self):
         self.app = None
         self.window = None
-        self.widgets = {}  # 存储所有组件
-        self.variables = {}  # 存储可交互组件
+        self.widgets = {}  # 存储所有组件
+        self.variables = {}  # 存储可交互组件
+        self.main_layout = None
+        self.audio_sources = {}  # audio_id -> (来源类型, 路径)，播放器在首次播放时才创建
+        self.sound_effects = {}  # audio_id -> SoundEffect，effect= 在声明时即预加载
+        self.max_audio_players = AUDIO_MAX_PLAYERS
+        self.media_players = MediaPlayerPool(self._audio_media, self.max_audio_players)
+        self.timers = {}  # 存储定时器
+        self.timer_resolution = TIMER_TICK_MS
+        self.timer_scheduler = TimerScheduler(self.timer_resolution)  # 所有 timer= 共用的调度器
+        self.max_fps = UPDATE_MAX_FPS
+        self.updates = UpdateCoalescer(self.max_fps)  # 高频的界面更新经由它按帧合并
+        self.layout_mode = 'form'  # LAYOUT_BACKENDS 中的后端名
+        self.layout_backend = LAYOUT_BACKENDS[self.layout_mode]()  # 负责把带标签的组件放进布局
+        self.batch_build = True  # 一次性构建时暂停刷新与布局激活，构建完成后统一激活一次
+        self._batching = False
+        self._suspended = None  # 暂停中的 (中央组件, 主布局)
+        self._actions = []  # 尚未完成绑定的 BoundAction
+        self._line_no = None  # 正在构建的语句行号
+        self.groups = {}  # 容器ID -> 容器内的布局
+        self._containers = []  # 容器栈：(布局, 容器ID)，栈顶即新组件所在的布局，栈底为窗口主布局
+        self.parse_errors = []  # 解析阶段收集到的语法错误
+        self.program_cache = None  # 可选的 ProgramCache，命中时跳过解析
+        self.metrics = {}  # 运行指标（如流式构建的首帧耗时）
+        self.image_loader = None  # 图片异步加载器，首次遇到 image= 时创建
+        self.asset_cache = None  # 可选的 AssetCache，缓存网络图片与音频
+        self.profiler = None  # 可选的 StartupProfiler（--profile）
+        self.tracer = None  # 可选的 Tracer（--trace）
+        self.memstats = False  # --memstats：首帧绘制后与退出时输出内存统计
+        self.stall_ms = 0  # 卡顿检测阈值，0 表示不检测（命令行默认 STALL_THRESHOLD_MS），见 start_watchdog
+        self.stall_log = None
+        self.watchdog = None  # StallWatchdog，事件循环卡顿时记录 GUI 线程的调用栈
+        self.hot_reload = False  # 记录各组件的放置方式，reload() 时原样复用未改动的组件
+        self.watch_path = None  # --watch：文件改动后自动 reload()
+        self.headless = False  # 无界面渲染（render()）：没有人能关掉模态框，警告改为输出到 stderr
+        self._built = None  # hot_reload 时已构建的节点：(节点键, 节点, 放置记录, 动作)
+        self._placements = None  # 正在构建的节点的放置记录
+        self._file_watcher = None
+        self._watched_source = None
+
+    def parse_and_run(self, code):
+        window = self.build(code)
+        self._watch_startup_paint(window)
+        window.show()
+        self._profile_phase('show')
+        QTimer.singleShot(0, self.start_watchdog)
+        sys.exit(self.app.exec_())
+
+    def start_watchdog(self):
+        """开始检测事件循环卡顿（stall_ms 为 0 时不检测），需在事件循环运行后调用
+
+        心跳定时器只有事件循环转动时才会触发，事件循环之外的同步构建与截图都会被误报为卡顿，
+        因此由运行事件循环的一方（命令行、RunServer 或嵌入的宿主程序）通过 QTimer.singleShot(0, ...)
+        启动。每个进程最多一个检测器，不随 build()/teardown() 创建或停止，事件循环结束时停止。
+        """
+        global _stall_watchdog
+        if self.stall_ms and _stall_watchdog is None:
+            _stall_watchdog = StallWatchdog(self.stall_ms, self._describe_stall, self.stall_log)
+            _stall_watchdog.start()
+            # 事件循环结束后不再检测（退出时的清理与报告不算卡顿）
+            QApplication.instance().aboutToQuit.connect(_stall_watchdog.stop)
+        self.watchdog = _stall_watchdog
+
+    def build(self, code):
+        """构建界面并返回其窗口（QMainWindow），不显示、不进入事件循环，可嵌入调用方自己的 Qt 程序
+
+        没有 QApplication 时创建一个。一个实例同一时刻只管理一个界面，再次 build 时先拆除上一个；
+        同时存在多个界面时每个界面用一个实例。不再需要时调用 teardown()。
+        """
+        self._begin_run()
+        self._profile_phase('qapplication')
+        self._batching = self.batch_build
+        nodes = self.load_program(code)
+        self._profile_phase('parse')
+        for node in nodes:
+            self.build_node(node)
+        self._profile_phase('build')
+        self._finish_build()
+        self._profile_phase('finish')
+        return self.window
+
+    def teardown(self):
+        """拆除当前界面：停止定时器与声音，释放媒体播放器与音效，销毁窗口及其中的组件与图片
+
+        窗口经 deleteLater 销毁，事件循环下一次处理延迟删除时才真正释放。图片缓存 PIXMAP_CACHE 由所有界面
+        共用且有容量上限，不随之清空。之后可再次 build()。
+        """
+        if self._file_watcher is not None:
+            self._reload_timer.stop()
+            self._file_watcher.deleteLater()
+            self._file_watcher = None
+        if getattr(self, '_stream_timer', None) is not None:
+            self._stream_timer.stop()
+            self._stream_nodes = None
+        self.timer_scheduler.stop_all()
+        self.updates.flush()
+        self.media_players.release_all()
+        for effect in self.sound_effects.values():
+            effect.stop()
+        if self.window is not None:
+            self.window.close()
+            self.window.deleteLater()
+        self.widgets = {}
+        self.variables = {}
+        self.audio_sources = {}
+        self.sound_effects = {}
+        self.timers = {}
+        self._actions = []
+        self.groups = {}
+        self._containers = []
+        self._suspended = None
+        self._built = None
+        self.window = None
         self.main_layout = None
-        self.media_players = {}
-        self.timers = {}  # 存储定时器
-        self.groups = {}
 
-    def parse_and_run(self, code):
+    def render(self, code, path, settle_ms=RENDER_SETTLE_MS):
+        """无界面渲染：构建界面，等图片加载完、布局稳定后把窗口截图保存为 PNG，再拆除界面；不进入事件循环
+
+        应在 offscreen 平台（QT_QPA_PLATFORM=offscreen）下调用，窗口不会出现在屏幕上。返回截图的 (宽, 高)。
+        """
+        self.headless = True
+        window = self.build(code)
+        try:
+            window.show()
+            self._settle(settle_ms)
+            shot = window.grab()
+            if not shot.save(path, 'PNG'):
+                raise OSError(f"无法写入截图：{path}")
+            return shot.width(), shot.height()
+        finally:
+            self.teardown()
+            # 没有事件循环时 deleteLater 不会自行生效，在这里销毁窗口
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def _settle(self, timeout_ms):
+        """处理事件直到图片加载完且布局连续两次不变，最多等待 timeout_ms 毫秒"""
+        deadline = time.monotonic() + timeout_ms / 1000
+        previous = None
+        while True:
+            self.app.processEvents()
+            self.updates.flush()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            loader = self.image_loader
+            if loader is not None and loader.busy():
+                loader.wait(int(remaining * 1000))
+                continue
+            signature = _layout_signature(self.window)
+            if signature == previous:
+                return
+            previous = signature
+
+    def _warn(self, text):
+        if self.headless:
+            print(f"[EUI解释器警告]：{text}", file=sys.stderr)
+        else:
+            QMessageBox.warning(self.window, "警告", text)
+
+    def stream_and_run(self, source, first_batch=STREAM_FIRST_BATCH, slice_ms=STREAM_SLICE_MS):
+        """流式构建并运行
+
+        source 可以是源码字符串或逐行产出文本的可迭代对象（如打开的文件）。先构建前 first_batch 个组件
+        并显示窗口，其余节点在事件循环空闲时按每片 slice_ms 毫秒分批构建，构建期间界面保持响应。
+        首帧耗时等指标记录在 self.metrics 中。
+        """
+        self._begin_run()
+        self._profile_phase('qapplication')
+        nodes = iter(self.parse(source))
+        for node in islice(nodes, first_batch):
+            self.build_node(node)
+        if not self.window:
+            self.create_window("EUI默认窗口", 400, 300)
+        self._profile_phase('first_batch')
+
+        self._stream_nodes = nodes
+        self._stream_slice = slice_ms / 1000
+        self._watch_first_paint(self.window)
+        self._watch_startup_paint(self.window)
+        self.window.show()
+        self._profile_phase('show')
+        self._stream_timer = QTimer()
+        self._stream_timer.timeout.connect(self._build_next_slice)
+        # 首帧绘制后再开始后台构建；窗口迟迟收不到绘制事件（如最小化）时也不会一直等下去
+        QTimer.singleShot(STREAM_PAINT_WAIT_MS, self._start_stream_slices)
+        QTimer.singleShot(0, self.start_watchdog)
+        sys.exit(self.app.exec_())
+
+    def _begin_run(self):
         if not QApplication.instance():
             self.app = QApplication(sys.argv)
         else:
             self.app = QApplication.instance()
         
         # 重置UI状态
-        self.widgets = {}
-        self.variables = {}
-        self.media_players = {}
-        self.timers = {}
-        self.groups = {}
-        self.window = None
-        self.main_layout = None
-        
-        lines = [line.strip() for line in code.split('\n') if line.strip()]
-        for line in lines:
-            self.parse_line(line)
-        
+        self.teardown()
+        if self.tracer is not None:
+            self.tracer.start_polling()
+        self.media_players = MediaPlayerPool(self._audio_media, self.max_audio_players)
+        self.timer_scheduler = TimerScheduler(self.timer_resolution)
+        self.updates = UpdateCoalescer(self.max_fps)
+        self.layout_backend = LAYOUT_BACKENDS[self.layout_mode]()
+        self._batching = False
+        self.parse_errors = []
+        self.metrics = {}
+        self._built = [] if self.hot_reload else None
+        self._run_started = time.perf_counter()
+        if self.watch_path is not None and self._file_watcher is None:
+            self._start_watch()
+
+    def _finish_build(self):
         if not self.window:
             self.create_window("EUI默认窗口", 400, 300)
         else:
             self.main_layout.addStretch()
-        
-        self.window.show()
-        sys.exit(self.app.exec_())
+        self._resume_layout()
+        self._link_actions()
 
-    # ---------------------- 解析逻辑 ----------------------
-    def parse_line(self, line):
-        line = line.strip().rstrip(';')
-        if not line:
-            return
+    # ---------------------- 批量构建 ----------------------
+    def _suspend_layout(self):
+        """窗口显示前的一次性构建：中央组件暂停刷新，主布局停用，addWidget 不再逐个触发布局失效与尺寸重算"""
+        central = self.window.centralWidget()
+        central.setUpdatesEnabled(False)
+        self.main_layout.setEnabled(False)
+        # 构建中途出现新的 window= 时旧窗口已被丢弃，只需管理新窗口
+        self._suspended = (central, self.main_layout)
 
-        # 窗口配置
-        window_pattern = r'window\s*=\s*title="([^"]+)"\s*,\s*width=(\d+)\s*,\s*height=(\d+)(?:\s*,\s*icon="([^"]+)")?'
-        window_match = re.match(window_pattern, line)
-        if window_match:
-            title = window_match.group(1)
-            width = int(window_match.group(2))
-            height = int(window_match.group(3))
-            icon_path = window_match.group(4) if window_match.group(4) else None
-            self.create_window(title, width, height, icon_path)
+    def _resume_layout(self):
+        """恢复布局并只激活一次"""
+        if self._suspended is None:
             return
+        central, layout = self._suspended
+        self._suspended = None
+        self._batching = False
+        layout.setEnabled(True)
+        layout.activate()
+        central.setUpdatesEnabled(True)
 
-        # 文字标签
-        label_match = re.match(r'label\s*=\s*text="([^"]+)"\s*,\s*id=(\w+)', line)
-        if label_match:
-            self.create_label(label_match.group(1), label_match.group(2))
-            return
+    # ---------------------- 流式构建 ----------------------
+    def _build_next_slice(self):
+        start = time.perf_counter()
+        # 每片的构建时长不少于此前事件循环在两片之间用于布局与绘制的最长时长：
+        # 组件越多重新布局越慢，时间片随之变长，总开销不会因片数过多而成倍增长
+        self._stream_budget = max(self._stream_budget, start - self._stream_slice_end)
+        deadline = start + self._stream_budget
+        for node in self._stream_nodes:
+            self.build_node(node)
+            if time.perf_counter() >= deadline:
+                break
+        else:
+            self._stream_timer.stop()
+            self._stream_nodes = None
+            self._freeze_window_size(False)
+            self._finish_build()
+            self.metrics['build_done_ms'] = self._elapsed_ms()
+            self.metrics['widgets'] = len(self.widgets)
+            if self.profiler is not None:
+                print(f"[EUI] 首帧 {self.metrics.get('first_paint_ms', 0):.1f} ms"
+                      f"（已构建 {self.metrics.get('widgets_at_first_paint', 0)} 个组件），"
+                      f"全部构建完成 {self.metrics['build_done_ms']:.1f} ms（共 {self.metrics['widgets']} 个组件）",
+                      file=sys.stderr)
+        # 构建过程中出现新的 window= 语句时，新窗口同样需要显示出来
+        if not self.window.isVisible():
+            self.window.show()
+        self._stream_slice_end = time.perf_counter()
 
-        # 输入框
-        entry_pattern = r'entry\s*=\s*hint="([^"]+)"\s*,\s*id=(\w+)(?:\s*,\s*readonly=(true|false))?(?:\s*,\s*type=(number|text))?'
-        entry_match = re.match(entry_pattern, line)
-        if entry_match:
-            hint = entry_match.group(1)
-            widget_id = entry_match.group(2)
-            readonly = entry_match.group(3).lower() == 'true' if entry_match.group(3) else False
-            input_type = entry_match.group(4) if entry_match.group(4) else 'text'
-            self.create_entry(hint, widget_id, readonly, input_type)
-            return
+    def _start_stream_slices(self):
+        if self._stream_nodes is not None and not self._stream_timer.isActive():
+            self._freeze_window_size(True)
+            self._stream_budget = self._stream_slice
+            self._stream_slice_end = time.perf_counter()
+            self._stream_timer.start(0)
 
-        # 下拉选择框
-        combo_match = re.match(r'combo\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*options=\[(.*?)\]', line)
-        if combo_match:
-            options = [opt.strip().strip('"') for opt in combo_match.group(3).split(',') if opt.strip()]
-            self.create_combobox(combo_match.group(1), combo_match.group(2), options)
-            return
+    def _freeze_window_size(self, frozen):
+        """流式构建期间不让主布局把最小尺寸推给窗口
 
-        # 多选框组
-        check_match = re.match(r'checkbox\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*options=\[(.*?)\]', line)
-        if check_match:
-            options = [opt.strip().strip('"') for opt in check_match.group(3).split(',') if opt.strip()]
-            self.create_checkboxes(check_match.group(1), check_match.group(2), options)
-            return
+        否则每片之后窗口都会随内容变高，反复重建越来越大的后备缓冲区并重新布局；
+        超出窗口的组件本来也看不到，构建完成后再恢复约束，窗口只长高一次。
+        """
+        central = self.window.centralWidget()
+        if frozen:
+            self.main_layout.setSizeConstraint(QLayout.SetNoConstraint)
+            central.setMinimumSize(1, 1)
+        else:
+            self.main_layout.setSizeConstraint(QLayout.SetDefaultConstraint)
+            central.setMinimumSize(0, 0)
 
-        # 按钮
-        button_match = re.match(r'button\s*=\s*text="([^"]+)"\s*,\s*id=(\w+)\s*,\s*click="([^"]+)"', line)
-        if button_match:
-            self.create_button(button_match.group(1), button_match.group(2), button_match.group(3))
-            return
+    def _watch_first_paint(self, window):
+        self._paint_watcher = _FirstPaintWatcher(self._on_first_paint)
+        window.installEventFilter(self._paint_watcher)
 
-        # 音频播放器
-        audio_pattern = r'audio\s*=\s*(url|os)="([^"]+)"\s*,\s*id=(\w+)'
-        audio_match = re.match(audio_pattern, line)
-        if audio_match:
-            self.create_audio_player(audio_match.group(1), audio_match.group(2), audio_match.group(3))
-            return
+    def _on_first_paint(self, window):
+        window.removeEventFilter(self._paint_watcher)
+        self.metrics['first_paint_ms'] = self._elapsed_ms()
+        self.metrics['widgets_at_first_paint'] = len(self.widgets)
+        QTimer.singleShot(0, self._start_stream_slices)
 
-        # 图片组件解析 - 支持path、url、os三种格式
-        image_pattern = r'image\s*=\s*(path|url|os)="([^"]+)"\s*,\s*id=(\w+)(?:\s*,\s*width=(\d+))?(?:\s*,\s*height=(\d+))?(?:\s*,\s*tooltip="([^"]+)")?'
-        image_match = re.match(image_pattern, line)
-        if image_match:
-            img_type = image_match.group(1)  # path/url/os
-            img_path = image_match.group(2)  # 图片路径/URL
-            img_id = image_match.group(3)    # 组件ID
-            width = int(image_match.group(4)) if image_match.group(4) else None  # 可选宽度
-            height = int(image_match.group(5)) if image_match.group(5) else None  # 可选高度
-            tooltip = image_match.group(6) if image_match.group(6) else ""  # 可选提示文本
-            self.create_image(img_type, img_path, img_id, width, height, tooltip)
-            return
+    # ---------------------- 热重载 ----------------------
+    # 不产生组件的语句，重新加载时总是重新执行（window= 由 _reload_window 更新现有窗口）
+    _REBUILT_TAGS = frozenset(('window', 'row', 'column', 'end'))
 
-        # 滑块控件
-        slider_pattern = r'slider\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*min=(\d+)\s*,\s*max=(\d+)\s*,\s*value=(\d+)'
-        slider_match = re.match(slider_pattern, line)
-        if slider_match:
-            self.create_slider(
-                slider_match.group(1), slider_match.group(2),
-                int(slider_match.group(3)), int(slider_match.group(4)), int(slider_match.group(5))
-            )
-            return
+    def reload(self, code):
+        """按新源码就地更新正在运行的窗口，返回复用/新建/移除的语句数与耗时
 
-        # 文本区域
-        textarea_pattern = r'textarea\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*rows=(\d+)(?:\s*,\s*readonly=(true|false))?'
-        textarea_match = re.match(textarea_pattern, line)
-        if textarea_match:
-            readonly = textarea_match.group(4).lower() == 'true' if textarea_match.group(4) else False
-            self.create_textarea(textarea_match.group(1), textarea_match.group(2), int(textarea_match.group(3)), readonly)
-            return
+        只需比较新旧两个程序的语句：标签与全部属性都相同（见 _node_key）的语句沿用旧组件，输入的内容、
+        定时器的运行状态与音频播放器都保留；改动过或新增的语句重新创建，同一 ID 的输入值从旧组件带过来；
+        不再出现的组件被销毁，其定时器与音频随之停止。需要 hot_reload（构建时记下每条语句的组件及其放置
+        方式），否则所有语句都重新创建。
+        """
+        start = time.perf_counter()
+        nodes = self.load_program(code)
+        self.updates.flush()
+        keys = [_node_key(node) for node in nodes]
+        stats = self._patch(nodes, keys)
+        if stats is None:
+            stats = self._rebuild(nodes, keys)
+        stats['ms'] = (time.perf_counter() - start) * 1000
+        self.metrics['reload'] = stats
+        if self.tracer is not None:
+            self.tracer.span('reload', 'build', start, dict(stats))
+        print(f"[EUI] 已重新加载：复用 {stats['reused']}，新建 {stats['created']}，移除 {stats['removed']} 个组件，"
+              f"耗时 {stats['ms']:.1f} ms", file=sys.stderr)
+        return stats
 
-        # 分隔线
-        separator_match = re.match(r'separator\s*=\s*text="([^"]*)"\s*,\s*id=(\w+)', line)
-        if separator_match:
-            self.create_separator(separator_match.group(1), separator_match.group(2))
-            return
+    def _patch(self, nodes, keys):
+        """只改了属性的快速路径：语句条数、顺序、标签与 ID 都没变时，在原位置换掉改动过的组件
 
-        # 进度条
-        progress_pattern = r'progress\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*min=(\d+)\s*,\s*max=(\d+)\s*,\s*value=(\d+)'
-        progress_match = re.match(progress_pattern, line)
-        if progress_match:
-            self.create_progressbar(
-                progress_match.group(1), progress_match.group(2),
-                int(progress_match.group(3)), int(progress_match.group(4)), int(progress_match.group(5))
-            )
-            return
+        其余组件与布局原封不动，只有换上的组件需要重新布局与绘制。条件不满足时返回 None。
+        """
+        built = self._built
+        if built is None or self.window is None or len(built) != len(nodes):
+            return None
+        changed = []
+        for index, (record, node, key) in enumerate(zip(built, nodes, keys)):
+            if key == record[0]:
+                continue
+            old_node = record[1]
+            if node.tag != old_node.tag or node.attrs.get('id') != old_node.attrs.get('id'):
+                return None
+            if node.tag == 'window':
+                if sum(n.tag == 'window' for n in nodes) > 1:
+                    return None
+            elif node.tag in self._REBUILT_TAGS or node.tag == 'groupbox':
+                return None  # 容器中还放着其他组件，不能原位替换
+            elif node.tag == 'separator' and bool(node.attrs['text']) != bool(old_node.attrs['text']):
+                return None  # 有无文字的分隔线放置方式不同
+            changed.append((index, key, node, old_node))
 
-        # 日历控件
-        calendar_match = re.match(r'calendar\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)', line)
-        if calendar_match:
-            self.create_calendar(calendar_match.group(1), calendar_match.group(2))
-            return
+        for index, key, node, old_node in changed:
+            self._line_no = node.line_no
+            if node.tag == 'window':
+                self._reload_window(node.attrs, old_node.attrs)
+                built[index] = (key, node, [], [])
+                continue
+            widget_id = node.attrs.get('id')
+            previous = self.variables.get(widget_id)
+            # 先在临时容器中创建，再逐个顶替旧组件在布局中的位置
+            scratch = QWidget()
+            self._containers.append((QVBoxLayout(scratch), None))
+            backend, self.layout_backend = self.layout_backend, LAYOUT_BACKENDS[self.layout_mode]()
+            record = self._record_node(node)
+            self.layout_backend = backend
+            self._containers.pop()
+            for (_, old_args, _), (_, new_args, _) in zip(built[index][2], record[2]):
+                for old_widget, new_widget in zip(old_args, new_args):
+                    if isinstance(old_widget, QWidget):
+                        old_widget.parentWidget().layout().replaceWidget(old_widget, new_widget)
+                        old_widget.deleteLater()
+            scratch.deleteLater()
+            built[index] = record
+            if previous is not None and widget_id in self.variables:
+                _carry_value(previous, self.variables[widget_id],
+                             old_node.attrs.get('value') != node.attrs.get('value'))
+        # 换掉的组件可能是其他动作的目标，全部动作重新绑定
+        self._actions = [action for record in built for action in record[3]]
+        for action in self._actions:
+            action.linked = False
+        self._link_actions()
+        count = sum(record[1].tag not in self._REBUILT_TAGS for record in built)
+        replaced = sum(node.tag not in self._REBUILT_TAGS for _, _, node, _ in changed)
+        return {'reused': count - replaced, 'created': replaced, 'removed': replaced}
 
-        # 单选按钮组
-        radio_match = re.match(r'radiogroup\s*=\s*label="([^"]+)"\s*,\s*id=(\w+)\s*,\s*options=\[(.*?)\]', line)
-        if radio_match:
-            options = [opt.strip().strip('"') for opt in radio_match.group(3).split(',') if opt.strip()]
-            self.create_radiogroup(radio_match.group(1), radio_match.group(2), options)
-            return
+    def _rebuild(self, nodes, keys):
+        """一般情况：清空各层布局后按新程序的顺序重新放置
 
-        # 分组框
-        groupbox_match = re.match(r'groupbox\s*=\s*title="([^"]+)"\s*,\s*id=(\w+)', line)
-        if groupbox_match:
-            self.create_groupbox(groupbox_match.group(1), groupbox_match.group(2))
-            return
+        窗口的中央组件与未改动的分组框原样保留，未改动的语句把原组件放回原来的父组件中，不经过隐藏与
+        重新显示；其余容器按新程序重建，不再用到的旧组件被销毁。
+        """
+        old_built = self._built or ()
+        reusable = {}
+        placed = set()  # 旧程序各语句放进布局的组件
+        for record in old_built:
+            reusable.setdefault(record[0], deque()).append(record)
+            placed.update(arg for _, args, _ in record[2] for arg in args if isinstance(arg, QWidget))
+        old_attrs = {node.attrs.get('id'): node.attrs for _, node, _, _ in old_built}
+        old_window = next((node.attrs for _, node, _, _ in old_built if node.tag == 'window'), None)
+        old = (self.widgets, self.variables, self.timers, self.audio_sources, self.sound_effects)
+        if self.window is not None:
+            # 布局清空后只剩组件本身；布局后端额外创建的包装容器与分隔线随之销毁
+            self._detach_layout(self.main_layout, placed)
+            for _, node, placements, _ in old_built:
+                if node.tag == 'groupbox':
+                    self._detach_layout(placements[0][1][0].layout(), placed)
+            self._containers = [(self.main_layout, None)]
+        self.widgets, self.variables, self.timers, self.audio_sources, self.sound_effects = {}, {}, {}, {}, {}
+        self.groups = {}
+        self._actions = []
+        self._built = [] if self.hot_reload else None
+        self.layout_backend = LAYOUT_BACKENDS[self.layout_mode]()
+        self._batching = self.batch_build and self.window is None
+        reused = created = 0
+        for node, key in zip(nodes, keys):
+            self._line_no = node.line_no
+            candidates = reusable.get(key)
+            if node.tag == 'window' and self.window is not None:
+                self._reload_window(node.attrs, old_window)
+                if self.main_layout.count():
+                    # 之前已放入组件：与重新运行时一样，新的 window= 之后从空窗口开始
+                    self._new_central_widget()
+                if self._built is not None:
+                    self._built.append((key, node, [], []))
+            elif candidates and node.tag not in self._REBUILT_TAGS:
+                self._reuse(candidates.popleft(), node, old)
+                reused += 1
+            else:
+                self.build_node(node)
+                if node.tag in self._REBUILT_TAGS:
+                    continue
+                created += 1
+                widget_id = node.attrs.get('id')
+                previous = old[1].get(widget_id)
+                if previous is not None and widget_id in self.variables:
+                    declared = old_attrs.get(widget_id, {})
+                    _carry_value(previous, self.variables[widget_id],
+                                 declared.get('value') != node.attrs.get('value'))
+        self._finish_build()
 
-        # 定时器
-        timer_pattern = r'timer\s*=\s*id=(\w+)\s*,\s*interval=(\d+)\s*,\s*action="([^"]+)"'
-        timer_match = re.match(timer_pattern, line)
-        if timer_match:
-            self.create_timer(timer_match.group(1), int(timer_match.group(2)), timer_match.group(3))
-            return
+        removed = 0
+        for key, records in reusable.items():
+            for _, node, placements, _ in records:
+                if node.tag not in self._REBUILT_TAGS:
+                    removed += 1
+                for _, args, _ in placements:
+                    for arg in args:
+                        if isinstance(arg, QWidget):
+                            arg.hide()
+                            arg.deleteLater()
+        _, _, old_timers, old_sources, old_effects = old
+        for timer_id, info in old_timers.items():
+            if self.timers.get(timer_id) is not info:
+                info['timer'].stop()
+        for audio_id, source in old_sources.items():
+            if self.audio_sources.get(audio_id) is not source:
+                self.media_players.release(audio_id)
+        for audio_id, effect in old_effects.items():
+            if self.sound_effects.get(audio_id) is not effect:
+                effect.stop()
+        return {'reused': reused, 'created': created, 'removed': removed}
+
+    def _detach_layout(self, layout, placed):
+        """取出布局（含嵌套的子布局）中的全部条目：placed 中的组件留待重新放置或销毁，其余组件与子布局销毁"""
+        while layout.count():
+            item = layout.takeAt(0)
+            widget = item.widget()
+            if widget is not None:
+                if widget not in placed:
+                    widget.hide()
+                    widget.deleteLater()
+            elif item.layout() is not None:
+                self._detach_layout(item.layout(), placed)
+                item.layout().deleteLater()
+
+    def _reuse(self, record, node, old):
+        """复用上次构建的同一语句：按记录把原组件放进当前容器，登记回各表，动作在构建完成时重新绑定"""
+        key, _, placements, actions = record
+        layout = self._get_current_layout()
+        backend = self.layout_backend
+        for method, args, kwargs in placements:
+            getattr(backend, method)(layout, *args, **kwargs)
+        widget_id = node.attrs.get('id')
+        registries = (self.widgets, self.variables, self.timers, self.audio_sources, self.sound_effects)
+        for registry, previous in zip(registries, old):
+            if widget_id in previous:
+                registry[widget_id] = previous[widget_id]
+        if node.tag == 'groupbox':
+            # 分组框连同已清空的布局一起复用，之后的组件重新放进去
+            group_layout = self.widgets[widget_id].layout()
+            self.groups[widget_id] = group_layout
+            self._containers.append((group_layout, widget_id))
+        # 动作的目标可能已重新创建，与新建的动作一起重新绑定
+        for action in actions:
+            action.line_no = node.line_no
+            action.linked = False
+        self._actions.extend(actions)
+        if self._built is not None:
+            self._built.append((key, node, placements, actions))
+
+    def _reload_window(self, attrs, previous):
+        """重新加载时 window= 不再新建窗口，只更新标题与图标；声明的尺寸改动过才调整大小，不覆盖用户拖动的结果"""
+        window = self.window
+        window.setWindowTitle(attrs['title'])
+        if previous is None or (previous['width'], previous['height']) != (attrs['width'], attrs['height']):
+            window.resize(attrs['width'], attrs['height'])
+        icon_path = attrs['icon']
+        if icon_path and icon_path != (previous or {}).get('icon') and os.path.exists(icon_path):
+            try:
+                window.setWindowIcon(QIcon(icon_path))
+            except Exception as e:
+                self._warn(f"图标设置失败：{str(e)}")
+
+    def _start_watch(self):
+        """监视 watch_path 及其所在目录：编辑器先写临时文件再改名保存时，对原路径的监视会失效"""
+        path = self.watch_path
+        with open(path, 'r', encoding='utf-8') as f:
+            self._watched_source = f.read()
+        self._file_watcher = QFileSystemWatcher([path, os.path.dirname(path)])
+        self._reload_timer = QTimer()
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._reload_timer.timeout.connect(self._reload_watched)
+        self._file_watcher.fileChanged.connect(lambda _: self._reload_timer.start())
+        self._file_watcher.directoryChanged.connect(lambda _: self._reload_timer.start())
+
+    def _reload_watched(self):
+        path = self.watch_path
+        if os.path.exists(path):
+            # 改名保存后原来的监视对应的是已被替换的旧文件，每次都重新登记
+            self._file_watcher.removePath(path)
+            self._file_watcher.addPath(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                code = f.read()
+        except OSError:
+            return  # 保存过程中文件暂时不存在，等下一次改动通知
+        if code == self._watched_source:
+            return  # 同目录下其他文件的改动，或内容未变的保存
+        self._watched_source = code
+        try:
+            self.reload(code)
+        except Exception as e:
+            print(f"[EUI解释器错误]：重新加载失败：{str(e)}", file=sys.stderr)
+
+    # ---------------------- 启动性能剖析 ----------------------
+    def _profile_phase(self, name):
+        if self.profiler is not None:
+            self.profiler.phase(name)
+
+    def _watch_startup_paint(self, window):
+        """--profile / --memstats 需要在首帧绘制后输出报告"""
+        if self.profiler is not None or self.memstats:
+            self._startup_watcher = _FirstPaintWatcher(self._on_startup_paint)
+            window.installEventFilter(self._startup_watcher)
+
+    def _on_startup_paint(self, window):
+        window.removeEventFilter(self._startup_watcher)
+        if self.profiler is not None:
+            self.profiler.phase('first_paint')
+            self.report_profile('first_paint')
+        if self.memstats:
+            self.report_memstats("首帧绘制后")
+
+    def report_profile(self, event):
+        """输出剖析摘要；首帧绘制时输出，未能绘制（如直接退出）时由 atexit 在退出时输出"""
+        if self.profiler is not None:
+            self.profiler.report(event, widget_count=len(self.widgets), parse_errors=len(self.parse_errors))
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self._run_started) * 1000
+
+    # ---------------------- 解析逻辑 ----------------------
+    def parse(self, code):
+        """解析源码为 EUINode 序列；出错的语句会被跳过并以警告形式输出"""
+        return parse_program(code, on_error=self._report_parse_error)
+
+    def load_program(self, code):
+        """返回解析后的节点列表；设置了 program_cache 时优先从磁盘缓存读取"""
+        if self.tracer is not None:
+            return self.tracer.wrap(self._load_program, 'load_program', 'parse')(code)
+        return self._load_program(code)
+
+    def _load_program(self, code):
+        self.parse_errors = []
+        cache = self.program_cache
+        if cache is not None:
+            cached = cache.load(code)
+            if cached is not None:
+                nodes, errors = cached
+                for error in errors:
+                    self._report_parse_error(error)
+                return nodes
+        nodes = list(self.parse(code)) if self.tracer is None else self._parse_traced(code)
+        if cache is not None:
+            cache.store(code, nodes, self.parse_errors)
+        return nodes
+
+    def _parse_traced(self, code):
+        """逐条语句记录 parse_line 区间；解析器惰性产出节点，每取出一个节点即解析完一条语句"""
+        nodes = []
+        statements = self.parse(code)
+        span = self.tracer.span
+        while True:
+            start = time.perf_counter()
+            node = next(statements, None)
+            if node is None:
+                return nodes
+            span('parse_line', 'parse', start, {'line': node.line_no})
+            nodes.append(node)
+
+    def _report_parse_error(self, error):
+        self.parse_errors.append(error)
+        print(f"[EUI解释器警告]：{error}", file=sys.stderr)
+
+    def parse_line(self, line):
+        start = time.perf_counter()
+        for node in self.parse(line):
+            self.build_node(node)
+        if self.tracer is not None:
+            self.tracer.span('parse_line', 'parse', start)
+
+    def build_node(self, node):
+        self._line_no = node.line_no
+        if self._built is not None:
+            self._built.append(self._record_node(node))
+        elif self.profiler is None and self.tracer is None:
+            self._NODE_BUILDERS[node.tag](self, node.attrs)
+        else:
+            self._build_instrumented(node)
+
+    def _describe_stall(self, frame):
+        """从卡住时的 GUI 线程调用栈（由内向外）找出正在处理的动作或组件；在看门狗线程中调用，只读不改"""
+        while frame is not None:
+            code = frame.f_code
+            if code is _BUILD_NODE_CODE:
+                node = frame.f_locals.get('node')
+                if node is not None:
+                    return f"第{node.line_no}行 {node.tag}（id={node.attrs.get('id')}）的构建"
+            elif code is _ACTION_CALL_CODE:
+                action = frame.f_locals.get('self')
+                if action is not None:
+                    if action.timer_id is not None:
+                        return f"定时器 {action.timer_id} 的动作（第{action.line_no}行）"
+                    return f"第{action.line_no}行按钮的动作"
+            elif code is _BUTTON_CLICK_CODE:
+                return f"动作“{frame.f_locals.get('action')}”"
+            frame = frame.f_back
+        return None
+
+    def _build_instrumented(self, node):
+        start = time.perf_counter()
+        self._NODE_BUILDERS[node.tag](self, node.attrs)
+        if self.profiler is not None:
+            self.profiler.widget(node.tag, (time.perf_counter() - start) * 1000)
+        if self.tracer is not None:
+            self.tracer.span(node.tag, 'build', start, {'line': node.line_no})
+
+    def _record_node(self, node):
+        """hot_reload 时构建并记下组件的放置方式与创建的动作，供 reload() 复用"""
+        placements = self._placements = []
+        first_action = len(self._actions)
+        if self.profiler is None and self.tracer is None:
+            self._NODE_BUILDERS[node.tag](self, node.attrs)
+        else:
+            self._build_instrumented(node)
+        self._placements = None
+        return _node_key(node), node, placements, self._actions[first_action:]
+
+    # 标签名 -> 组件创建调用，按标签一次查表分派
+    _NODE_BUILDERS = {
+        'window': lambda self, a: self.create_window(a['title'], a['width'], a['height'], a['icon']),
+        'label': lambda self, a: self.create_label(a['text'], a['id']),
+        'entry': lambda self, a: self.create_entry(a['hint'], a['id'], a['readonly'], a['type']),
+        'combo': lambda self, a: self.create_combobox(a['label'], a['id'], a['options']),
+        'checkbox': lambda self, a: self.create_checkboxes(a['label'], a['id'], a['options']),
+        'button': lambda self, a: self.create_button(a['text'], a['id'], a['click']),
+        'audio': lambda self, a: self.create_audio_player(a['source'], a['src'], a['id']),
+        'image': lambda self, a: self.create_image(a['source'], a['src'], a['id'],
+                                                   a['width'], a['height'], a['tooltip']),
+        'slider': lambda self, a: self.create_slider(a['label'], a['id'], a['min'], a['max'], a['value']),
+        'textarea': lambda self, a: self.create_textarea(a['label'], a['id'], a['rows'], a['readonly']),
+        'separator': lambda self, a: self.create_separator(a['text'], a['id']),
+        'progress': lambda self, a: self.create_progressbar(a['label'], a['id'], a['min'], a['max'], a['value']),
+        'calendar': lambda self, a: self.create_calendar(a['label'], a['id']),
+        'radiogroup': lambda self, a: self.create_radiogroup(a['label'], a['id'], a['options']),
+        'groupbox': lambda self, a: self.create_groupbox(a['title'], a['id']),
+        'row': lambda self, a: self.create_box(QHBoxLayout, a['id'], a['spacing']),
+        'column': lambda self, a: self.create_box(QVBoxLayout, a['id'], a['spacing']),
+        'end': lambda self, a: self.end_container(a['id']),
+        'timer': lambda self, a: self.create_timer(a['id'], a['interval'], a['action']),
+    }
 
     # ---------------------- 组件创建方法 ----------------------
     def create_window(self, title, width, height, icon_path=None):
@@ -195,41 +2573,40 @@ class EasyUIInterpreter:
             try:
                 self.window.setWindowIcon(QIcon(icon_path))
             except Exception as e:
-                QMessageBox.warning(self.window, "警告", f"图标设置失败：{str(e)}")
+                self._warn(f"图标设置失败：{str(e)}")
         
+        self._new_central_widget()
+
+    def _new_central_widget(self):
+        """为窗口换上空的中央组件与主布局；原中央组件连同其中未被移走的组件由 Qt 随后销毁"""
         central_widget = QWidget()
         self.window.setCentralWidget(central_widget)
         self.main_layout = QVBoxLayout(central_widget)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
         self.main_layout.setSpacing(15)
+        self._containers = [(self.main_layout, None)]
+        if self._batching:
+            self._suspend_layout()
 
     def create_label(self, text, widget_id):
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         label = QLabel(text)
         label.setMinimumHeight(30)
-        self._get_current_layout().addWidget(label)
+        self._place('add_widget', label)
         self.widgets[widget_id] = label
 
     def create_entry(self, hint, widget_id, readonly=False, input_type='text'):
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         
-        container = QWidget()
-        container.setMinimumHeight(30)
-        layout = QHBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
-        
         label = QLabel(hint)
         entry = QLineEdit()
         entry.setReadOnly(readonly)
         if input_type == 'number':
             entry.setValidator(QIntValidator())
         
-        layout.addWidget(label)
-        layout.addWidget(entry)
-        self._get_current_layout().addWidget(container)
+        self._place('add_row', label, entry, min_height=30)
         self.widgets[widget_id] = entry
         self.variables[widget_id] = entry
 
@@ -237,19 +2614,11 @@ class EasyUIInterpreter:
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         
-        container = QWidget()
-        container.setMinimumHeight(30)
-        layout = QHBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
-        
         label = QLabel(label_text)
         combo = QComboBox()
         combo.addItems(options)
         
-        layout.addWidget(label)
-        layout.addWidget(combo)
-        self._get_current_layout().addWidget(container)
+        self._place('add_row', label, combo, min_height=30)
         self.widgets[widget_id] = combo
         self.variables[widget_id] = combo
 
@@ -275,7 +2644,7 @@ class EasyUIInterpreter:
             checkboxes.append(cb)
         
         layout.addLayout(check_layout)
-        self._get_current_layout().addWidget(container)
+        self._place('add_widget', container)
         self.widgets[widget_id] = checkboxes
         self.variables[widget_id] = checkboxes
 
@@ -286,26 +2655,74 @@ class EasyUIInterpreter:
         button = QPushButton(text)
         button.setMinimumHeight(30)
         button.setMaximumWidth(150)
-        button.clicked.connect(lambda checked, a=action: self.handle_button_click(a))
-        self._get_current_layout().addWidget(button, alignment=Qt.AlignLeft)
+        button.clicked.connect(self._new_action(action))
+        self._place('add_widget', button, alignment=Qt.AlignLeft)
         self.widgets[widget_id] = button
 
     def create_audio_player(self, audio_type, audio_path, audio_id):
-        player = QMediaPlayer()
-        self.media_players[audio_id] = player
-        
+        # 同一 id 重新声明时丢弃旧的播放器/音效
+        self.media_players.release(audio_id)
+        old_effect = self.sound_effects.pop(audio_id, None)
+        if old_effect is not None:
+            old_effect.stop()
+        # effect= 与体积很小的本地 WAV 按音效播放，可重叠播放；只有 effect= 在声明时预加载声部、点击即响，
+        # 自动按音效播放的 audio=os= 与其他音频一样，第一次播放时才创建
+        if audio_type in ("effect", "os"):
+            abs_path = os.path.abspath(audio_path)
+            explicit = audio_type == "effect"
+            if is_sound_effect(abs_path, explicit=explicit):
+                self.audio_sources[audio_id] = ("effect", abs_path)
+                try:
+                    self.sound_effects[audio_id] = SoundEffect(abs_path,
+                                                               preload=EFFECT_PRELOAD_VOICES if explicit else 0)
+                except ImportError as e:
+                    # 多媒体后端不可用时界面照常构建，播放时经播放器池静默失败
+                    print(f"[EUI解释器警告]：音效 {audio_id} 无法预加载：{e}", file=sys.stderr)
+                return
+        # 其余只记录来源；播放器与媒体在第一次 play_audio 时才创建，未被播放的音频不占用任何资源
+        self.audio_sources[audio_id] = (audio_type, audio_path)
+
+    def _audio_media(self, audio_id):
+        """MediaPlayerPool 的媒体工厂：按声明取得媒体内容，来源无效时返回 None"""
+        audio_type, audio_path = self.audio_sources[audio_id]
         try:
             if audio_type == "url":
-                media = QMediaContent(QUrl(audio_path))
-            else:
-                abs_path = os.path.abspath(audio_path)
-                if not os.path.exists(abs_path):
-                    return
-                media = QMediaContent(QUrl.fromLocalFile(abs_path))
-            
-            player.setMedia(media)
+                return self._cached_audio_media(audio_id, audio_path)
+            # effect= 指向的文件不是 WAV 时退回到普通播放器
+            abs_path = os.path.abspath(audio_path)
+            if not os.path.exists(abs_path):
+                return None
+            return _multimedia().QMediaContent(QUrl.fromLocalFile(abs_path))
         except Exception:
-            pass
+            return None
+
+    def _cached_audio_media(self, audio_id, url):
+        cache = self.asset_cache
+        if cache is None:
+            return _multimedia().QMediaContent(QUrl(url))
+        cached = cache.cached_path(url)
+        if cached and cache.offline:
+            # 离线优先且已有缓存：不联网
+            path, _ = cache.fetch_path(url)
+            return _multimedia().QMediaContent(QUrl.fromLocalFile(path))
+        # 先用已缓存的旧文件或直接在线播放，同时在后台验证/下载到缓存
+        pool = self.media_players
+        self._get_image_loader().submit(
+            lambda result, error: self._on_audio_cached(pool, audio_id, result, error),
+            cache.fetch_path, url
+        )
+        return _multimedia().QMediaContent(QUrl.fromLocalFile(cached) if cached else QUrl(url))
+
+    def _on_audio_cached(self, pool, audio_id, result, error):
+        if error is not None:
+            return  # 下载失败时继续使用在线播放或旧缓存
+        path, fresh = result
+        player = pool.get(audio_id)
+        if player is None:
+            return  # 播放器已被释放，下次播放时会直接用到缓存
+        # 内容有更新且尚未开始播放时换成本地文件；正在播放的不打断，下次运行生效
+        if fresh and player.state() == _multimedia().QMediaPlayer.StoppedState:
+            player.setMedia(_multimedia().QMediaContent(QUrl.fromLocalFile(path)))
 
     # 图片组件创建方法（支持path自动识别）
     def create_image(self, img_type, img_path, img_id, width=None, height=None, tooltip=""):
@@ -324,83 +2741,56 @@ class EasyUIInterpreter:
         img_label.setToolTip(tooltip)
         img_label.setAlignment(Qt.AlignCenter)
         
-        # 加载图片
-        pixmap = None
-        try:
-            if img_type == "path":
-                # 自动识别：以http/https开头的视为网络图片，否则视为本地图片
-                if img_path.startswith(('http://', 'https://')):
-                    # 网络图片加载
-                    with urlopen(img_path) as response:
-                        img_data = response.read()
-                        image = QImage.fromData(img_data)
-                        pixmap = QPixmap.fromImage(image)
-                else:
-                    # 本地图片加载
-                    abs_path = os.path.abspath(img_path)
-                    if os.path.exists(abs_path):
-                        pixmap = QPixmap(abs_path)
-                    else:
-                        img_label.setText("图片文件不存在")
-                        QMessageBox.warning(self.window, "警告", f"本地图片路径不存在：{abs_path}")
-            
-            elif img_type == "url":
-                # 强制网络图片加载
-                with urlopen(img_path) as response:
-                    img_data = response.read()
-                    image = QImage.fromData(img_data)
-                    pixmap = QPixmap.fromImage(image)
-            
-            elif img_type == "os":
-                # 强制本地图片加载
-                abs_path = os.path.abspath(img_path)
-                if os.path.exists(abs_path):
-                    pixmap = QPixmap(abs_path)
-                else:
-                    img_label.setText("图片文件不存在")
-                    QMessageBox.warning(self.window, "警告", f"本地图片路径不存在：{abs_path}")
-        
-        except Exception as e:
-            img_label.setText("图片加载失败")
-            QMessageBox.warning(self.window, "警告", f"图片加载失败：{str(e)}")
-        
-        # 设置图片并调整大小
-        if pixmap and not pixmap.isNull():
-            if width and height:
-                pixmap = pixmap.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            elif width:
-                pixmap = pixmap.scaledToWidth(width, Qt.SmoothTransformation)
-            elif height:
-                pixmap = pixmap.scaledToHeight(height, Qt.SmoothTransformation)
-                
-            img_label.setPixmap(pixmap)
+        # 自动识别：path 以http/https开头的视为网络图片，否则视为本地图片
+        remote = img_type == "url" or (img_type == "path" and img_path.startswith(('http://', 'https://')))
+        source = img_path if remote else os.path.abspath(img_path)
+        if not remote and not os.path.exists(source):
+            img_label.setText("图片文件不存在")
+            self._warn(f"本地图片路径不存在：{source}")
+        else:
+            # 先显示占位文字，下载与解码在线程池中进行，完成后再换成图片
+            img_label.setText("图片加载中...")
+            callback = lambda pixmap, error, label=img_label: self._on_image_loaded(label, pixmap, error)
+            if self.profiler is not None:
+                callback = self.profiler.timed_asset(callback)
+            self._get_image_loader().load(source, remote, width, height, callback)
         
         layout.addWidget(img_label)
-        self._get_current_layout().addWidget(container)
+        self._place('add_widget', container)
         self.widgets[img_id] = img_label
         self.variables[img_id] = img_label
 
+    def _get_image_loader(self):
+        if self.image_loader is None:
+            self.image_loader = ImageLoader(asset_cache=self.asset_cache)
+            self.image_loader.tracer = self.tracer
+        return self.image_loader
+
+    def _on_image_loaded(self, img_label, pixmap, error):
+        try:
+            if error is not None:
+                img_label.setText("图片加载失败")
+                self._warn(f"图片加载失败：{error}")
+            else:
+                img_label.setText("")
+                img_label.setPixmap(pixmap)
+        except RuntimeError:
+            # 图片送达前窗口已关闭，标签对象已被销毁
+            pass
+
     def create_slider(self, label_text, widget_id, min_val, max_val, value):
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         
-        container = QWidget()
-        container.setMinimumHeight(60)
-        layout = QVBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(5)
-        
         value_label = QLabel(f"{label_text}：{value}")
         slider = QSlider(Qt.Horizontal)
         slider.setRange(min_val, max_val)
         slider.setValue(value)
         slider.setTickInterval(1)
         slider.setTickPosition(QSlider.TicksBelow)
-        slider.valueChanged.connect(lambda v: value_label.setText(f"{label_text}：{v}"))
+        slider.valueChanged.connect(lambda v: self.updates.set(value_label.setText, f"{label_text}：{v}"))
         
-        layout.addWidget(value_label)
-        layout.addWidget(slider)
-        self._get_current_layout().addWidget(container)
+        self._place('add_stacked', value_label, slider, min_height=60)
         self.widgets[widget_id] = slider
         self.variables[widget_id] = slider
 
@@ -408,19 +2798,12 @@ class EasyUIInterpreter:
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         
-        container = QWidget()
-        layout = QVBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(5)
-        
         label = QLabel(label_text)
         textarea = QTextEdit()
         textarea.setReadOnly(readonly)
         textarea.setMinimumHeight(rows * 25)
         
-        layout.addWidget(label)
-        layout.addWidget(textarea)
-        self._get_current_layout().addWidget(container)
+        self._place('add_stacked', label, textarea)
         self.widgets[widget_id] = textarea
         self.variables[widget_id] = textarea
 
@@ -429,52 +2812,24 @@ class EasyUIInterpreter:
             self.create_window("默认窗口", 400, 300)
         
         if text:
-            container = QWidget()
-            layout = QHBoxLayout(container)
-            layout.setContentsMargins(0, 0, 0, 0)
-            layout.setSpacing(10)
-            
-            left_line = QFrame()
-            left_line.setFrameShape(QFrame.HLine)
-            left_line.setFrameShadow(QFrame.Sunken)
-            
-            right_line = QFrame()
-            right_line.setFrameShape(QFrame.HLine)
-            right_line.setFrameShadow(QFrame.Sunken)
-            
-            label = QLabel(text)
-            layout.addWidget(left_line, 1)
-            layout.addWidget(label, 0, Qt.AlignCenter)
-            layout.addWidget(right_line, 1)
-            
-            self._get_current_layout().addWidget(container)
-            self.widgets[widget_id] = container
+            line = QLabel(text)
+            self._place('add_titled_line', line)
         else:
-            line = QFrame()
-            line.setFrameShape(QFrame.HLine)
-            line.setFrameShadow(QFrame.Sunken)
-            self._get_current_layout().addWidget(line)
-            self.widgets[widget_id] = line
+            line = _hline()
+            self._place('add_widget', line)
+        self.widgets[widget_id] = line
 
     def create_progressbar(self, label_text, widget_id, min_val, max_val, value):
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         
-        container = QWidget()
-        container.setMinimumHeight(50)
-        layout = QVBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(5)
-        
         label = QLabel(label_text)
         progress = QProgressBar()
         progress.setRange(min_val, max_val)
         progress.setValue(value)
         progress.setTextVisible(True)
         
-        layout.addWidget(label)
-        layout.addWidget(progress)
-        self._get_current_layout().addWidget(container)
+        self._place('add_stacked', label, progress, min_height=50)
         self.widgets[widget_id] = progress
         self.variables[widget_id] = progress
 
@@ -482,18 +2837,11 @@ class EasyUIInterpreter:
         if not self.window:
             self.create_window("默认窗口", 400, 300)
         
-        container = QWidget()
-        layout = QVBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
-        
         label = QLabel(label_text)
         calendar = QCalendarWidget()
         calendar.setSelectionMode(QCalendarWidget.SingleSelection)
         
-        layout.addWidget(label)
-        layout.addWidget(calendar)
-        self._get_current_layout().addWidget(container)
+        self._place('add_stacked', label, calendar, spacing=10)
         self.widgets[widget_id] = calendar
         self.variables[widget_id] = calendar
 
@@ -517,7 +2865,7 @@ class EasyUIInterpreter:
             layout.addWidget(radio)
             radio_buttons.append(radio)
         
-        self._get_current_layout().addWidget(container)
+        self._place('add_widget', container)
         self.widgets[widget_id] = radio_buttons
         self.variables[widget_id] = radio_buttons
 
@@ -530,115 +2878,200 @@ class EasyUIInterpreter:
         group_layout.setContentsMargins(15, 15, 15, 15)
         group_layout.setSpacing(10)
         
-        self._get_current_layout().addWidget(groupbox)
+        self._place('add_widget', groupbox)
         self.groups[group_id] = group_layout
         self.widgets[group_id] = groupbox
+        # 之后的组件放进分组框，直到对应的 end=
+        self._containers.append((group_layout, group_id))
+
+    def create_box(self, layout_class, box_id, spacing):
+        """row=/column=：开始一个横向/纵向排列的容器，直到对应的 end="""
+        if not self.window:
+            self.create_window("默认窗口", 400, 300)
+        
+        box = layout_class()
+        box.setContentsMargins(0, 0, 0, 0)
+        box.setSpacing(spacing)
+        self._get_current_layout().addLayout(box)
+        if box_id is not None:
+            self.groups[box_id] = box
+        self._containers.append((box, box_id))
+
+    def end_container(self, container_id=None):
+        """end=：结束最内层的容器；带 id 时结束该容器及其内部尚未结束的容器"""
+        stack = self._containers
+        if container_id is None:
+            index = len(stack) - 1
+        else:
+            index = next((i for i in range(len(stack) - 1, 0, -1) if stack[i][1] == container_id), 0)
+        # 栈底的窗口主布局不能结束
+        if index < 1:
+            message = f"没有未结束的容器：{container_id}" if container_id else "没有可结束的容器"
+            self._report_parse_error(EUISyntaxError(message, self._line_no))
+            return
+        del stack[index:]
 
     def create_timer(self, timer_id, interval, action):
         if timer_id in self.timers:
             self.timers[timer_id]['timer'].stop()
             
-        timer = QTimer()
-        timer.setInterval(interval)
-        timer.timeout.connect(lambda: self.handle_timer_timeout(timer_id))
+        bound = self._new_action(action, timer_id)
+        timer = self.timer_scheduler.create(timer_id, interval, bound)
         self.timers[timer_id] = {
             'timer': timer, 
-            'action': action
+            'action': bound
         }
 
+    # ---------------------- 动作绑定 ----------------------
+    def _new_action(self, steps, timer_id=None):
+        if isinstance(steps, str):
+            steps = compile_action(steps)
+        action = BoundAction(steps, self._line_no, timer_id)
+        action.run = lambda: self._link_action(action, final=False)()
+        self._actions.append(action)
+        return action
+
+    def _link_actions(self):
+        """构建完成后绑定全部动作；目标ID不存在或动作无法识别时按行号给出警告"""
+        for action in self._actions:
+            if not action.linked:
+                self._link_action(action, final=True)
+        self._actions = []
+
+    def _link_action(self, action, final):
+        funcs = []
+        complete = True
+        for name, target, number in action.steps:
+            if name:
+                func, error = self._STEP_BINDERS[name](self, target, number, action)
+            else:
+                func, error = None, f"无法识别的动作：{target}"
+            if func is not None:
+                funcs.append(func)
+            else:
+                complete = False
+                if final:
+                    self._report_parse_error(EUISyntaxError(error, action.line_no))
+        run = funcs[0] if len(funcs) == 1 else _run_all(funcs) if funcs else _noop
+        # 构建尚未完成时缺少的目标可能稍后才声明，暂不固定绑定结果
+        if self.tracer is not None:
+            run = self.tracer.wrap(run, 'handle_timer_timeout' if action.timer_id else 'handle_button_click',
+                                   'action', {'line': action.line_no, 'timer': action.timer_id})
+        if final or complete:
+            action.run = run
+            action.linked = True
+        return run
+
+    def _bind_audio(self, audio_id, command):
+        if audio_id not in self.audio_sources:
+            return None, f"音频ID不存在：{audio_id}"
+        return self._audio_command(audio_id, command), None
+
+    def _bind_timer(self, timer_id, command):
+        if timer_id not in self.timers:
+            return None, f"定时器ID不存在：{timer_id}"
+        timer = self.timers[timer_id]['timer']
+        return (timer.start if command == "start" else timer.stop), None
+
+    def _bind_set_progress(self, progress_id, value):
+        progress_bar = self.widgets.get(progress_id)
+        if not isinstance(progress_bar, QProgressBar):
+            return None, f"进度条ID不存在：{progress_id}"
+        return partial(self.updates.set, progress_bar.setValue, value), None
+
+    def _bind_update_progress(self, progress_id, step, timer_id):
+        progress_bar = self.widgets.get(progress_id)
+        if not isinstance(progress_bar, QProgressBar):
+            return None, f"进度条ID不存在：{progress_id}"
+        timer = self.timers[timer_id]['timer'] if timer_id in self.timers else None
+        updates = self.updates
+        set_value = progress_bar.setValue
+
+        def update():
+            current = updates.get(set_value, progress_bar.value)
+            new_value = max(progress_bar.minimum(), min(progress_bar.maximum(), current + step))
+            updates.set(set_value, new_value)
+            if timer is not None and new_value >= progress_bar.maximum():
+                timer.stop()
+        return update, None
+
+    def _bind_memstats(self, target):
+        if target not in ("dialog", "stderr"):
+            return None, f"memstats 的输出位置只能为 dialog 或 stderr：{target}"
+        return partial(self.report_memstats, "按需", target == "dialog"), None
+
+    def _bind_show(self, widget_id):
+        if widget_id not in self.variables:
+            return None, f"组件ID不存在：{widget_id}"
+        return partial(self._show_widget_value, widget_id), None
+
+    # 动作名 -> 绑定函数，返回 (可调用对象, 错误信息)
+    _STEP_BINDERS = {
+        'play_audio': lambda self, t, n, a: self._bind_audio(t, "play"),
+        'pause_audio': lambda self, t, n, a: self._bind_audio(t, "pause"),
+        'stop_audio': lambda self, t, n, a: self._bind_audio(t, "stop"),
+        'start_timer': lambda self, t, n, a: self._bind_timer(t, "start"),
+        'stop_timer': lambda self, t, n, a: self._bind_timer(t, "stop"),
+        'set_progress': lambda self, t, n, a: self._bind_set_progress(t, n),
+        'update_progress': lambda self, t, n, a: self._bind_update_progress(t, n, a.timer_id),
+        '显示': lambda self, t, n, a: self._bind_show(t),
+        'memstats': lambda self, t, n, a: self._bind_memstats(t),
+    }
+
+    # ---------------------- 内存统计 ----------------------
+    def report_memstats(self, when, dialog=False):
+        """输出内存统计到 stderr；dialog 为真时同时弹窗显示"""
+        text = "\n".join(format_memstats(collect_memstats(self)))
+        print(f"[EUI] 内存统计（{when}）：\n{text}", file=sys.stderr)
+        if dialog:
+            QMessageBox.information(self.window, "内存统计", text)
+
     # ---------------------- 事件处理 ----------------------
     def _get_current_layout(self):
-        return list(self.groups.values())[-1] if self.groups else self.main_layout
+        return self._containers[-1][0]
+
+    def _place(self, method, *args, **kwargs):
+        """用布局后端的 method（add_widget、add_row 等）把组件放进当前容器；hot_reload 时记下以便重放"""
+        getattr(self.layout_backend, method)(self._get_current_layout(), *args, **kwargs)
+        if self._placements is not None:
+            self._placements.append((method, args, kwargs))
 
     @pyqtSlot()
     def handle_timer_timeout(self, timer_id):
         if timer_id not in self.timers:
             return
-            
-        timer_info = self.timers[timer_id]
-        action = timer_info['action']
-        
-        if action.startswith("update_progress="):
-            try:
-                progress_part, step_part = action.split(",")
-                progress_id = progress_part.split("=")[1].strip()
-                step = int(step_part.split("=")[1].strip())
-                
-                progress_bar = self.widgets.get(progress_id)
-                if not progress_bar or not isinstance(progress_bar, QProgressBar):
-                    return
-                
-                current_value = progress_bar.value()
-                new_value = current_value + step
-                new_value = max(progress_bar.minimum(), min(progress_bar.maximum(), new_value))
-                progress_bar.setValue(new_value)
-                
-                if new_value >= progress_bar.maximum():
-                    timer_info['timer'].stop()
-                    
-            except Exception as e:
-                QMessageBox.warning(self.window, "定时器错误", f"更新进度条失败：{str(e)}")
+        self.timers[timer_id]['action']()
 
     def handle_button_click(self, action):
-        if action.startswith("play_audio="):
-            self._control_audio(action.split("=")[1], "play")
-            return
-        if action.startswith("pause_audio="):
-            self._control_audio(action.split("=")[1], "pause")
-            return
-        if action.startswith("stop_audio="):
-            self._control_audio(action.split("=")[1], "stop")
-            return
-        
-        if action.startswith("start_timer="):
-            timer_id = action.split("=")[1].strip()
-            self._control_timer(timer_id, "start")
-            return
-        if action.startswith("stop_timer="):
-            timer_id = action.split("=")[1].strip()
-            self._control_timer(timer_id, "stop")
-            return
-        
-        if action.startswith("set_progress="):
-            parts = action.split(",")
-            if len(parts) >= 2 and parts[1].startswith("value="):
-                try:
-                    p_id = parts[0].split("=")[1].strip()
-                    val = int(parts[1].split("=")[1].strip())
-                    if p_id in self.widgets and isinstance(self.widgets[p_id], QProgressBar):
-                        self.widgets[p_id].setValue(val)
-                except Exception as e:
-                    QMessageBox.warning(self.window, "错误", f"设置进度条失败：{str(e)}")
-            return
-        
-        if action.startswith("显示="):
-            self._show_widget_value(action.split("=")[1].strip())
-            return
+        """执行一段动作文本；界面上的按钮与定时器已直接绑定编译好的动作，不经过这里"""
+        self._link_action(BoundAction(compile_action(action)), final=False)()
 
-    def _control_audio(self, audio_id, action):
-        if audio_id not in self.media_players:
-            return
-        player = self.media_players[audio_id]
+    def _audio_command(self, audio_id, command):
+        """音频动作对应的调用（所有动作都经 _bind_audio 取得）：短音效直接作用于音效，其余经播放器池"""
+        effect = self.sound_effects.get(audio_id)
+        if effect is not None:
+            # 音效很短，暂停等同于停止
+            return effect.play if command == "play" else effect.stop
+        return partial(self._control_player, audio_id, command)
+
+    def _control_player(self, audio_id, action):
         if action == "play":
-            player.play()
-        elif action == "pause":
+            player = self.media_players.acquire(audio_id)
+            if player is not None:
+                player.play()
+            return
+        player = self.media_players.get(audio_id)
+        if player is None:
+            return  # 还没播放过，暂停/停止无事可做
+        if action == "pause":
             player.pause()
         elif action == "stop":
             player.stop()
 
-    def _control_timer(self, timer_id, action):
-        if timer_id not in self.timers:
-            QMessageBox.warning(self.window, "警告", f"定时器ID不存在：{timer_id}")
-            return
-        timer = self.timers[timer_id]['timer']
-        if action == "start":
-            timer.start()
-        elif action == "stop":
-            timer.stop()
-
     def _show_widget_value(self, widget_id):
+        self.updates.flush()  # 先写入尚未刷新的值，显示的才是最新内容
         if widget_id not in self.variables:
-            QMessageBox.warning(self.window, "警告", f"组件ID不存在：{widget_id}")
+            self._warn(f"组件ID不存在：{widget_id}")
             return
         
         target = self.variables[widget_id]
@@ -668,22 +3101,550 @@ class EasyUIInterpreter:
         
         QMessageBox.information(self.window, "组件值", msg)
 
+# ---------------------- 内存统计 ----------------------
+MEMSTATS_TRACE_DEPTH = 16  # tracemalloc 保留的调用栈深度，需足以回溯到 create_* 方法
+MEMSTATS_TOP = 10
+
+
+def _create_method_lines():
+    """EasyUIInterpreter 各 create_* 方法（含其中的 lambda）在源文件中的行号范围"""
+    ranges = []
+    for name, func in vars(EasyUIInterpreter).items():
+        if name.startswith('create_') and callable(func):
+            code = func.__code__
+            lines = [line for _, _, line in code.co_lines() if line]
+            ranges.append((code.co_filename, min(lines), max(lines), name))
+    return ranges
+
+
+def _heap_by_create_method(top):
+    """按分配发生时所在的 create_* 方法汇总 tracemalloc 记录的 Python 堆分配，返回 [(方法名, 字节数, 块数)]
+
+    只统计 Python 对象（含 sip 包装对象）的分配；Qt 在 C++ 侧分配的内存不经过 tracemalloc。
+    """
+    import tracemalloc
+    ranges = _create_method_lines()
+    owners = {}  # (文件名, 行号) -> 所在的 create_* 方法，同一帧只查一次
+
+    def owner_of(frame):
+        key = (frame.filename, frame.lineno)
+        if key not in owners:
+            owners[key] = next((name for filename, first, last, name in ranges
+                                if first <= frame.lineno <= last and frame.filename == filename), None)
+        return owners[key]
+
+    groups = {}
+    # 按完整调用栈聚合后再归类，避免逐块处理
+    for stat in tracemalloc.take_snapshot().statistics('traceback'):
+        owner = next(filter(None, map(owner_of, stat.traceback)), None)  # 由内向外第一个 create_* 帧
+        group = groups.setdefault(owner or 'create_* 之外', [0, 0])
+        group[0] += stat.size
+        group[1] += stat.count
+    ranked = sorted(groups.items(), key=lambda item: item[1][0], reverse=True)
+    return [(name, size, count) for name, (size, count) in ranked[:top]]
+
+
+def collect_memstats(interpreter, top=MEMSTATS_TOP):
+    """统计一个解释器实例当前持有的界面与媒体资源"""
+    widget_types = {}
+    pixmap_bytes = 0
+    seen_pixmaps = set()
+    for widget in interpreter.widgets.values():
+        for item in widget if isinstance(widget, list) else (widget,):
+            name = type(item).__name__
+            widget_types[name] = widget_types.get(name, 0) + 1
+            pixmap = item.pixmap() if isinstance(item, QLabel) else None
+            # 同一张图片被多个标签共享时只算一次
+            if pixmap is not None and not pixmap.isNull() and pixmap.cacheKey() not in seen_pixmaps:
+                seen_pixmaps.add(pixmap.cacheKey())
+                pixmap_bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+    window = interpreter.window
+    stats = {
+        'widgets': len(interpreter.widgets),
+        'variables': len(interpreter.variables),
+        'widget_types': dict(sorted(widget_types.items(), key=lambda item: -item[1])),
+        'qobjects': len(window.findChildren(QObject)) + 1 if window is not None else 0,
+        'label_pixmap_bytes': pixmap_bytes,
+        'pixmap_cache': PIXMAP_CACHE.stats(),
+        'media_players': interpreter.media_players.stats(),
+        'sound_effects': len(interpreter.sound_effects),
+        'sound_effect_voices': sum(len(effect.voices) for effect in interpreter.sound_effects.values()),
+        'timers': len(interpreter.timers),
+        'timer_scheduler': interpreter.timer_scheduler.stats(),
+    }
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats['python_heap'] = {'current': current, 'peak': peak, 'by_create_method': _heap_by_create_method(top)}
+    return stats
+
+
+def format_memstats(stats):
+    def kb(size):
+        return f"{size / 1024:.1f} KB"
+
+    lines = [
+        f"组件 {stats['widgets']} 个（可交互 {stats['variables']} 个），窗口下 QObject {stats['qobjects']} 个",
+        "组件类型：" + "，".join(f"{name}={count}" for name, count in stats['widget_types'].items()),
+        f"图片标签持有的像素数据 {kb(stats['label_pixmap_bytes'])}；图片缓存："
+        + "，".join(f"{k}={v}" for k, v in stats['pixmap_cache'].items()),
+        "媒体播放器：" + "，".join(f"{k}={v}" for k, v in stats['media_players'].items())
+        + f"；音效 {stats['sound_effects']} 个（声部 {stats['sound_effect_voices']} 个）",
+        f"定时器 {stats['timers']} 个；调度器：" + "，".join(f"{k}={v}" for k, v in stats['timer_scheduler'].items()),
+    ]
+    heap = stats.get('python_heap')
+    if heap is None:
+        lines.append("Python 堆：未启用 tracemalloc（使用 --memstats 启动）")
+    else:
+        lines.append(f"Python 堆：当前 {kb(heap['current'])}，峰值 {kb(heap['peak'])}；按 create_* 方法：")
+        lines += [f"  {name}：{kb(size)}（{count} 块）" for name, size, count in heap['by_create_method']]
+    return lines
+
+
+# 卡顿时据此在调用栈中识别正在处理的组件与动作
+_BUILD_NODE_CODE = EasyUIInterpreter.build_node.__code__
+_ACTION_CALL_CODE = BoundAction.__call__.__code__
+_BUTTON_CLICK_CODE = EasyUIInterpreter.handle_button_click.__code__
+
+
+# ---------------------- 常驻运行 ----------------------
+SERVE_CONNECT_MS = 5000  # --serve 连接编辑器的超时
+
+
+class RunServer(QObject):
+    """--serve：常驻的解释器进程，编辑器反复运行时不必每次重新启动 Python、导入 PyQt5 并创建 QApplication
+
+    编辑器在本地套接字 name 上监听，本进程连上后逐行接收 JSON 命令：
+    {"cmd": "run", "code": 源码}：窗口开着时就地重新加载（见 EasyUIInterpreter.reload），否则重新构建并显示；
+    {"cmd": "stop"}：关闭窗口，进程保留。
+    每条命令回复一行 {"ok": true, ...} 或 {"ok": false, "error": 说明}，run 的回复在窗口绘制完成后才发出；
+    回复带回命令的 cmd 与 id（命令中有 id 时），编辑器据此把回复对应到命令。
+    用户关闭窗口时发送 {"event": "closed"}。连接断开（编辑器退出）时进程随之退出。
+    """
+    def __init__(self, interpreter, name):
+        super().__init__()
+        self.interpreter = interpreter
+        self.name = name
+        self.socket = None
+        self._started = None  # 等待首帧绘制后回复的 run 命令的开始时刻
+        self._run_id = None  # 该 run 命令的 id
+
+    def serve(self):
+        from PyQt5.QtNetwork import QLocalSocket
+        app = QApplication.instance() or QApplication(sys.argv)
+        app.setQuitOnLastWindowClosed(False)
+        self.socket = QLocalSocket()
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.disconnected.connect(app.quit)
+        self.socket.connectToServer(self.name)
+        if not self.socket.waitForConnected(SERVE_CONNECT_MS):
+            raise RuntimeError(f"无法连接到 {self.name}：{self.socket.errorString()}")
+        QTimer.singleShot(0, self.interpreter.start_watchdog)
+        return app.exec_()
+
+    def _send(self, message):
+        self.socket.write((json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8'))
+        self.socket.flush()
+
+    def _on_ready_read(self):
+        while self.socket.canReadLine():
+            command = json.loads(bytes(self.socket.readLine()).decode('utf-8'))
+            if command['cmd'] == 'run':
+                self._run(command['code'], command.get('id'))
+            elif command['cmd'] == 'stop':
+                window = self.interpreter.window
+                if window is not None and window.isVisible():
+                    window.close()
+                self._send({'cmd': 'stop', 'id': command.get('id'), 'ok': True})
+
+    def _run(self, code, run_id=None):
+        interpreter = self.interpreter
+        window = interpreter.window
+        if self._started is not None:
+            self._reply_started()  # 上一次运行还没等到首帧绘制
+        start = time.perf_counter()
+        try:
+            if window is not None and window.isVisible():
+                stats = interpreter.reload(code)
+                window.raise_()
+                window.activateWindow()
+                # 等改动后的布局与绘制处理完再回复
+                QTimer.singleShot(0, lambda: self._send({'cmd': 'run', 'id': run_id, 'ok': True, 'reloaded': True,
+                                                         'ms': (time.perf_counter() - start) * 1000, **stats}))
+                return
+            if window is not None:
+                window.removeEventFilter(self)
+            window = interpreter.build(code)
+        except Exception as e:
+            print(f"[EUI解释器错误]：{str(e)}", file=sys.stderr)
+            self._send({'cmd': 'run', 'id': run_id, 'ok': False, 'error': str(e)})
+            return
+        self._started = start
+        self._run_id = run_id
+        window.installEventFilter(self)
+        window.show()
+        window.raise_()
+        window.activateWindow()
+
+    def _reply_started(self):
+        elapsed = (time.perf_counter() - self._started) * 1000
+        self._started = None
+        self._send({'cmd': 'run', 'id': self._run_id, 'ok': True, 'reloaded': False, 'ms': elapsed,
+                    'widgets': len(self.interpreter.widgets)})
+
+    def _on_closed(self):
+        """窗口关闭后进程继续待命，但程序不再运行：拆除界面，停止定时器与声音"""
+        if self._started is not None:
+            self._reply_started()
+        self.interpreter.teardown()
+        self._send({'event': 'closed'})
+
+    def eventFilter(self, obj, event):
+        if obj is self.interpreter.window:
+            if event.type() == QEvent.Paint and self._started is not None:
+                self._reply_started()
+            elif event.type() == QEvent.Close:
+                self._on_closed()
+        return False
+
+
+# ---------------------- 常驻启动器 ----------------------
+LAUNCHER_SPARES = 1  # 启动器始终备着的空闲进程数
+LAUNCHER_REFILL_DELAY = 1.0  # 交出备用进程后隔多久（秒）补上，避免新进程的导入与刚打开的窗口争用 CPU
+
+
+def _spare_command():
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, "--launcher-spare"]
+    return [sys.executable, os.path.abspath(__file__), "--launcher-spare"]
+
+
+def serve_launcher(spares=LAUNCHER_SPARES, address=None):
+    """--launcher：常驻的启动器，接收 eui_launch.py 发来的文件路径与参数，交给备用进程打开窗口
+
+    备用进程预先完成导入并创建好 QApplication，之后只等一条指令（见 run_spare），因此打开窗口只剩解析与构建；
+    每交出一个就补上一个。每个窗口各在一个进程中，某个窗口崩溃不影响其他窗口与启动器本身。
+    """
+    import subprocess
+    from eui_launch import (launcher_address, launcher_dir, check_private_dir, connect, listen, accept,
+                            send_message, recv_message)
+    directory = None if address else launcher_dir()
+    address = address or launcher_address()
+    if directory is not None:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        try:
+            # 目录可能早已存在：确认是自己的私有目录后才在其中连接与监听
+            check_private_dir(directory)
+        except PermissionError as e:
+            print(f"[EUI解释器错误]：{e}", file=sys.stderr)
+            return 1
+    try:
+        connect(address).close()
+    except OSError:
+        pass
+    else:
+        print(f"[EUI解释器错误]：启动器已在运行：{address}", file=sys.stderr)
+        return 1
+    if sys.platform != 'win32':
+        if directory is None:
+            os.makedirs(os.path.dirname(address), mode=0o700, exist_ok=True)
+        if os.path.exists(address):
+            os.unlink(address)  # 上次的启动器没能正常退出留下的套接字文件
+    listener = listen(address)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))  # 被结束时也走到下面的清理
+    pool = deque(subprocess.Popen(_spare_command(), stdin=subprocess.PIPE) for _ in range(spares))
+    pool_lock = threading.Lock()
+    windows = []  # 已打开窗口的进程，退出后回收
+
+    def refill():
+        with pool_lock:
+            while len(pool) < spares:
+                pool.append(subprocess.Popen(_spare_command(), stdin=subprocess.PIPE))
+    print(f"[EUI] 启动器已就绪：{address}", file=sys.stderr)
+    try:
+        while True:
+            with accept(listener) as conn:
+                try:
+                    request = recv_message(conn)
+                    with pool_lock:
+                        spare = pool.popleft() if pool else None
+                    if spare is None or spare.poll() is not None:
+                        # 接连打开多个文件时备用进程还没补上，或它意外退出了：只好现启动一个
+                        spare = subprocess.Popen(_spare_command(), stdin=subprocess.PIPE)
+                    spare.stdin.write(json.dumps(request).encode('utf-8') + b"\n")
+                    spare.stdin.close()
+                    windows.append(spare)
+                    send_message(conn, {'ok': True, 'pid': spare.pid})
+                except EOFError:
+                    pass  # 连上就断开：另一个启动器在检查是否已有启动器在运行
+                except Exception as e:
+                    print(f"[EUI解释器错误]：启动失败：{str(e)}", file=sys.stderr)
+                    try:
+                        send_message(conn, {'ok': False, 'error': str(e)})
+                    except OSError:
+                        pass
+            timer = threading.Timer(LAUNCHER_REFILL_DELAY, refill)
+            timer.daemon = True
+            timer.start()
+            windows = [process for process in windows if process.poll() is None]
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        listener.close()
+        if sys.platform != 'win32' and os.path.exists(address):
+            os.unlink(address)
+        with pool_lock:
+            for spare in pool:
+                spare.stdin.close()  # 备用进程读到 EOF 后自行退出
+            spares = 0  # 还没触发的补充不再启动新进程
+
+
+def run_spare():
+    """启动器的备用进程：导入完成后创建 QApplication，再等待启动器经 stdin 发来要打开的文件"""
+    QApplication(sys.argv[:1])
+    try:
+        _multimedia()  # 空闲时顺便加载，用到音频的程序打开时就不必再等
+    except ImportError:
+        pass
+    line = sys.stdin.readline()
+    if not line:
+        sys.exit(0)  # 启动器已退出
+    origin = time.perf_counter()
+    request = json.loads(line)
+    os.chdir(request['cwd'])
+    args, _ = build_arg_parser().parse_known_args(request['argv'])
+    if not args.file:
+        print("[EUI解释器错误]：没有指定要打开的文件", file=sys.stderr)
+        sys.exit(1)
+    run_file(args, origin)
+
+
+# ---------------------- 批量截图 ----------------------
+_render_interpreter = None  # 截图工作进程中复用的解释器，每个文件 build 后 teardown
+
+
+def _render_worker_init(args):
+    """截图工作进程的初始化：创建本进程唯一的 QApplication 与解释器"""
+    global _render_interpreter
+    interpreter = create_interpreter(args)
+    interpreter.app = QApplication(sys.argv[:1])
+    if not args.no_cache:
+        interpreter.program_cache = ProgramCache(args.cache_dir)
+    _render_interpreter = interpreter
+
+
+def _render_file(task):
+    """渲染一个文件，返回 (源文件, 截图尺寸, 语法错误数, 错误信息)；失败时尺寸为 None"""
+    source, target = task
+    interpreter = _render_interpreter
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            code = f.read()
+        if os.path.dirname(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        size = interpreter.render(code, target)
+        return source, size, len(interpreter.parse_errors), None
+    except Exception as e:
+        return source, None, len(interpreter.parse_errors), str(e)
+
+
+def render_files(args):
+    """--render：把 args.file 截图为 PNG 后退出，不进入事件循环
+
+    args.file 为文件时 args.render 是输出的 PNG 路径；为目录时 args.render 是输出目录，目录下（含子目录）
+    的所有 .eui 文件截图到其中相同的相对路径，由 args.jobs 个工作进程并行处理，最后输出每秒处理的文件数。
+    """
+    # 必须在创建 QApplication 之前设置；工作进程继承此环境变量
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    if os.path.isdir(args.file):
+        tasks = []
+        for root, dirs, files in os.walk(args.file):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RENDER_EXTENSIONS):
+                    source = os.path.join(root, name)
+                    relative = os.path.splitext(os.path.relpath(source, args.file))[0] + '.png'
+                    tasks.append((source, os.path.join(args.render, relative)))
+    else:
+        tasks = [(args.file, args.render)]
+    if not tasks:
+        print(f"[EUI解释器警告]：{args.file} 下没有 .eui 文件", file=sys.stderr)
+        return 0
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(tasks)))
+    start = time.perf_counter()
+    failed = 0
+    if jobs == 1:
+        _render_worker_init(args)
+        results = map(_render_file, tasks)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(jobs, _render_worker_init, (args,))
+        results = pool.imap_unordered(_render_file, tasks)
+    try:
+        for source, size, errors, error in results:
+            if error is not None:
+                failed += 1
+                print(f"[EUI解释器错误]：{source}：{error}", file=sys.stderr)
+            elif errors:
+                print(f"[EUI解释器警告]：{source}：有 {errors} 处语法错误", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - start
+    print(f"[EUI] 已截图 {len(tasks) - failed} 个文件，失败 {failed} 个，{jobs} 个进程，耗时 {elapsed:.2f} 秒，"
+          f"每秒 {len(tasks) / elapsed:.1f} 个文件", file=sys.stderr)
+    return 1 if failed else 0
+
+
 # ---------------------- 运行入口 ----------------------
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Easy UI 解释器")
+    parser.add_argument("file", nargs="?", help="EWUI文件路径")
+    parser.add_argument("--no-cache", action="store_true", help="不使用已解析程序的磁盘缓存")
+    parser.add_argument("--cache-dir", help=f"缓存目录（默认：{default_cache_dir()}）")
+    parser.add_argument("--stream", action="store_true", help="流式构建：先显示首屏组件，其余在后台分批构建")
+    parser.add_argument("--first-batch", type=int, default=STREAM_FIRST_BATCH, help="流式构建时首屏组件数")
+    parser.add_argument("--no-asset-cache", action="store_true", help="不缓存网络图片与音频")
+    parser.add_argument("--asset-cache-dir", help=f"网络资源缓存目录（默认：{default_asset_cache_dir()}）")
+    parser.add_argument("--asset-cache-size", type=int, default=ASSET_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="网络资源缓存容量上限（MB）")
+    parser.add_argument("--offline", action="store_true", help="离线优先：已缓存的网络资源不再向服务器验证")
+    parser.add_argument("--pixmap-cache-size", type=int, default=PIXMAP_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="内存中已解码图片的缓存容量上限（MB）")
+    parser.add_argument("--max-audio-players", type=int, default=AUDIO_MAX_PLAYERS,
+                        help="同时存在的音频播放器上限，超出时复用最久未用的播放器")
+    parser.add_argument("--timer-resolution", type=int, default=TIMER_TICK_MS,
+                        help=f"定时器合并窗口（毫秒）：先后相差不超过此值且不超过间隔 {TIMER_SLACK:.0%} 到期的定时器合并为一次唤醒，"
+                             "各定时器仍按自己的间隔执行")
+    parser.add_argument("--max-fps", type=int, default=UPDATE_MAX_FPS,
+                        help="高频界面更新合并后每秒最多刷新的次数，0 表示不合并")
+    parser.add_argument("--layout", choices=sorted(LAYOUT_BACKENDS), default='form',
+                        help="带标签组件的布局方式：form 为同一容器内共用网格，nested 为每个组件一层容器")
+    parser.add_argument("--no-batch", action="store_true",
+                        help="构建时不暂停刷新与布局激活（用于对比批量构建的效果）")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="文件",
+                        help="记录启动各阶段与各类组件的创建耗时，首帧绘制后以 JSON 输出（默认输出到 stderr）")
+    parser.add_argument("--trace", nargs="?", const="eui-trace.json", metavar="文件",
+                        help="记录解析、组件创建、动作与图片加载的区间，退出或收到 SIGUSR1 时写成 Trace Event JSON"
+                             "（默认 eui-trace.json）")
+    parser.add_argument("--trace-buffer", type=int, default=TRACE_BUFFER_EVENTS,
+                        help="追踪环形缓冲区容量（区间个数）")
+    parser.add_argument("--stall-ms", type=int, default=STALL_THRESHOLD_MS,
+                        help="事件循环超过此毫秒数未响应时记录卡顿与 GUI 线程调用栈，0 表示不检测")
+    parser.add_argument("--stall-log", metavar="文件", help="卡顿记录同时追加写入此文件")
+    parser.add_argument("--memstats", action="store_true",
+                        help="启用 tracemalloc，首帧绘制后与退出时输出组件数、图片字节数、播放器/定时器数与各 create_* 的分配")
+    parser.add_argument("--watch", action="store_true",
+                        help="文件保存后就地重新加载：只重建改动过的组件，已输入的内容保留")
+    parser.add_argument("--cache-stats", action="store_true", help="退出时输出缓存命中统计与图片缓存占用")
+    parser.add_argument("--serve", metavar="名称",
+                        help="常驻运行：连接编辑器在此名称上监听的本地套接字，按收到的源码就地重建窗口")
+    parser.add_argument("--launcher", action="store_true",
+                        help="常驻启动器：预先备好已完成导入的进程，由 eui_launch.py 转来的文件在其中打开")
+    parser.add_argument("--spares", type=int, default=LAUNCHER_SPARES, help="启动器备着的空闲进程数")
+    parser.add_argument("--launcher-spare", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--render", metavar="输出",
+                        help="无界面截图：布局稳定后把窗口保存为此 PNG 文件后退出；要打开的是目录时，"
+                             "把其中所有 .eui 文件截图到此输出目录")
+    parser.add_argument("--jobs", type=int, default=0, help="批量截图的工作进程数（默认：CPU 核数）")
+    return parser
+
+
+def create_interpreter(args, origin=_IMPORT_STARTED):
+    """按命令行参数创建并配置解释器（单次运行、--serve 与启动器共用）；origin 为剖析与追踪的计时起点"""
+    interpreter = EasyUIInterpreter()
+    if args.profile:
+        interpreter.profiler = StartupProfiler(None if args.profile == "-" else args.profile, origin)
+        interpreter.profiler.phase('startup')
+        atexit.register(interpreter.report_profile, 'exit')
+    if args.memstats:
+        import tracemalloc
+        tracemalloc.start(MEMSTATS_TRACE_DEPTH)
+        interpreter.memstats = True
+        atexit.register(interpreter.report_memstats, "退出时")
+    if args.trace:
+        interpreter.tracer = Tracer(args.trace, args.trace_buffer, origin)
+        interpreter.tracer.install()
+    if not args.no_asset_cache:
+        interpreter.asset_cache = AssetCache(args.asset_cache_dir,
+                                             args.asset_cache_size * 1024 * 1024,
+                                             offline=args.offline)
+    PIXMAP_CACHE.max_bytes = args.pixmap_cache_size * 1024 * 1024
+    interpreter.max_audio_players = args.max_audio_players
+    interpreter.timer_resolution = args.timer_resolution
+    interpreter.max_fps = args.max_fps
+    interpreter.layout_mode = args.layout
+    interpreter.batch_build = not args.no_batch
+    interpreter.stall_ms = args.stall_ms
+    interpreter.stall_log = args.stall_log
+    return interpreter
+
+
+def run_file(args, origin=_IMPORT_STARTED):
+    """运行 args.file 直到窗口关闭（单次运行与启动器的备用进程共用），不返回"""
+    file_path = args.file
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            interpreter = create_interpreter(args, origin)
+            if args.watch:
+                interpreter.hot_reload = True
+                interpreter.watch_path = os.path.abspath(file_path)
+            if args.cache_stats:
+                atexit.register(print_cache_stats, interpreter)
+            if args.stream:
+                # 流式模式边读边解析边构建，不经过编译缓存
+                interpreter.stream_and_run(f, first_batch=args.first_batch)
+            ewui_code = f.read()
+            interpreter._profile_phase('read')
+            if not args.no_cache:
+                interpreter.program_cache = ProgramCache(args.cache_dir)
+            interpreter.parse_and_run(ewui_code)
+    except Exception as e:
+        print(f"[EUI解释器错误]：{str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def print_cache_stats(interpreter):
+    caches = (("程序缓存", interpreter.program_cache), ("资源缓存", interpreter.asset_cache),
+              ("图片缓存", PIXMAP_CACHE))
+    for name, cache in caches:
+        if cache is not None:
+            print(f"[EUI] {name}：" + "，".join(f"{k}={v}" for k, v in cache.stats().items()), file=sys.stderr)
+    PIXMAP_CACHE.dump()
+
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
+    if getattr(sys, 'frozen', False):
+        # 打包成 exe 后批量截图的工作进程也由本程序启动，需先交给 multiprocessing 处理
+        import multiprocessing
+        multiprocessing.freeze_support()
+    args, _ = build_arg_parser().parse_known_args()
+    if args.serve:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                ewui_code = f.read()
-                interpreter = EasyUIInterpreter()
-                interpreter.parse_and_run(ewui_code)
+            interpreter = create_interpreter(args)
+            interpreter.hot_reload = True
+            if not args.no_cache:
+                interpreter.program_cache = ProgramCache(args.cache_dir)
+            # 输出经管道转给编辑器，逐行写出才能及时显示
+            sys.stdout.reconfigure(line_buffering=True)
+            sys.exit(RunServer(interpreter, args.serve).serve())
         except Exception as e:
             print(f"[EUI解释器错误]：{str(e)}", file=sys.stderr)
             sys.exit(1)
+    elif args.launcher:
+        sys.exit(serve_launcher(args.spares))
+    elif args.launcher_spare:
+        run_spare()
+    elif args.render and args.file:
+        sys.exit(render_files(args))
+    elif args.file:
+        run_file(args)
     else:
         print("=" * 50)
         print("Easy UI 解释器（支持path图片语法版）")
-        print("用法：python easy_ui_interpreter.py <EWUI文件路径>")
+        print("用法：python easy_ui_interpreter.py <EWUI文件路径> [--no-cache] [--cache-dir 目录] [--stream] [--offline] [--cache-stats] [--profile [文件]]")
         print("图片组件用法示例：")
         print("window=title=\"图片示例\",width=800,height=600")
         print("image=path=\"https://www.baidu.com/img/bd_logo1.png\",id=img1,width=300,tooltip=\"百度Logo\"")
@@ -0,0 +1,141 @@
+"""Easy UI 启动器客户端：把 .eui 文件交给常驻启动器打开，启动器没有运行时直接启动解释器
+
+启动器（python easy_ui_interpreter.py --launcher）常驻后台，始终备有已导入 PyQt5、已创建 QApplication 的
+备用进程。本脚本只用标准库，连上启动器把文件路径与参数发过去即可返回，窗口由备用进程打开。
+消息为 JSON：Windows 经命名管道（multiprocessing.connection），其他系统经 Unix 套接字、每行一条。
+可把 .eui 文件的打开方式设为 python eui_launch.py "%1"（Windows 下可用 pythonw 免去控制台窗口）。
+
+用法：python eui_launch.py <EWUI文件路径> [解释器参数 ...]
+"""
+import json
+import os
+import sys
+
+LAUNCHER_NAME = "easy-ui-launcher"
+
+
+def launcher_address():
+    """启动器的监听地址，可用环境变量 EASY_UI_LAUNCHER 指定
+
+    Windows 下为当前用户的命名管道，其他系统为只有当前用户可访问的目录（见 launcher_dir）下的 Unix 套接字。
+    """
+    if os.environ.get("EASY_UI_LAUNCHER"):
+        return os.environ["EASY_UI_LAUNCHER"]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{LAUNCHER_NAME}-{os.environ.get('USERNAME', 'user')}"
+    return os.path.join(launcher_dir(), "launcher.sock")
+
+
+def launcher_dir():
+    """默认套接字所在的目录；Windows 下或用 EASY_UI_LAUNCHER 指定了地址时为 None"""
+    if os.environ.get("EASY_UI_LAUNCHER") or sys.platform == "win32":
+        return None
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or "/tmp", f"{LAUNCHER_NAME}-{os.getuid()}")
+
+
+def check_private_dir(directory):
+    """确认 directory 是当前用户所有、权限为 0700 的目录本身（不是符号链接），否则抛出 PermissionError
+
+    没有 XDG_RUNTIME_DIR 时目录位于 /tmp，其他用户可以抢先创建同名目录或符号链接，
+    借此冒充启动器、截获发来的文件路径与参数。目录不存在时抛出 FileNotFoundError。
+    """
+    import stat
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{directory} 不是目录（可能是符号链接），请删除后重试")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{directory} 不属于当前用户，请删除后重试")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        raise PermissionError(f"{directory} 的权限为 {stat.S_IMODE(st.st_mode):o}，应为 700，请删除后重试")
+
+
+def connect(address):
+    """连接启动器，连不上时抛出 OSError"""
+    if sys.platform == "win32":
+        from multiprocessing.connection import Client
+        return Client(address)
+    # 其他系统直接用 Unix 套接字：比导入 multiprocessing 快得多，客户端每次都要付这份启动开销
+    import socket
+    sock = socket.socket(socket.AF_UNIX)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def listen(address):
+    """启动器一侧的监听对象，用 accept() 取得连接"""
+    if sys.platform == "win32":
+        from multiprocessing.connection import Listener
+        return Listener(address)
+    import socket
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(address)
+    sock.listen()
+    return sock
+
+
+def accept(listener):
+    conn = listener.accept()
+    return conn[0] if isinstance(conn, tuple) else conn
+
+
+def send_message(conn, message):
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    if hasattr(conn, "send_bytes"):
+        conn.send_bytes(data)
+    else:
+        conn.sendall(data + b"\n")
+
+
+def recv_message(conn):
+    """读一条消息；对方没发完就断开时抛出 EOFError"""
+    if hasattr(conn, "recv_bytes"):
+        return json.loads(conn.recv_bytes())
+    with conn.makefile("rb") as f:
+        line = f.readline()
+    if not line.endswith(b"\n"):
+        raise EOFError("连接已断开")
+    return json.loads(line)
+
+
+def forward(argv, address=None):
+    """把解释器参数交给启动器，返回打开窗口的进程号；启动器没有运行时返回 None"""
+    if address is None:
+        address = launcher_address()
+        directory = launcher_dir()
+        if directory is not None:
+            try:
+                check_private_dir(directory)
+            except FileNotFoundError:
+                return None
+    try:
+        conn = connect(address)
+    except OSError:
+        return None
+    with conn:
+        send_message(conn, {"argv": argv, "cwd": os.getcwd()})
+        reply = recv_message(conn)
+    if not reply["ok"]:
+        raise RuntimeError(reply["error"])
+    return reply["pid"]
+
+
+def main(argv):
+    if not argv:
+        print(__doc__.strip().splitlines()[-1])
+        return 0
+    try:
+        if forward(argv) is not None:
+            return 0
+    except (OSError, EOFError, RuntimeError) as e:
+        print(f"[EUI] 启动器出错，改为直接运行：{e}", file=sys.stderr)
+    import subprocess
+    interpreter = os.path.join(os.path.dirname(os.path.abspath(__file__)), "easy_ui_interpreter.py")
+    return subprocess.call([sys.executable, interpreter, *argv])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))